@@ -0,0 +1,30 @@
+"""Partial index on incomplete reminders for notification queries
+
+Revision ID: 002_pending_index
+Revises: 001_initial
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '002_pending_index'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_reminders_pending',
+        'reminders',
+        ['company_id', 'deadline'],
+        postgresql_where=sa.text('completed = false'),
+    )
+    op.create_index('ix_company_members_user_id', 'company_members', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_company_members_user_id', table_name='company_members')
+    op.drop_index('ix_reminders_pending', table_name='reminders')
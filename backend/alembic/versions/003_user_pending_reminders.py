@@ -0,0 +1,48 @@
+"""Per-user pending reminder read model for notification queries
+
+Revision ID: 003_user_pending
+Revises: 002_pending_index
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '003_user_pending'
+down_revision: Union[str, None] = '002_pending_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_pending_reminders',
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('reminder_id', sa.Uuid(), nullable=False),
+        sa.Column('company_id', sa.Uuid(), nullable=False),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('category', sa.String(50), nullable=False),
+        sa.Column('deadline', sa.Date(), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.PrimaryKeyConstraint('user_id', 'reminder_id'),
+    )
+    op.create_index('ix_user_pending_reminders_user_deadline', 'user_pending_reminders', ['user_id', 'deadline'])
+    op.create_index('ix_user_pending_reminders_reminder_id', 'user_pending_reminders', ['reminder_id'])
+    op.create_index('ix_user_pending_reminders_company_id', 'user_pending_reminders', ['company_id'])
+
+    # 기존 데이터 적재
+    op.execute(
+        """
+        INSERT INTO user_pending_reminders
+            (user_id, reminder_id, company_id, title, category, deadline, priority)
+        SELECT m.user_id, r.id, r.company_id, r.title, r.category, r.deadline, r.priority
+        FROM reminders r
+        JOIN company_members m ON m.company_id = r.company_id
+        WHERE r.completed = false
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_pending_reminders')
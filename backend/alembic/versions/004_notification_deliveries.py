@@ -0,0 +1,33 @@
+"""Notification delivery ledger for dedupe
+
+Revision ID: 004_notification_deliveries
+Revises: 003_user_pending
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '004_notification_deliveries'
+down_revision: Union[str, None] = '003_user_pending'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_deliveries',
+        sa.Column('id', sa.Uuid(), nullable=False, default=sa.text('gen_random_uuid()')),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('reminder_id', sa.Uuid(), nullable=False),
+        sa.Column('alert', sa.String(20), nullable=False),
+        sa.Column('channel', sa.String(20), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'reminder_id', 'alert', 'channel', name='uq_notification_deliveries_key'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('notification_deliveries')
@@ -0,0 +1,32 @@
+"""Precomputed daily notification digests
+
+Revision ID: 005_notification_digests
+Revises: 004_notification_deliveries
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '005_notification_digests'
+down_revision: Union[str, None] = '004_notification_deliveries'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_digests',
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('digest_date', sa.Date(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('stale', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('computed_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('notification_digests')
@@ -0,0 +1,42 @@
+"""Excel export/import jobs
+
+Revision ID: 006_excel_jobs
+Revises: 005_notification_digests
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '006_excel_jobs'
+down_revision: Union[str, None] = '005_notification_digests'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'excel_jobs',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('kind', sa.String(20), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('company_id', sa.Uuid(), sa.ForeignKey('companies.id'), nullable=False),
+        sa.Column('user_id', sa.Uuid(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('params', sa.Text(), nullable=True),
+        sa.Column('processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total', sa.Integer(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('file_path', sa.String(500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_excel_jobs_user_id', 'excel_jobs', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_excel_jobs_user_id', table_name='excel_jobs')
+    op.drop_table('excel_jobs')
@@ -0,0 +1,35 @@
+"""Reminder row fingerprints for import dedupe
+
+Revision ID: 007_reminder_fingerprints
+Revises: 006_excel_jobs
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '007_reminder_fingerprints'
+down_revision: Union[str, None] = '006_excel_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('fingerprint', sa.String(64), nullable=True))
+    # app.models.reminder.reminder_fingerprint와 같은 형식: sha256(title \x1f category \x1f YYYY-MM-DD)
+    op.execute(
+        """
+        UPDATE reminders
+        SET fingerprint = encode(
+            sha256(convert_to(title || chr(31) || category || chr(31) || to_char(deadline, 'YYYY-MM-DD'), 'UTF8')),
+            'hex'
+        )
+        """
+    )
+    op.create_index('ix_reminders_company_fingerprint', 'reminders', ['company_id', 'fingerprint'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reminders_company_fingerprint', table_name='reminders')
+    op.drop_column('reminders', 'fingerprint')
@@ -0,0 +1,26 @@
+"""Company data version for export caching
+
+Revision ID: 008_company_data_version
+Revises: 007_reminder_fingerprints
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '008_company_data_version'
+down_revision: Union[str, None] = '007_reminder_fingerprints'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'companies',
+        sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('companies', 'data_version')
@@ -0,0 +1,22 @@
+"""Index reminders by updated_at for scheduler polling
+
+Revision ID: 009_reminders_updated_at_index
+Revises: 008_company_data_version
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '009_reminders_updated_at_index'
+down_revision: Union[str, None] = '008_company_data_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_reminders_updated_at', 'reminders', ['updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reminders_updated_at', table_name='reminders')
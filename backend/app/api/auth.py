@@ -9,8 +9,7 @@ from app.services.auth_service import (
     register_user, authenticate_user, generate_tokens,
     refresh_access_token, create_company,
 )
-from app.utils.security import get_current_user
-from app.models.user import User
+from app.utils.security import get_current_user, Principal
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -48,14 +47,14 @@ async def refresh(data: TokenRefreshRequest, db: AsyncSession = Depends(get_db))
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(user: User = Depends(get_current_user)):
+async def get_me(user: Principal = Depends(get_current_user)):
     return UserResponse.model_validate(user)
 
 
 @router.post("/companies", response_model=CompanyResponse, status_code=201)
 async def create_company_endpoint(
     data: CompanyCreate,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     company = await create_company(db, user, data)
@@ -6,7 +6,9 @@ from pydantic import BaseModel, EmailStr
 from app.database import get_db
 from app.models.user import User
 from app.models.company import Company, CompanyMember, MemberRole
-from app.utils.security import get_current_user
+from app.services.access_service import require_member, invalidate_member_role
+from app.services.pending_index import index_membership, unindex_membership
+from app.utils.security import get_current_user, Principal
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
@@ -40,7 +42,7 @@ class CompanyDetailResponse(BaseModel):
 
 @router.get("", response_model=list[CompanyDetailResponse])
 async def list_my_companies(
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """현재 사용자가 소속된 회사 목록을 조회합니다."""
@@ -66,7 +68,7 @@ async def list_my_companies(
 @router.get("/{company_id}/members", response_model=list[MemberResponse])
 async def list_members(
     company_id: UUID,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """회사의 멤버 목록을 조회합니다."""
@@ -94,14 +96,13 @@ async def list_members(
 async def invite_member(
     company_id: UUID,
     data: MemberInviteRequest,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """회사에 멤버를 초대합니다. OWNER 또는 ADMIN만 가능합니다."""
-    membership = await _check_member(db, user.id, company_id)
+    role = await _check_member(db, user.id, company_id)
 
-    role_val = membership.role.value if isinstance(membership.role, MemberRole) else membership.role
-    if role_val not in ("owner", "admin"):
+    if role not in (MemberRole.OWNER, MemberRole.ADMIN):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only owners and admins can invite members",
@@ -144,6 +145,8 @@ async def invite_member(
     )
     db.add(new_member)
     await db.flush()
+    invalidate_member_role(target_user.id, company_id, db)
+    await index_membership(db, target_user.id, company_id)
 
     return MemberResponse(
         id=new_member.id,
@@ -160,13 +163,12 @@ async def update_member_role(
     company_id: UUID,
     member_id: UUID,
     data: dict,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """멤버의 역할을 변경합니다."""
-    membership = await _check_member(db, user.id, company_id)
-    role_val = membership.role.value if isinstance(membership.role, MemberRole) else membership.role
-    if role_val not in ("owner", "admin"):
+    role = await _check_member(db, user.id, company_id)
+    if role not in (MemberRole.OWNER, MemberRole.ADMIN):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
 
     result = await db.execute(
@@ -182,6 +184,7 @@ async def update_member_role(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid role")
 
     await db.flush()
+    invalidate_member_role(target.user_id, company_id, db)
     return {"status": "updated"}
 
 
@@ -189,13 +192,12 @@ async def update_member_role(
 async def remove_member(
     company_id: UUID,
     member_id: UUID,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """멤버를 회사에서 제거합니다."""
-    membership = await _check_member(db, user.id, company_id)
-    role_val = membership.role.value if isinstance(membership.role, MemberRole) else membership.role
-    if role_val not in ("owner", "admin"):
+    role = await _check_member(db, user.id, company_id)
+    if role not in (MemberRole.OWNER, MemberRole.ADMIN):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
 
     result = await db.execute(
@@ -211,16 +213,9 @@ async def remove_member(
 
     await db.delete(target)
     await db.flush()
+    invalidate_member_role(target.user_id, company_id, db)
+    await unindex_membership(db, target.user_id, company_id)
 
 
-async def _check_member(db: AsyncSession, user_id: UUID, company_id: UUID) -> CompanyMember:
-    result = await db.execute(
-        select(CompanyMember).where(
-            CompanyMember.user_id == user_id,
-            CompanyMember.company_id == company_id,
-        )
-    )
-    member = result.scalar_one_or_none()
-    if not member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this company")
-    return member
+async def _check_member(db: AsyncSession, user_id: UUID, company_id: UUID) -> MemberRole:
+    return await require_member(db, user_id, company_id, detail="Not a member of this company")
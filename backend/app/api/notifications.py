@@ -1,48 +1,76 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.models.user import User
-from app.utils.security import get_current_user
+from app.utils.security import get_current_user, Principal
 from app.services.notification_service import (
     get_notification_summary, get_today_reminders,
     get_overdue_reminders, get_upcoming_deadlines,
+    DEFAULT_FEED_LIMIT, DEFAULT_SUMMARY_TOP,
 )
+from app.services.digest_service import get_daily_summary
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
+def feed_params(
+    limit: int = Query(DEFAULT_FEED_LIMIT, ge=1, le=200),
+    cursor: str | None = Query(None),
+    per_company_limit: int | None = Query(None, ge=1),
+    per_category_limit: int | None = Query(None, ge=1),
+    count_only: bool = Query(False),
+) -> dict:
+    """알림 피드 공통 파라미터 (커서 페이지네이션, 회사/카테고리별 상한, 건수 전용 모드)."""
+    return {
+        "limit": limit,
+        "cursor": cursor,
+        "per_company_limit": per_company_limit,
+        "per_category_limit": per_category_limit,
+        "count_only": count_only,
+    }
+
+
 @router.get("/summary")
 async def notification_summary(
-    user: User = Depends(get_current_user),
+    top: int = Query(DEFAULT_SUMMARY_TOP, ge=0, le=50),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """현재 사용자의 알림 요약 (오늘 마감, 지연, 7일 이내)을 반환합니다."""
-    return await get_notification_summary(db, user.id)
+    """현재 사용자의 알림 요약 (오늘 마감, 지연, 7일 이내)을 반환합니다.
+
+    구간별 전체 건수와 상위 top개 항목만 포함합니다.
+    기본 top이면 미리 계산해 둔 일일 다이제스트를 그대로 반환합니다.
+    """
+    if top == DEFAULT_SUMMARY_TOP:
+        return Response(await get_daily_summary(db, user.id), media_type="application/json")
+    return await get_notification_summary(db, user.id, top=top)
 
 
 @router.get("/today")
 async def today_notifications(
-    user: User = Depends(get_current_user),
+    params: dict = Depends(feed_params),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """오늘 마감인 리마인더 목록을 반환합니다."""
-    return await get_today_reminders(db, user.id)
+    return await get_today_reminders(db, user.id, **params)
 
 
 @router.get("/overdue")
 async def overdue_notifications(
-    user: User = Depends(get_current_user),
+    params: dict = Depends(feed_params),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """마감일이 지난 미완료 리마인더 목록을 반환합니다."""
-    return await get_overdue_reminders(db, user.id)
+    return await get_overdue_reminders(db, user.id, **params)
 
 
 @router.get("/upcoming")
 async def upcoming_notifications(
     days: int = Query(7, ge=1, le=30),
-    user: User = Depends(get_current_user),
+    params: dict = Depends(feed_params),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """향후 N일 이내 마감되는 리마인더 목록을 반환합니다."""
-    return await get_upcoming_deadlines(db, user.id, days_ahead=days)
+    return await get_upcoming_deadlines(db, user.id, days_ahead=days, **params)
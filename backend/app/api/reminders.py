@@ -1,6 +1,6 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse, FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas.reminder import (
@@ -10,15 +10,27 @@ from app.services.reminder_service import (
     get_reminders, get_reminder, create_reminder,
     update_reminder, delete_reminder,
 )
-from app.services.excel_service import export_reminders_to_excel, import_reminders_from_excel
-from app.utils.security import get_current_user
+from app.services.excel_service import (
+    open_cached_export, export_portfolio_to_excel, import_reminders_from_excel,
+)
+from app.services.excel_jobs import submit_export_job, submit_import_job, get_job, get_job_file
+from app.services.data_service import export_reminders, import_reminders, accepts_gzip, FORMATS
+from app.utils.file_response import file_response
+from app.utils.security import get_current_user, Principal
 from app.utils.websocket import manager, create_sync_message
-from app.models.user import User
 from fastapi import UploadFile, File
 
 router = APIRouter(prefix="/reminders", tags=["reminders"])
 
 
+def _sync_patch(row: dict, data: ReminderUpdate) -> dict:
+    """수정 이벤트에 싣는 필드 단위 변경분. 서버가 함께 바꾸는 시각 필드도 포함합니다."""
+    fields = set(data.model_dump(exclude_unset=True)) | {"updated_at"}
+    if "completed" in fields:
+        fields.add("completed_at")
+    return {field: row[field] for field in row if field in fields}
+
+
 @router.get("", response_model=ReminderListResponse)
 async def list_reminders(
     company_id: UUID = Query(...),
@@ -28,7 +40,7 @@ async def list_reminders(
     completed: bool | None = Query(None),
     year: int | None = Query(None),
     month: int | None = Query(None),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await get_reminders(
@@ -40,10 +52,54 @@ async def list_reminders(
     return ReminderListResponse(**result)
 
 
+# /{reminder_id}보다 먼저 등록해야 합니다
+@router.get("/export")
+async def export_data(
+    request: Request,
+    company_id: UUID = Query(...),
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    year: int | None = Query(None),
+    category: str | None = Query(None),
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """CSV/NDJSON 내보내기. Accept-Encoding이 gzip을 허용하면 gzip으로 압축하여 스트리밍합니다."""
+    compress = accepts_gzip(request.headers.get("accept-encoding"))
+    stream = await export_reminders(db, company_id, user.id, fmt, year, category, compress=compress)
+
+    headers = {
+        "Content-Disposition": f"attachment; filename=reminders_{year or 'all'}.{fmt}",
+        # 압축 여부가 Accept-Encoding에 따라 달라지므로 캐시가 구분하도록 합니다
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(stream, media_type=FORMATS[fmt], headers=headers)
+
+
+@router.post("/import")
+async def import_data(
+    company_id: UUID = Query(...),
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    file: UploadFile = File(...),
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """CSV/NDJSON 가져오기 (gzip 파일 허용)."""
+    result = await import_reminders(db, company_id, user.id, fmt, file)
+
+    if result["imported_count"] or result["updated_count"]:
+        await manager.broadcast_to_company(
+            company_id,
+            create_sync_message("bulk_created", "reminder"),
+        )
+    return result
+
+
 @router.get("/{reminder_id}", response_model=ReminderResponse)
 async def get_reminder_detail(
     reminder_id: UUID,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     reminder = await get_reminder(db, user, reminder_id)
@@ -54,40 +110,46 @@ async def get_reminder_detail(
 async def create_reminder_endpoint(
     company_id: UUID = Query(...),
     data: ReminderCreate = ...,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     reminder = await create_reminder(db, user, company_id, data)
+    response = ReminderResponse.model_validate(reminder)
 
+    # 응답과 같은 행을 실어 보내므로 클라이언트는 다시 조회하지 않아도 됩니다
     await manager.broadcast_to_company(
         company_id,
-        create_sync_message("created", "reminder", str(reminder.id)),
+        create_sync_message("created", "reminder", str(reminder.id), data=response.model_dump(mode="json")),
     )
 
-    return ReminderResponse.model_validate(reminder)
+    return response
 
 
 @router.put("/{reminder_id}", response_model=ReminderResponse)
 async def update_reminder_endpoint(
     reminder_id: UUID,
     data: ReminderUpdate,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     reminder = await update_reminder(db, user, reminder_id, data)
+    response = ReminderResponse.model_validate(reminder)
 
     await manager.broadcast_to_company(
         reminder.company_id,
-        create_sync_message("updated", "reminder", str(reminder.id)),
+        create_sync_message(
+            "updated", "reminder", str(reminder.id),
+            data=_sync_patch(response.model_dump(mode="json"), data),
+        ),
     )
 
-    return ReminderResponse.model_validate(reminder)
+    return response
 
 
 @router.delete("/{reminder_id}", status_code=204)
 async def delete_reminder_endpoint(
     reminder_id: UUID,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     reminder = await get_reminder(db, user, reminder_id)
@@ -102,17 +164,45 @@ async def delete_reminder_endpoint(
 
 @router.get("/export/excel")
 async def export_excel(
+    request: Request,
     company_id: UUID = Query(...),
     year: int | None = Query(None),
     category: str | None = Query(None),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    output = await export_reminders_to_excel(db, company_id, user.id, year, category)
+    """Excel 다운로드. 데이터가 바뀌지 않았으면 캐시된 파일을 ETag/Range 지원과 함께 반환합니다.
+
+    캐시에 없으면 만드는 대로 스트리밍하며, 다 보낸 파일은 다음 요청부터 캐시에서 반환합니다.
+    """
+    export = await open_cached_export(db, company_id, user.id, year, category)
 
     filename = f"reminders_{year or 'all'}.xlsx"
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if isinstance(export, tuple):
+        fileobj, size, etag = export
+        return file_response(request, fileobj, size, etag, media_type=media_type, headers=headers)
+    return StreamingResponse(export, media_type=media_type, headers=headers)
+
+
+@router.get("/export/excel/portfolio")
+async def export_excel_portfolio(
+    company_ids: list[UUID] | None = Query(None),
+    year: int | None = Query(None),
+    category: str | None = Query(None),
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """여러 회사를 회사별 시트와 통합 요약 시트가 있는 한 워크북으로 내려받습니다.
+
+    company_ids를 생략하면 소속된 모든 회사를 내보냅니다.
+    """
+    stream = await export_portfolio_to_excel(db, user.id, company_ids, year, category)
+
+    filename = f"portfolio_{year or 'all'}.xlsx"
     return StreamingResponse(
-        output,
+        stream,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -122,8 +212,61 @@ async def export_excel(
 async def import_excel(
     company_id: UUID = Query(...),
     file: UploadFile = File(...),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await import_reminders_from_excel(db, company_id, user.id, file)
+
+    # 가져오기 전체에 대해 동기화 메시지는 한 번만 보냅니다
+    if result["imported_count"] or result["updated_count"]:
+        await manager.broadcast_to_company(
+            company_id,
+            create_sync_message("bulk_created", "reminder"),
+        )
     return result
+
+
+@router.post("/export/excel/jobs", status_code=202)
+async def submit_export_excel_job(
+    company_id: UUID = Query(...),
+    year: int | None = Query(None),
+    category: str | None = Query(None),
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Excel 내보내기 작업을 제출합니다. 진행률은 /excel/jobs/{job_id}로 조회합니다."""
+    return await submit_export_job(db, user.id, company_id, year, category)
+
+
+@router.post("/import/excel/jobs", status_code=202)
+async def submit_import_excel_job(
+    company_id: UUID = Query(...),
+    file: UploadFile = File(...),
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Excel 가져오기 작업을 제출합니다. 완료되면 작업 조회 결과에 가져오기 결과가 포함됩니다."""
+    return await submit_import_job(db, user.id, company_id, file)
+
+
+@router.get("/excel/jobs/{job_id}")
+async def excel_job_status(
+    job_id: UUID,
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_job(db, user.id, job_id)
+
+
+@router.get("/excel/jobs/{job_id}/download")
+async def download_excel_job(
+    job_id: UUID,
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    path, filename = await get_job_file(db, user.id, job_id)
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=filename,
+    )
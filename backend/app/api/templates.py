@@ -9,9 +9,8 @@ from app.schemas.template import (
 from app.schemas.reminder import ReminderResponse
 from app.models.template import Template
 from app.services.template_engine import apply_template, SYSTEM_TEMPLATES, generate_reminders_from_template
-from app.utils.security import get_current_user
+from app.utils.security import get_current_user, Principal
 from app.utils.websocket import manager, create_sync_message
-from app.models.user import User
 
 router = APIRouter(prefix="/templates", tags=["templates"])
 
@@ -19,7 +18,7 @@ router = APIRouter(prefix="/templates", tags=["templates"])
 @router.get("", response_model=list[TemplateResponse])
 async def list_templates(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(select(Template).order_by(Template.name))
     templates = result.scalars().all()
@@ -30,7 +29,7 @@ async def list_templates(
 async def get_template(
     template_id: UUID,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(select(Template).where(Template.id == template_id))
     template = result.scalar_one_or_none()
@@ -44,7 +43,7 @@ async def get_template(
 async def preview_template(
     request: TemplateApplyRequest,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """템플릿 적용 미리보기 (실제 저장하지 않음)."""
     result = await db.execute(select(Template).where(Template.id == request.template_id))
@@ -85,7 +84,7 @@ async def preview_template(
 async def apply_template_endpoint(
     request: TemplateApplyRequest,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """템플릿을 적용하여 실제 리마인더를 생성합니다."""
     reminders = await apply_template(
@@ -11,12 +11,77 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # WebSocket 동기화 브로커 (memory | redis). 워커가 여러 개이면 redis
+    WS_BROKER: str = "memory"
+    WS_SEND_QUEUE_SIZE: int = 64  # 연결별 전송 대기 메시지 수. 넘치면 연결을 끊음
+    WS_COALESCE_WINDOW_MS: int = 30  # 회사별 동기화 메시지를 모으는 시간 (0이면 즉시 전송)
+    WS_COALESCE_MAX_EVENTS: int = 100  # 한 묶음의 최대 이벤트 수. 넘으면 resync 신호
+    WS_REPLAY_BUFFER_SIZE: int = 64  # 재연결 시 다시 보낼 수 있도록 회사별로 보관하는 최근 메시지 수
+    WS_MAX_MESSAGE_BYTES: int = 16 * 1024  # 클라이언트 프레임 최대 크기. 넘으면 버림
+    WS_RELAY_RATE: float = 5.0  # 연결별 클라이언트 메시지 중계 속도 (초당)
+    WS_RELAY_BURST: int = 20
+    WS_COMPANY_RELAY_RATE: float = 50.0  # 회사별(워커 단위) 중계 속도 (초당)
+    WS_COMPANY_RELAY_BURST: int = 100
+    WS_PING_INTERVAL_SECONDS: float = 25.0  # 서버 ping 주기 (0이면 하트비트 없음)
+    WS_IDLE_TIMEOUT_SECONDS: float = 75.0  # 이 시간 동안 받은 메시지(pong 포함)가 없으면 연결을 끊음
+    WS_MAX_CONNECTIONS_PER_USER: int = 20  # 워커 단위
+    WS_MAX_CONNECTIONS_PER_COMPANY: int = 1000  # 워커 단위 회사별 구독 연결 수
+
     # JWT
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Cache
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 30
+    MEMBERSHIP_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_MAX_ENTRIES: int = 4096
+
+    # Scheduler
+    SCHEDULER_ENABLED: bool = True
+    DIGEST_DELAY_SECONDS: int = 60  # 자정 이후 다이제스트 계산까지 대기
+    DIGEST_BATCH_SIZE: int = 1000
+    # 스케줄러를 한 워커에서만 실행하기 위한 잠금 (none: 단일 워커, redis: 여러 워커/호스트)
+    LEADER_LOCK: str = "none"
+    LEADER_LOCK_TTL_SECONDS: float = 30.0
+    # 리더가 다른 워커에서 바뀐 리마인더를 조회하는 주기
+    SCHEDULER_POLL_SECONDS: float = 30.0
+
+    # Notification delivery
+    NOTIFICATION_TRANSPORT: str = "none"  # none | file | smtp
+    NOTIFICATION_FILE_PATH: str = "notifications.jsonl"
+    NOTIFICATION_BATCH_SIZE: int = 50
+    NOTIFICATION_CONCURRENCY: int = 4
+    NOTIFICATION_MAX_RETRIES: int = 3
+    # 재시도까지 실패한 알림을 큐에 다시 넣는 횟수와 간격
+    NOTIFICATION_MAX_REQUEUES: int = 3
+    NOTIFICATION_REQUEUE_DELAY_SECONDS: float = 300.0
+    NOTIFICATION_DIGEST_WINDOW_SECONDS: float = 5.0
+    NOTIFICATION_QUEUE_SIZE: int = 10000
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 25
+    SMTP_SENDER: str = "noreply@localhost"
+
+    # Excel 작업 (결과/업로드 파일 디렉터리는 여러 호스트라면 공유 볼륨이어야 함)
+    EXCEL_WORKERS: int = 2
+    EXCEL_MAX_PENDING: int = 16
+    EXCEL_JOB_DIR: str = "excel_jobs"
+    EXCEL_JOB_TTL_HOURS: int = 24
+    # 실행 중인 작업의 updated_at 갱신 주기. 3배 이상 갱신되지 않은 작업은 중단된 것으로 봅니다
+    EXCEL_JOB_HEARTBEAT_SECONDS: float = 30.0
+    EXCEL_IMPORT_MAX_BYTES: int = 20 * 1024 * 1024
+    EXCEL_IMPORT_BATCH_SIZE: int = 500
+    EXPORT_CACHE_DIR: str = "export_cache"
+    EXPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
     # CORS
     CORS_ORIGINS: str = '["http://localhost:3000","http://localhost:5173"]'
 
@@ -1,5 +1,7 @@
+from typing import Callable
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 from app.config import settings
 
 
@@ -56,3 +58,26 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+
+
+# 세션 info에 커밋 후 실행할 콜백을 모아두는 키
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def run_after_commit(session: AsyncSession | Session, callback: Callable[[], None]) -> None:
+    """현재 트랜잭션이 커밋된 뒤 callback을 실행하도록 등록합니다. 롤백되면 버려집니다.
+
+    캐시 무효화처럼 커밋 전에 하면 다른 요청이 이전 값을 다시 채울 수 있는 작업에 사용합니다.
+    """
+    session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit_callbacks(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT_KEY, None)
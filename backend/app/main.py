@@ -5,8 +5,21 @@ from uuid import UUID
 from app.config import settings
 from app.api import api_router
 from app.utils.websocket import manager
+from app.utils.pubsub import create_broker
 from app.database import get_engine, Base, get_session_factory
 from app.services.template_engine import seed_system_templates
+from app.services.deadline_scheduler import scheduler
+from app.services.notification_dispatch import dispatcher
+from app.services.digest_service import digest_job
+from app.services.access_service import get_member_role
+from app.schemas.websocket import (
+    ClientMessage, SubscribeMessage, UnsubscribeMessage, PongMessage, RelayMessage, parse_client_message,
+)
+from app.services.excel_jobs import start_excel_jobs, stop_excel_jobs
+from app.utils.body_limit import BodySizeLimitMiddleware
+from app.utils.metrics import collect, register_collector
+from app.utils.leader import LeaderElection, create_leader_lock
+from app.utils.security import password_hasher
 
 
 @asynccontextmanager
@@ -22,9 +35,34 @@ async def lifespan(app: FastAPI):
         await seed_system_templates(session)
         await session.commit()
 
+    await start_excel_jobs()
+    await manager.start(create_broker())
+    if settings.NOTIFICATION_TRANSPORT != "none":
+        await dispatcher.start(session_factory)
+    scheduler_leader = None
+    if settings.SCHEDULER_ENABLED:
+        # 알림/다이제스트 작업은 리더 워커 하나에서만 실행합니다 (LEADER_LOCK)
+        async def start_jobs():
+            await scheduler.start(session_factory)
+            await digest_job.start(session_factory)
+
+        async def stop_jobs():
+            await digest_job.stop()
+            await scheduler.stop()
+
+        scheduler_leader = LeaderElection(create_leader_lock("scheduler"), start_jobs, stop_jobs)
+        register_collector("scheduler_leader", scheduler_leader.stats)
+        await scheduler_leader.start()
+
     yield
 
     # Shutdown
+    if scheduler_leader is not None:
+        await scheduler_leader.stop()
+    await dispatcher.stop()
+    await stop_excel_jobs()
+    await manager.stop()
+    password_hasher.shutdown()
     await engine.dispose()
 
 
@@ -44,43 +82,177 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 업로드 본문은 스풀 전에 크기를 제한합니다 (multipart 경계/헤더 여유분 포함)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.EXCEL_IMPORT_MAX_BYTES + 64 * 1024,
+    path_prefixes=("/api/reminders/import",),
+)
+
 # API 라우터
 app.include_router(api_router)
 
 
-# WebSocket 엔드포인트
-@app.websocket("/ws/{company_id}")
-async def websocket_endpoint(
-    websocket: WebSocket,
-    company_id: UUID,
-    token: str = Query(None),
-):
-    # 간단한 토큰 검증
+async def _authenticate_websocket(websocket: WebSocket, token: str | None) -> UUID | None:
+    """핸드셰이크 토큰을 확인하고 사용자 id를 반환합니다. 실패하면 연결을 닫고 None을 반환합니다."""
     if not token:
         await websocket.close(code=4001, reason="Authentication required")
-        return
+        return None
 
     try:
         from app.utils.security import decode_token
         payload = decode_token(token)
         if payload.get("type") != "access":
             await websocket.close(code=4001, reason="Invalid token")
-            return
+            return None
+        return UUID(payload["sub"])
     except Exception:
         await websocket.close(code=4001, reason="Invalid token")
+        return None
+
+
+async def _is_member(user_id: UUID, company_id: UUID) -> bool:
+    async with get_session_factory()() as session:
+        return await get_member_role(session, user_id, company_id) is not None
+
+
+async def _error(websocket: WebSocket, detail: str, company_id: UUID | None = None) -> None:
+    message = {"type": "error", "detail": detail}
+    if company_id is not None:
+        message["company_id"] = str(company_id)
+    await manager.send_personal(websocket, message)
+
+
+async def _receive_client_message(websocket: WebSocket) -> ClientMessage | None:
+    """클라이언트 프레임 하나를 받아 해석합니다.
+
+    너무 크거나 형식이 잘못되면 버리고 None을 반환합니다. pong도 처리할 것이 없으므로 None입니다.
+    """
+    frame = await websocket.receive()
+    if frame["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(frame.get("code", 1000))
+    manager.touch(websocket)
+    raw = frame.get("text")
+    if raw is None:
+        raw = frame.get("bytes") or b""
+
+    size = len(raw) if isinstance(raw, bytes) else len(raw.encode("utf-8"))
+    if size > settings.WS_MAX_MESSAGE_BYTES:
+        await _error(websocket, manager.drop("too_large"))
+        return None
+    try:
+        message = parse_client_message(raw)
+    except ValueError:
+        await _error(websocket, manager.drop("invalid"))
+        return None
+    return None if isinstance(message, PongMessage) else message
+
+
+def _relay_payload(message: RelayMessage, company_id: UUID, sender: UUID) -> dict:
+    """중계 프레임. 서버 동기화 이벤트와 구분되도록 type과 보낸 사용자를 붙입니다.
+
+    클라이언트가 보낸 data는 검증되지 않았으므로 받는 쪽은 이를 행으로 적용하면 안 됩니다.
+    """
+    return {
+        "type": "relay",
+        "sender": str(sender),
+        **message.model_dump(mode="json", exclude={"company_id"}),
+        "company_id": str(company_id),
+    }
+
+
+# WebSocket 엔드포인트
+@app.websocket("/ws/{company_id}")
+async def websocket_endpoint(
+    websocket: WebSocket,
+    company_id: UUID,
+    token: str = Query(None),
+    last_seq: int | None = Query(None, ge=0),
+):
+    user_id = await _authenticate_websocket(websocket, token)
+    if user_id is None:
+        return
+    # 동기화 메시지에 리마인더 내용이 실리므로 회사 멤버만 연결할 수 있습니다
+    if not await _is_member(user_id, company_id):
+        await websocket.close(code=4003, reason="You don't have access to this company")
         return
 
-    await manager.connect(websocket, company_id)
+    # 재연결이면 마지막으로 받은 순번 이후의 메시지를 다시 받습니다
+    if not await manager.connect(websocket, company_id, last_seq, user_id=user_id):
+        return
 
     try:
         while True:
-            data = await websocket.receive_json()
+            message = await _receive_client_message(websocket)
+            if message is None:
+                continue
+            if not isinstance(message, RelayMessage):
+                await _error(websocket, manager.drop("invalid"))
+                continue
             # 클라이언트에서 보낸 메시지를 같은 회사의 다른 클라이언트에 전달
-            await manager.broadcast_to_company(company_id, data, exclude=websocket)
+            dropped = await manager.relay(websocket, company_id, _relay_payload(message, company_id, user_id))
+            if dropped is not None:
+                await _error(websocket, dropped, company_id)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, company_id)
+        pass
+    finally:
+        await manager.disconnect(websocket, company_id)
+
+
+@app.websocket("/ws")
+async def multiplexed_websocket_endpoint(
+    websocket: WebSocket,
+    token: str = Query(None),
+):
+    """연결 하나로 여러 회사를 구독합니다.
+
+    {"type": "subscribe", "company_id": ..., "last_seq": ...} / {"type": "unsubscribe", "company_id": ...}로
+    구독을 바꾸고, 중계 메시지는 company_id의 회사(구독 중이어야 함)의 다른 클라이언트에 전달합니다.
+    """
+    user_id = await _authenticate_websocket(websocket, token)
+    if user_id is None:
+        return
+
+    if not await manager.connect(websocket, user_id=user_id):
+        return
+
+    try:
+        while True:
+            message = await _receive_client_message(websocket)
+            if message is None:
+                continue
+
+            if isinstance(message, SubscribeMessage):
+                if not await _is_member(user_id, message.company_id):
+                    await _error(websocket, "You don't have access to this company", message.company_id)
+                    continue
+                if not await manager.subscribe(websocket, message.company_id, message.last_seq):
+                    await _error(websocket, "Too many connections", message.company_id)
+                    continue
+                # 재전송할 메시지가 있으면 그 뒤에 보냅니다
+                await manager.send_personal(websocket, {"type": "subscribed", "company_id": str(message.company_id)})
+            elif isinstance(message, UnsubscribeMessage):
+                await manager.unsubscribe(websocket, message.company_id)
+                await manager.send_personal(websocket, {"type": "unsubscribed", "company_id": str(message.company_id)})
+            elif message.company_id is None:
+                await _error(websocket, manager.drop("invalid"))
+            else:
+                dropped = await manager.relay(
+                    websocket, message.company_id, _relay_payload(message, message.company_id, user_id)
+                )
+                if dropped is not None:
+                    await _error(websocket, dropped, message.company_id)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await manager.disconnect(websocket)
 
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": settings.APP_NAME}
+
+
+@app.get("/metrics")
+async def metrics():
+    return collect()
@@ -1,6 +1,11 @@
 from app.models.user import User
 from app.models.company import Company, CompanyMember
-from app.models.reminder import Reminder
+from app.models.reminder import Reminder, UserPendingReminder
 from app.models.template import Template, TemplateItem
+from app.models.notification import NotificationDelivery, NotificationDigest
+from app.models.excel_job import ExcelJob
 
-__all__ = ["User", "Company", "CompanyMember", "Reminder", "Template", "TemplateItem"]
+__all__ = [
+    "User", "Company", "CompanyMember", "Reminder", "UserPendingReminder", "Template", "TemplateItem",
+    "NotificationDelivery", "NotificationDigest", "ExcelJob",
+]
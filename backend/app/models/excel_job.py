@@ -0,0 +1,38 @@
+import uuid
+import enum
+from datetime import datetime
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class ExcelJobKind(str, enum.Enum):
+    EXPORT = "export"
+    IMPORT = "import"
+
+
+class ExcelJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ExcelJob(Base):
+    """Excel 내보내기/가져오기 작업. 어느 워커에서든 진행 상태를 조회할 수 있도록 DB에 둡니다."""
+    __tablename__ = "excel_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=ExcelJobStatus.QUEUED.value)
+    company_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("companies.id"), nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    params: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON
+    processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON (가져오기 결과)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    file_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,33 @@
+import uuid
+from datetime import date, datetime
+from sqlalchemy import String, Text, Date, DateTime, Boolean, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class NotificationDelivery(Base):
+    """알림 발송 원장. (사용자, 리마인더, 알림 종류, 채널)당 한 번만 발송합니다."""
+    __tablename__ = "notification_deliveries"
+    __table_args__ = (
+        UniqueConstraint("user_id", "reminder_id", "alert", "channel", name="uq_notification_deliveries_key"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    reminder_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    alert: Mapped[str] = mapped_column(String(20), nullable=False)  # D-3, D-Day, D+1
+    channel: Mapped[str] = mapped_column(String(20), nullable=False)  # email, file
+    sent_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class NotificationDigest(Base):
+    """사용자별 일일 알림 요약. 직렬화된 JSON을 그대로 저장합니다."""
+    __tablename__ = "notification_digests"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    digest_date: Mapped[date] = mapped_column(Date, nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    # 계산 이후 인덱스가 바뀌면 stale로 표시하고 version을 올립니다
+    stale: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
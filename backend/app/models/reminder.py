@@ -1,12 +1,27 @@
 import uuid
+import hashlib
 from datetime import datetime, date
-from sqlalchemy import String, DateTime, Date, Boolean, Text, ForeignKey, Integer
+from sqlalchemy import String, DateTime, Date, Boolean, Text, ForeignKey, Integer, Index, text, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
 
 class Reminder(Base):
     __tablename__ = "reminders"
+    __table_args__ = (
+        # 알림 조회용: 미완료 리마인더만 담는 부분 인덱스
+        Index(
+            "ix_reminders_pending",
+            "company_id",
+            "deadline",
+            postgresql_where=text("completed = false"),
+            sqlite_where=text("completed = 0"),
+        ),
+        # Excel 가져오기 중복 확인용 (회사별 행 지문)
+        Index("ix_reminders_company_fingerprint", "company_id", "fingerprint"),
+        # 스케줄러 리더가 다른 워커의 변경분을 가져올 때 사용
+        Index("ix_reminders_updated_at", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     company_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("companies.id"), nullable=False)
@@ -22,8 +37,47 @@ class Reminder(Base):
     created_by: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # 제목/카테고리/마감일 지문 (reminder_fingerprint)
+    fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     # Relationships
     company = relationship("Company", back_populates="reminders", lazy="selectin")
     template = relationship("Template", lazy="selectin")
     creator = relationship("User", lazy="selectin")
+
+
+def reminder_fingerprint(title: str, category: str, deadline: date) -> str:
+    """제목, 카테고리, 마감일로 만든 행 지문 (sha256 hex).
+
+    마이그레이션 007의 SQL 백필과 같은 형식이어야 합니다.
+    """
+    raw = "\x1f".join([title, category, deadline.isoformat()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@event.listens_for(Reminder, "before_insert")
+@event.listens_for(Reminder, "before_update")
+def _set_fingerprint(mapper, connection, target: Reminder) -> None:
+    target.fingerprint = reminder_fingerprint(target.title, target.category, target.deadline)
+
+
+class UserPendingReminder(Base):
+    """사용자별 미완료 리마인더 읽기 모델.
+
+    리마인더/멤버십 쓰기 시점에 pending_index 서비스가 갱신합니다.
+    알림 조회는 멤버십 조인 없이 이 테이블만 읽습니다.
+    """
+    __tablename__ = "user_pending_reminders"
+    __table_args__ = (
+        Index("ix_user_pending_reminders_user_deadline", "user_id", "deadline"),
+        Index("ix_user_pending_reminders_reminder_id", "reminder_id"),
+        Index("ix_user_pending_reminders_company_id", "company_id"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    reminder_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    company_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    category: Mapped[str] = mapped_column(String(50), nullable=False)
+    deadline: Mapped[date] = mapped_column(Date, nullable=False)
+    priority: Mapped[int] = mapped_column(Integer, default=0)
@@ -7,9 +7,13 @@ from app.schemas.reminder import (
 from app.schemas.template import (
     TemplateResponse, TemplateApplyRequest, TemplateApplyResponse, TemplateItemResponse
 )
+from app.schemas.websocket import (
+    SubscribeMessage, UnsubscribeMessage, PongMessage, RelayMessage, parse_client_message
+)
 
 __all__ = [
     "UserCreate", "UserLogin", "UserResponse", "TokenResponse", "TokenRefreshRequest",
     "ReminderCreate", "ReminderUpdate", "ReminderResponse", "ReminderListResponse",
     "TemplateResponse", "TemplateApplyRequest", "TemplateApplyResponse", "TemplateItemResponse",
+    "SubscribeMessage", "UnsubscribeMessage", "PongMessage", "RelayMessage", "parse_client_message",
 ]
@@ -0,0 +1,62 @@
+import json
+from typing import Annotated, Any, Literal, Union
+from uuid import UUID
+from pydantic import BaseModel, Field, TypeAdapter
+
+
+class SubscribeMessage(BaseModel):
+    type: Literal["subscribe"]
+    company_id: UUID
+    last_seq: int | None = Field(None, ge=0)
+
+    model_config = {"extra": "forbid"}
+
+
+class UnsubscribeMessage(BaseModel):
+    type: Literal["unsubscribe"]
+    company_id: UUID
+
+    model_config = {"extra": "forbid"}
+
+
+class PongMessage(BaseModel):
+    """서버 ping에 대한 응답."""
+
+    type: Literal["pong"]
+
+
+class RelayMessage(BaseModel):
+    """클라이언트가 같은 회사의 다른 클라이언트에 전달하는 메시지. /ws에서는 company_id가 필요합니다.
+
+    받는 쪽에는 {"type": "relay", "sender": ...}가 붙어 전달되며, data는 행으로 적용하지 않습니다.
+    """
+
+    event: Literal["created", "updated", "deleted", "bulk_created"]
+    entity: Literal["reminder", "template"]
+    id: str | None = Field(None, max_length=64)
+    data: dict[str, Any] | None = None
+    company_id: UUID | None = None
+
+    model_config = {"extra": "forbid"}
+
+
+ClientMessage = Union[SubscribeMessage, UnsubscribeMessage, PongMessage, RelayMessage]
+
+_control_adapter = TypeAdapter(
+    Annotated[Union[SubscribeMessage, UnsubscribeMessage, PongMessage], Field(discriminator="type")]
+)
+
+
+def parse_client_message(raw: str | bytes) -> ClientMessage:
+    """클라이언트 프레임을 해석합니다. type이 있으면 제어 메시지, 없으면 중계 메시지입니다.
+
+    형식이 잘못되면 ValueError(ValidationError 포함)를 발생시킵니다.
+    크기 제한 안에서도 중첩이 지나치게 깊으면 디코더가 RecursionError를 내므로 ValueError로 바꿉니다.
+    """
+    try:
+        data = json.loads(raw)
+    except RecursionError:
+        raise ValueError("JSON nesting too deep") from None
+    if isinstance(data, dict) and "type" in data:
+        return _control_adapter.validate_python(data)
+    return RelayMessage.model_validate(data)
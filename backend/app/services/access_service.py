@@ -0,0 +1,100 @@
+"""회사 접근 권한 서비스.
+
+(user_id, company_id) → 역할 조회를 한 곳으로 모읍니다.
+조회 결과는 요청 단위(세션 info)로 메모이즈되고, 짧은 TTL의 프로세스 캐시에도 보관됩니다.
+멤버 초대/역할 변경/제거 시 invalidate_member_role로 캐시를 무효화해야 합니다.
+프로세스 캐시는 커밋 후에 비웁니다. 커밋 전에 비우면 다른 요청이 커밋 전의 역할을 다시 채울 수 있습니다.
+"""
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from fastapi import HTTPException, status
+from app.config import settings
+from app.database import run_after_commit
+from app.models.company import CompanyMember, MemberRole
+from app.utils.cache import TTLCache
+
+# 세션 info에 요청 단위 메모를 저장하는 키
+_REQUEST_KEY = "member_roles"
+# 세션 info에 커밋 대기 중인 무효화 키를 저장하는 키
+_PENDING_KEY = "member_roles_invalidated"
+_MISSING = object()
+
+# (user_id, company_id) -> MemberRole | None (비회원도 캐싱)
+_role_cache = TTLCache(
+    maxsize=settings.MEMBERSHIP_CACHE_MAX_ENTRIES,
+    ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+
+
+def _request_memo(db: AsyncSession) -> dict:
+    return db.info.setdefault(_REQUEST_KEY, {})
+
+
+async def get_member_role(
+    db: AsyncSession, user_id: UUID, company_id: UUID
+) -> MemberRole | None:
+    """사용자의 회사 내 역할을 반환합니다. 멤버가 아니면 None."""
+    key = (user_id, company_id)
+    memo = _request_memo(db)
+    if key in memo:
+        return memo[key]
+
+    # 이 세션에서 바꾼 멤버십은 커밋 전이므로 프로세스 캐시를 읽지도 채우지도 않습니다
+    pending = key in db.info.get(_PENDING_KEY, ())
+    role = _MISSING if pending else _role_cache.get(key, _MISSING)
+    if role is _MISSING:
+        # 관계(selectin) 로딩을 피하기 위해 role 컬럼만 조회
+        result = await db.execute(
+            select(CompanyMember.role).where(
+                CompanyMember.user_id == user_id,
+                CompanyMember.company_id == company_id,
+            )
+        )
+        value = result.scalar_one_or_none()
+        role = MemberRole(value) if value is not None else None
+        if not pending:
+            _role_cache.set(key, role)
+
+    memo[key] = role
+    return role
+
+
+async def require_member(
+    db: AsyncSession,
+    user_id: UUID,
+    company_id: UUID,
+    detail: str = "You don't have access to this company",
+) -> MemberRole:
+    """회사 멤버가 아니면 403을 발생시키고, 멤버이면 역할을 반환합니다."""
+    role = await get_member_role(db, user_id, company_id)
+    if role is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+    return role
+
+
+def invalidate_member_role(
+    user_id: UUID, company_id: UUID, db: AsyncSession | None = None
+) -> None:
+    """멤버십 변경 후 캐시에서 항목을 제거합니다.
+
+    db가 주어지면 요청 메모는 즉시, 프로세스 캐시는 그 세션이 커밋된 뒤에 비웁니다.
+    db가 없으면 이미 커밋된 변경으로 보고 프로세스 캐시를 바로 비웁니다.
+    """
+    key = (user_id, company_id)
+    if db is None:
+        _role_cache.pop(key)
+        return
+
+    _request_memo(db).pop(key, None)
+    db.info.setdefault(_PENDING_KEY, set()).add(key)
+    run_after_commit(db, lambda: _commit_invalidation(db, key))
+
+
+def _commit_invalidation(db: AsyncSession, key: tuple[UUID, UUID]) -> None:
+    db.info.get(_PENDING_KEY, set()).discard(key)
+    _role_cache.pop(key)
+
+
+def clear_member_role_cache() -> None:
+    _role_cache.clear()
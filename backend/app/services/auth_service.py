@@ -5,8 +5,9 @@ from fastapi import HTTPException, status
 from app.models.user import User
 from app.models.company import Company, CompanyMember, MemberRole
 from app.schemas.user import UserCreate, UserLogin, CompanyCreate
+from app.services.access_service import invalidate_member_role
 from app.utils.security import (
-    hash_password, verify_password,
+    Principal, hash_password_async, verify_password_async, password_needs_rehash,
     create_access_token, create_refresh_token, decode_token,
 )
 
@@ -21,7 +22,7 @@ async def register_user(db: AsyncSession, data: UserCreate) -> User:
 
     user = User(
         email=data.email,
-        password_hash=hash_password(data.password),
+        password_hash=await hash_password_async(data.password),
         name=data.name,
     )
     db.add(user)
@@ -33,7 +34,7 @@ async def authenticate_user(db: AsyncSession, data: UserLogin) -> User:
     result = await db.execute(select(User).where(User.email == data.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(data.password, user.password_hash):
+    if not user or not await verify_password_async(data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -45,6 +46,11 @@ async def authenticate_user(db: AsyncSession, data: UserLogin) -> User:
             detail="Account is deactivated",
         )
 
+    # cost factor가 바뀌었으면 로그인 시점에 새 설정으로 재해싱
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(data.password)
+        await db.flush()
+
     return user
 
 
@@ -77,7 +83,7 @@ async def refresh_access_token(db: AsyncSession, refresh_token: str) -> dict:
     return generate_tokens(user.id)
 
 
-async def create_company(db: AsyncSession, user: User, data: CompanyCreate) -> Company:
+async def create_company(db: AsyncSession, user: Principal, data: CompanyCreate) -> Company:
     company = Company(
         name=data.name,
         business_number=data.business_number,
@@ -93,5 +99,6 @@ async def create_company(db: AsyncSession, user: User, data: CompanyCreate) -> C
     )
     db.add(member)
     await db.flush()
+    invalidate_member_role(user.id, company.id, db)
 
     return company
@@ -0,0 +1,302 @@
+"""CSV/NDJSON 가져오기/내보내기 서비스.
+
+연동 스크립트와 BI 도구용 평문 데이터 경로입니다. openpyxl을 거치지 않습니다.
+
+- 내보내기: Excel 내보내기와 같은 필터로 DB 커서를 청크 단위로 읽어 바로 인코딩하고,
+  클라이언트가 허용하면 gzip으로 압축하며 스트리밍합니다.
+- 가져오기: PostgreSQL에서는 COPY로 임시 테이블에 적재한 뒤 행 지문으로
+  INSERT/UPDATE를 한 번에 처리합니다. 그 밖의 DB는 batch 다중 행 INSERT를 사용합니다.
+"""
+import csv
+import gzip
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+from fastapi import HTTPException, status, UploadFile
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_session_factory
+from app.models.reminder import Reminder, reminder_fingerprint
+from app.services.access_service import require_member
+from app.services.deadline_scheduler import track_reminders
+from app.services.export_cache import bump_data_version
+from app.services.excel_service import (
+    export_query, run_cpu, check_upload_size, check_field_lengths, write_import_batch,
+)
+from app.services.pending_index import index_reminders
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_FIELDS = ["id", "title", "category", "deadline", "original_deadline", "completed", "priority", "description"]
+_EXPORT_COLUMNS = tuple(getattr(Reminder, name) for name in EXPORT_FIELDS)
+_EXPORT_BATCH_SIZE = 1000
+_GZIP_LEVEL = 6
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unsupported format: {fmt}")
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Accept-Encoding 헤더가 gzip을 허용하는지 q 값까지 보고 판단합니다.
+
+    gzip(또는 x-gzip)이 명시되면 그 q 값을, 없으면 *의 q 값을 따릅니다. q=0은 거부입니다.
+    """
+    explicit = wildcard = None
+    for item in (accept_encoding or "").split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        coding = coding.lower()
+        if coding in ("gzip", "x-gzip"):
+            explicit = max(explicit or 0.0, quality)
+        elif coding == "*":
+            wildcard = quality
+    if explicit is not None:
+        return explicit > 0
+    return wildcard is not None and wildcard > 0
+
+
+def _export_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _encode_rows(fmt: str, rows, header: bool) -> bytes:
+    if fmt == "ndjson":
+        lines = [
+            json.dumps(dict(zip(EXPORT_FIELDS, map(_export_value, row))), ensure_ascii=False)
+            for row in rows
+        ]
+        return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        writer.writerow(["" if v is None else _export_value(v) for v in row])
+    return buf.getvalue().encode("utf-8")
+
+
+async def _stream_rows(
+    company_id: UUID,
+    fmt: str,
+    year: int | None,
+    category: str | None,
+    compress: bool,
+) -> AsyncIterator[bytes]:
+    # 응답 스트리밍 중에는 요청 세션이 이미 닫혔을 수 있어 별도 세션으로 커서를 엽니다
+    compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+    query = export_query(company_id, year, category, _EXPORT_COLUMNS).order_by(Reminder.deadline, Reminder.id)
+    header = True
+
+    async with get_session_factory()() as session:
+        result = await session.stream(query.execution_options(yield_per=_EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            data = _encode_rows(fmt, partition, header)
+            header = False
+            if compressor is not None:
+                data = compressor.compress(data)
+            if data:
+                yield data
+
+    tail = _encode_rows(fmt, [], header)  # 결과가 없을 때 CSV 헤더
+    if compressor is not None:
+        yield compressor.compress(tail) + compressor.flush()
+    elif tail:
+        yield tail
+
+
+async def export_reminders(
+    db: AsyncSession,
+    company_id: UUID,
+    user_id: UUID,
+    fmt: str,
+    year: int | None = None,
+    category: str | None = None,
+    compress: bool = True,
+) -> AsyncIterator[bytes]:
+    """리마인더를 CSV 또는 NDJSON으로 내보냅니다. 청크를 만들어지는 대로 내보내는 이터레이터를 반환합니다."""
+    _check_format(fmt)
+    await require_member(db, user_id, company_id, detail="Access denied")
+    return _stream_rows(company_id, fmt, year, category, compress)
+
+
+def _parse_record(record: dict) -> dict:
+    """가져오기 레코드 하나를 검증합니다. 잘못된 레코드는 ValueError."""
+    title = record.get("title")
+    category = record.get("category")
+    deadline = record.get("deadline")
+    if not title or not category or not deadline:
+        raise ValueError("필수 필드 누락 (title, category, deadline)")
+
+    title, category = str(title), str(category)
+    # 초과하면 stage 테이블 COPY가 batch 전체를 실패시키므로 행 오류로 알립니다
+    check_field_lengths(title, category)
+    deadline = date.fromisoformat(str(deadline)[:10])
+    return {
+        "title": title,
+        "category": category,
+        "deadline": deadline,
+        "description": str(record["description"]) if record.get("description") else None,
+        "fingerprint": reminder_fingerprint(title, category, deadline),
+    }
+
+
+class _RecordReader:
+    """CSV/NDJSON 업로드를 batch 단위로 읽습니다. gzip 파일도 받습니다. 스레드 풀에서 호출됩니다."""
+
+    def __init__(self, fileobj, fmt: str):
+        fileobj.seek(0)
+        if fileobj.read(2) == b"\x1f\x8b":
+            fileobj.seek(0)
+            fileobj = gzip.GzipFile(fileobj=fileobj)
+        else:
+            fileobj.seek(0)
+        self._text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        if fmt == "csv":
+            # 헤더가 1행이므로 데이터는 2행부터
+            self._records = enumerate(csv.DictReader(self._text), 2)
+        else:
+            self._records = ((n, line) for n, line in enumerate(self._text, 1) if line.strip())
+        self._fmt = fmt
+
+    def read(self, batch_size: int) -> tuple[list[dict], list[dict], int]:
+        """(유효한 행, 오류, 읽은 행 수)를 반환합니다. 읽은 행 수가 0이면 끝입니다."""
+        parsed, errors, seen = [], [], 0
+        for line_no, record in self._records:
+            seen += 1
+            try:
+                if self._fmt == "ndjson":
+                    record = json.loads(record)
+                    if not isinstance(record, dict):
+                        raise ValueError("JSON 객체가 아닙니다")
+                parsed.append(_parse_record(record))
+            except Exception as e:
+                errors.append({"row": line_no, "error": str(e)})
+            if seen >= batch_size:
+                break
+        return parsed, errors, seen
+
+    def close(self) -> None:
+        self._text.detach()
+
+
+async def _copy_batch(db: AsyncSession, company_id: UUID, user_id: UUID, rows: list[dict]) -> tuple[list, int, int]:
+    """COPY로 임시 테이블에 적재한 뒤 지문 기준으로 UPDATE/INSERT를 한 번에 수행합니다 (PostgreSQL)."""
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+
+    await db.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS reminder_import_stage ("
+        " id uuid, title varchar(200), category varchar(50), deadline date,"
+        " description text, fingerprint varchar(64), line_no integer"
+        ") ON COMMIT DROP"
+    ))
+    await db.execute(text("TRUNCATE reminder_import_stage"))
+    await driver.copy_records_to_table(
+        "reminder_import_stage",
+        # line_no: batch 안의 원본 순서. 같은 지문이 반복되면 batch INSERT 경로처럼 마지막 행을 씁니다
+        records=[
+            (uuid4(), r["title"], r["category"], r["deadline"], r["description"], r["fingerprint"], line_no)
+            for line_no, r in enumerate(rows)
+        ],
+        columns=["id", "title", "category", "deadline", "description", "fingerprint", "line_no"],
+    )
+
+    params = {"company_id": company_id, "user_id": user_id}
+    updated = await db.execute(text(
+        "UPDATE reminders r SET description = s.description, updated_at = now() AT TIME ZONE 'utc'"
+        " FROM (SELECT DISTINCT ON (fingerprint) * FROM reminder_import_stage ORDER BY fingerprint, line_no DESC) s"
+        " WHERE r.company_id = :company_id AND r.fingerprint = s.fingerprint"
+        " AND r.description IS DISTINCT FROM s.description"
+        " RETURNING r.id"
+    ), params)
+    updated_count = len(updated.all())
+    if updated_count:
+        await bump_data_version(db, [company_id])
+
+    inserted = await db.execute(text(
+        "INSERT INTO reminders"
+        " (id, company_id, title, category, deadline, description, fingerprint,"
+        "  completed, priority, created_by, created_at, updated_at)"
+        " SELECT DISTINCT ON (s.fingerprint) s.id, :company_id, s.title, s.category, s.deadline,"
+        "  s.description, s.fingerprint, false, 0, :user_id,"
+        "  now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc'"
+        " FROM reminder_import_stage s"
+        " WHERE NOT EXISTS (SELECT 1 FROM reminders r"
+        "  WHERE r.company_id = :company_id AND r.fingerprint = s.fingerprint)"
+        " ORDER BY s.fingerprint, s.line_no DESC"
+        " RETURNING id, company_id, title, category, deadline, completed"
+    ), params)
+    inserted_rows = inserted.all()
+
+    if inserted_rows:
+        await index_reminders(db, [r.id for r in inserted_rows])
+        track_reminders(inserted_rows)
+    return inserted_rows, updated_count, max(len(rows) - len(inserted_rows) - updated_count, 0)
+
+
+async def import_reminders(
+    db: AsyncSession,
+    company_id: UUID,
+    user_id: UUID,
+    fmt: str,
+    file: UploadFile,
+) -> dict:
+    """CSV 또는 NDJSON 파일에서 리마인더를 가져옵니다.
+
+    Excel 가져오기와 같이 행 지문으로 중복 행은 건너뛰고 설명이 바뀐 행은 수정합니다.
+    """
+    _check_format(fmt)
+    await require_member(db, user_id, company_id, detail="Access denied")
+    check_upload_size(file)
+
+    use_copy = db.bind.dialect.name == "postgresql"
+    reader = await run_cpu(_RecordReader, file.file, fmt)
+    errors = []
+    processed = imported = updated = skipped = 0
+    try:
+        while True:
+            parsed, batch_errors, seen = await run_cpu(reader.read, settings.EXCEL_IMPORT_BATCH_SIZE)
+            if not seen:
+                break
+            processed += seen
+            errors.extend(batch_errors)
+            if not parsed:
+                continue
+            if use_copy:
+                inserted, batch_updated, batch_skipped = await _copy_batch(db, company_id, user_id, parsed)
+            else:
+                inserted, batch_updated, batch_skipped = await write_import_batch(db, company_id, user_id, parsed)
+            imported += len(inserted)
+            updated += batch_updated
+            skipped += batch_skipped
+    finally:
+        await run_cpu(reader.close)
+
+    return {
+        "processed": processed,
+        "imported_count": imported,
+        "updated_count": updated,
+        "skipped_count": skipped,
+        "errors": errors,
+    }
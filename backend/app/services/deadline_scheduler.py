@@ -0,0 +1,294 @@
+"""D-N 마감 알림 스케줄러.
+
+가까운 마감일의 미완료 리마인더만 메모리의 우선순위 큐에 올려두고,
+D-3 / D-Day / 마감 지연(D+1) 경계 시각이 되면 ConnectionManager로 회사 채널에 알림을 보냅니다.
+
+- 시작 시와 매일 자정에 새로 범위에 들어온 날짜의 리마인더만 조회합니다 (전체 스캔 없음).
+- 리마인더 쓰기 시 track_reminders / untrack_reminders로 큐를 갱신합니다.
+  스케줄러는 리더 워커에서만 실행되므로, 리더는 SCHEDULER_POLL_SECONDS마다
+  updated_at 기준으로 다른 워커에서 바뀐 리마인더를 조회하여 큐에 반영합니다.
+- 발송 직전에 대상 리마인더를 다시 조회하여 이미 완료/변경된 건은 건너뜁니다.
+- 외부 채널(이메일 등) 전송은 notification_dispatch 디스패처에 넘깁니다.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Iterable
+from uuid import UUID
+from sqlalchemy import select
+from app.config import settings
+from app.models.reminder import Reminder
+from app.services.notification_dispatch import dispatcher
+from app.services.notification_transports import Alert
+from app.utils.metrics import register_collector
+from app.utils.websocket import manager, create_sync_message
+
+logger = logging.getLogger(__name__)
+
+# 마감 N일 전 알림 (음수는 마감 후 지연 알림)
+ALERT_OFFSETS = (3, 0, -1)
+
+
+@dataclass(frozen=True, slots=True)
+class TrackedReminder:
+    id: UUID
+    company_id: UUID
+    title: str
+    deadline: date
+
+
+def alert_label(offset: int) -> str:
+    if offset == 0:
+        return "D-Day"
+    elif offset > 0:
+        return f"D-{offset}"
+    else:
+        return f"D+{abs(offset)}"
+
+
+class DeadlineScheduler:
+    """우선순위 큐 기반 마감 알림 스케줄러."""
+
+    def __init__(
+        self,
+        offsets: tuple[int, ...] = ALERT_OFFSETS,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.offsets = offsets
+        self._clock = clock
+        # (fire_at, seq, reminder_id, generation, offset)
+        self._heap: list[tuple[datetime, int, UUID, int, int]] = []
+        self._seq = itertools.count()
+        # reminder_id -> (리마인더, 세대). 큐 항목은 세대가 같을 때만 유효합니다
+        self._tracked: dict[UUID, tuple[TrackedReminder, int]] = {}
+        self._generations = itertools.count()
+        self._loaded_until: date | None = None
+        # 마지막 변경분 조회 시각 (UTC, updated_at과 비교)
+        self._polled_at: datetime | None = None
+        self._session_factory = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.fired = 0
+
+    @property
+    def lookahead_days(self) -> int:
+        # 가장 이른 알림 경계보다 하루 먼저 적재해야 자정 경계를 놓치지 않습니다
+        return max(self.offsets) + 1
+
+    # --- 큐 관리 -------------------------------------------------------------
+
+    def track(self, reminder: TrackedReminder) -> None:
+        """리마인더를 큐에 올립니다. 같은 마감일로 이미 등록되어 있으면 무시합니다."""
+        current = self._tracked.get(reminder.id)
+        if current is not None and current[0].deadline == reminder.deadline:
+            self._tracked[reminder.id] = (reminder, current[1])
+            return
+
+        if self._loaded_until is None or reminder.deadline > self._loaded_until:
+            # 시작 전이거나 아직 적재 범위 밖: 창을 넓힐 때 조회됩니다
+            self._tracked.pop(reminder.id, None)
+            return
+
+        now = self._clock()
+        # 새 세대로 등록하여 이전에 넣은 큐 항목(해제 후 재등록, 마감일 A→B→A)이 다시 살아나지 않게 합니다
+        generation = next(self._generations)
+
+        pushed = False
+        for offset in self.offsets:
+            fire_at = datetime.combine(reminder.deadline - timedelta(days=offset), time.min)
+            if fire_at > now:
+                heapq.heappush(self._heap, (fire_at, next(self._seq), reminder.id, generation, offset))
+                pushed = True
+
+        if pushed:
+            self._tracked[reminder.id] = (reminder, generation)
+            self._wake()
+        else:
+            self._tracked.pop(reminder.id, None)
+
+    def untrack(self, reminder_id: UUID) -> None:
+        # 큐 항목은 남겨두고 꺼낼 때 건너뜁니다 (lazy deletion)
+        self._tracked.pop(reminder_id, None)
+
+    def pop_due(self, now: datetime) -> list[tuple[TrackedReminder, int]]:
+        """발송 시각이 된 (리마인더, offset) 목록을 꺼냅니다."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, reminder_id, generation, offset = heapq.heappop(self._heap)
+            entry = self._tracked.get(reminder_id)
+            if entry is None or entry[1] != generation:
+                continue
+            due.append((entry[0], offset))
+            if offset == min(self.offsets):
+                self._tracked.pop(reminder_id, None)
+        return due
+
+    def next_fire_at(self) -> datetime | None:
+        while self._heap:
+            _, _, reminder_id, generation, _ = self._heap[0]
+            entry = self._tracked.get(reminder_id)
+            if entry is not None and entry[1] == generation:
+                return self._heap[0][0]
+            heapq.heappop(self._heap)
+        return None
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # --- DB 적재 / 발송 -------------------------------------------------------
+
+    async def _load(self, start: date, end: date) -> None:
+        """마감일이 [start, end]인 미완료 리마인더만 조회하여 큐에 올립니다."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(Reminder.id, Reminder.company_id, Reminder.title, Reminder.deadline).where(
+                    Reminder.completed == False,
+                    Reminder.deadline >= start,
+                    Reminder.deadline <= end,
+                )
+            )
+            rows = result.all()
+
+        self._loaded_until = end
+        for row in rows:
+            self.track(TrackedReminder(*row))
+
+    async def _poll_changes(self) -> None:
+        """다른 워커에서 생성/수정된 리마인더를 조회하여 큐에 반영합니다.
+
+        updated_at은 커밋 전에 기록되므로 한 주기만큼 겹쳐 조회합니다. 같은 마감일 재등록은 무시됩니다.
+        """
+        now = datetime.utcnow()
+        since = self._polled_at - timedelta(seconds=settings.SCHEDULER_POLL_SECONDS)
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(Reminder.id, Reminder.company_id, Reminder.title, Reminder.deadline, Reminder.completed)
+                .where(Reminder.updated_at >= since, Reminder.deadline <= self._loaded_until)
+            )
+            rows = result.all()
+
+        self._polled_at = now
+        for row in rows:
+            if row.completed:
+                self.untrack(row.id)
+            else:
+                self.track(TrackedReminder(row.id, row.company_id, row.title, row.deadline))
+
+    async def _advance_window(self) -> None:
+        horizon = self._clock().date() + timedelta(days=self.lookahead_days)
+        if self._loaded_until is None:
+            self._polled_at = datetime.utcnow()
+            # 지연 알림(D+1)까지 받을 수 있도록 오늘 마감분부터 적재
+            await self._load(self._clock().date() + timedelta(days=min(min(self.offsets), 0) + 1), horizon)
+        elif self._loaded_until < horizon:
+            await self._load(self._loaded_until + timedelta(days=1), horizon)
+
+    async def _dispatch(self, due: list[tuple[TrackedReminder, int]]) -> None:
+        # 발송 직전 재확인: 다른 워커에서 완료/수정된 건 제외
+        ids = [tracked.id for tracked, _ in due]
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(Reminder.id, Reminder.deadline).where(
+                    Reminder.id.in_(ids),
+                    Reminder.completed == False,
+                )
+            )
+            current = dict(result.all())
+
+        alerts = []
+        for tracked, offset in due:
+            if current.get(tracked.id) != tracked.deadline:
+                continue
+            alerts.append(Alert(tracked.id, tracked.company_id, tracked.title, tracked.deadline, alert_label(offset)))
+            await manager.broadcast_to_company(
+                tracked.company_id,
+                create_sync_message(
+                    "deadline_alert",
+                    "reminder",
+                    str(tracked.id),
+                    data={
+                        "title": tracked.title,
+                        "deadline": tracked.deadline.isoformat(),
+                        "d_day_label": alert_label(offset),
+                    },
+                ),
+            )
+            self.fired += 1
+
+        # 이메일 등 외부 채널은 디스패처가 수신자별로 묶어 전송
+        dispatcher.enqueue(alerts)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._advance_window()
+                elapsed = (datetime.utcnow() - self._polled_at).total_seconds() if self._polled_at else 0
+                if self._loaded_until is not None and elapsed >= settings.SCHEDULER_POLL_SECONDS:
+                    await self._poll_changes()
+                due = self.pop_due(self._clock())
+                if due:
+                    await self._dispatch(due)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("deadline scheduler tick failed")
+
+            now = self._clock()
+            next_midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+            next_poll = now + timedelta(seconds=settings.SCHEDULER_POLL_SECONDS)
+            wake_at = min(filter(None, [self.next_fire_at(), next_midnight, next_poll]))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max((wake_at - now).total_seconds(), 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self, session_factory) -> None:
+        # 리더를 잃었다가 다시 맡을 수 있으므로 이전 큐를 버리고 창을 처음부터 적재합니다
+        self._heap = []
+        self._tracked = {}
+        self._loaded_until = None
+        self._polled_at = None
+        self._session_factory = session_factory
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "tracked": len(self._tracked),
+            "queued": len(self._heap),
+            "loaded_until": self._loaded_until.isoformat() if self._loaded_until else None,
+            "fired": self.fired,
+        }
+
+
+# 전역 스케줄러 인스턴스
+scheduler = DeadlineScheduler()
+register_collector("deadline_scheduler", scheduler.stats)
+
+
+def track_reminders(reminders: Iterable[Reminder]) -> None:
+    """리마인더 생성/수정 후 호출합니다. 완료된 리마인더는 큐에서 제외됩니다."""
+    for r in reminders:
+        if r.completed:
+            scheduler.untrack(r.id)
+        else:
+            scheduler.track(TrackedReminder(r.id, r.company_id, r.title, r.deadline))
+
+
+def untrack_reminders(reminder_ids: Iterable[UUID]) -> None:
+    for reminder_id in reminder_ids:
+        scheduler.untrack(reminder_id)
@@ -0,0 +1,225 @@
+"""사용자별 일일 알림 다이제스트.
+
+자정 직후 활성 사용자 전체의 알림 요약을 사용자 묶음 단위 집계 쿼리로 계산하여
+직렬화된 JSON으로 notification_digests에 저장합니다.
+
+- /api/notifications/summary는 오늘 날짜의 다이제스트를 그대로 반환합니다.
+- 계산 이후 쓰기로 인덱스가 바뀐 사용자는 pending_index가 stale로 표시하고,
+  다음 조회 때 그 사용자분만 다시 계산하여 덮어씁니다.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+from typing import Callable
+from uuid import UUID
+from sqlalchemy import select, update, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.notification import NotificationDigest
+from app.models.user import User
+from app.services.notification_service import (
+    DEFAULT_SUMMARY_TOP, _summary_query, _build_summary, get_notification_summary,
+)
+from app.utils.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+# 여러 워커 중 하나만 야간 계산을 수행하도록 잡는 advisory lock 키
+_LOCK_KEY = 0x6469676573
+_counters = defaultdict(int)
+
+
+def _serialize(summary: dict) -> str:
+    return json.dumps(summary, ensure_ascii=False, separators=(",", ":"))
+
+
+async def _upsert(db: AsyncSession, rows: list[dict]) -> None:
+    """다이제스트를 저장합니다.
+
+    행의 version은 계산 전에 읽은 값입니다. 그 사이 stale로 표시되어 version이 오른 사용자는 덮어쓰지 않습니다.
+    """
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(NotificationDigest).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[NotificationDigest.user_id],
+        set_={
+            "digest_date": stmt.excluded.digest_date,
+            "payload": stmt.excluded.payload,
+            "computed_at": stmt.excluded.computed_at,
+            "stale": False,
+        },
+        where=NotificationDigest.version == stmt.excluded.version,
+    )
+    await db.execute(stmt)
+
+
+def _digest_row(user_id: UUID, today: date, payload: str, computed_at: datetime, version: int) -> dict:
+    return {
+        "user_id": user_id,
+        "digest_date": today,
+        "payload": payload,
+        "computed_at": computed_at,
+        "stale": False,
+        "version": version,
+    }
+
+
+async def build_digests(
+    db: AsyncSession,
+    user_ids: list[UUID],
+    today: date,
+    top: int = DEFAULT_SUMMARY_TOP,
+) -> int:
+    """사용자 묶음의 다이제스트를 한 번의 집계 쿼리로 계산하여 저장합니다."""
+    computed_at = datetime.utcnow()
+    # 집계 중 stale로 표시된 사용자는 덮어쓰지 않도록 version을 먼저 읽습니다
+    versions = dict((await db.execute(
+        select(NotificationDigest.user_id, NotificationDigest.version)
+        .where(NotificationDigest.user_id.in_(user_ids))
+    )).all())
+    result = await db.execute(_summary_query(today, top, user_ids))
+    rows_by_user = {
+        user_id: list(rows)
+        for user_id, rows in groupby(result.all(), key=lambda row: row.user_id)
+    }
+    digests = [
+        _digest_row(
+            user_id, today,
+            _serialize(_build_summary(rows_by_user.get(user_id, []), today, top, computed_at)),
+            computed_at,
+            versions.get(user_id, 0),
+        )
+        for user_id in user_ids
+    ]
+    await _upsert(db, digests)
+    return len(digests)
+
+
+async def get_daily_summary(db: AsyncSession, user_id: UUID) -> str:
+    """오늘 다이제스트(JSON 문자열)를 반환합니다.
+
+    없거나 stale이면 이 사용자분만 다시 계산하여 저장합니다.
+    """
+    today = date.today()
+    result = await db.execute(
+        select(
+            NotificationDigest.digest_date,
+            NotificationDigest.payload,
+            NotificationDigest.stale,
+            NotificationDigest.version,
+        ).where(NotificationDigest.user_id == user_id)
+    )
+    row = result.first()
+    if row is not None and row.digest_date == today and not row.stale:
+        _counters["hits"] += 1
+        return row.payload
+
+    _counters["refreshes"] += 1
+    summary = await get_notification_summary(db, user_id)
+    payload = _serialize(summary)
+    version = row.version if row is not None else 0
+    await _upsert(db, [_digest_row(user_id, today, payload, datetime.utcnow(), version)])
+    return payload
+
+
+async def mark_digests_stale(db: AsyncSession, user_ids) -> None:
+    """해당 사용자(id 목록 또는 SELECT)의 다이제스트를 stale로 표시합니다."""
+    await db.execute(
+        update(NotificationDigest)
+        .where(NotificationDigest.user_id.in_(user_ids))
+        .values(stale=True, version=NotificationDigest.version + 1),
+        execution_options={"synchronize_session": False},
+    )
+
+
+async def _try_lock(session: AsyncSession) -> bool:
+    if session.bind.dialect.name != "postgresql":
+        return True
+    result = await session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    return bool(result.scalar())
+
+
+class DailyDigestJob:
+    """자정 직후 전체 사용자의 다이제스트를 계산하는 작업."""
+
+    def __init__(
+        self,
+        delay_seconds: int = settings.DIGEST_DELAY_SECONDS,
+        batch_size: int = settings.DIGEST_BATCH_SIZE,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.delay_seconds = delay_seconds
+        self.batch_size = batch_size
+        self._clock = clock
+        self._session_factory = None
+        self._task: asyncio.Task | None = None
+        self.last_run_at: datetime | None = None
+        self.last_built = 0
+
+    def next_run_at(self, now: datetime) -> datetime:
+        run_at = datetime.combine(now.date(), time.min) + timedelta(seconds=self.delay_seconds)
+        return run_at if run_at > now else run_at + timedelta(days=1)
+
+    async def run_once(self, today: date | None = None) -> int:
+        """활성 사용자를 batch_size씩 나눠 다이제스트를 계산합니다. 다른 워커가 실행 중이면 건너뜁니다."""
+        today = today or self._clock().date()
+        built = 0
+        async with self._session_factory() as lock_session:
+            if not await _try_lock(lock_session):
+                _counters["skipped_runs"] += 1
+                return 0
+
+            last_id = None
+            while True:
+                async with self._session_factory() as session:
+                    query = select(User.id).where(User.is_active == True).order_by(User.id).limit(self.batch_size)
+                    if last_id is not None:
+                        query = query.where(User.id > last_id)
+                    user_ids = list((await session.execute(query)).scalars())
+                    if not user_ids:
+                        break
+                    built += await build_digests(session, user_ids, today)
+                    await session.commit()
+                last_id = user_ids[-1]
+
+        self.last_run_at = self._clock()
+        self.last_built = built
+        return built
+
+    async def _run(self) -> None:
+        while True:
+            now = self._clock()
+            await asyncio.sleep((self.next_run_at(now) - now).total_seconds())
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("daily digest job failed")
+
+    async def start(self, session_factory) -> None:
+        self._session_factory = session_factory
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_built": self.last_built,
+            **_counters,
+        }
+
+
+# 전역 다이제스트 작업 인스턴스
+digest_job = DailyDigestJob()
+register_collector("daily_digest", digest_job.stats)
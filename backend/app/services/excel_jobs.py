@@ -0,0 +1,300 @@
+"""Excel 내보내기/가져오기 작업(job).
+
+큰 파일도 API 요청을 붙잡지 않도록 작업으로 제출하고, 진행률을 조회한 뒤 결과를 내려받습니다.
+
+- 작업 상태는 excel_jobs 테이블에 두므로 어느 워커에서든 조회할 수 있습니다.
+- 워크북 생성/파싱은 excel_service의 excel_executor(제한된 스레드 풀)에서 실행되며,
+  한 워커에서 동시에 실행되는 작업 수는 EXCEL_WORKERS로 제한됩니다.
+- 결과 파일과 업로드 원본은 EXCEL_JOB_DIR에 저장하고 EXCEL_JOB_TTL_HOURS 후 정리합니다.
+- 워커는 맡은 작업의 updated_at을 EXCEL_JOB_HEARTBEAT_SECONDS마다 갱신합니다. 워커가 죽어
+  갱신이 멈춘 queued/running 작업은 시작 시와 작업 제출 시 failed로 바꿉니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import UUID, uuid4
+from fastapi import HTTPException, status, UploadFile
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_session_factory
+from app.models.excel_job import ExcelJob, ExcelJobKind, ExcelJobStatus
+from app.services.access_service import require_member
+from app.services.excel_service import (
+    build_export_workbook, count_export_rows, import_reminders_from_path, check_upload_size, excel_executor,
+)
+from app.utils.websocket import manager, create_sync_message
+
+logger = logging.getLogger(__name__)
+
+_tasks: set[asyncio.Task] = set()
+_slots: asyncio.Semaphore | None = None
+# 이 워커가 맡은 (대기/실행 중) 작업
+_active: set[UUID] = set()
+_heartbeat: asyncio.Task | None = None
+
+
+def _job_dir() -> Path:
+    path = Path(settings.EXCEL_JOB_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _remove_file(path: str | None) -> None:
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _job_response(job: ExcelJob) -> dict:
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "status": job.status,
+        "processed": job.processed,
+        "total": job.total,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+async def _update_job(job_id: UUID, **values) -> None:
+    async with get_session_factory()() as session:
+        await session.execute(
+            update(ExcelJob).where(ExcelJob.id == job_id).values(updated_at=datetime.utcnow(), **values)
+        )
+        await session.commit()
+
+
+async def _purge_expired(db: AsyncSession) -> None:
+    """보존 기간이 지난 작업과 파일을 정리합니다."""
+    cutoff = datetime.utcnow() - timedelta(hours=settings.EXCEL_JOB_TTL_HOURS)
+    result = await db.execute(select(ExcelJob.id, ExcelJob.file_path).where(ExcelJob.created_at < cutoff))
+    expired = result.all()
+    if not expired:
+        return
+    await asyncio.to_thread(lambda: [_remove_file(path) for _, path in expired])
+    await db.execute(delete(ExcelJob).where(ExcelJob.id.in_([job_id for job_id, _ in expired])))
+
+
+async def _fail_orphaned(db: AsyncSession) -> None:
+    """갱신이 멈춘 queued/running 작업(실행하던 워커가 종료됨)을 실패로 표시합니다."""
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=settings.EXCEL_JOB_HEARTBEAT_SECONDS * 3)
+    await db.execute(
+        update(ExcelJob)
+        .where(
+            ExcelJob.status.in_([ExcelJobStatus.QUEUED.value, ExcelJobStatus.RUNNING.value]),
+            ExcelJob.updated_at < cutoff,
+        )
+        .values(
+            status=ExcelJobStatus.FAILED.value,
+            error="Job was interrupted by a server restart",
+            updated_at=now,
+            finished_at=now,
+        )
+    )
+
+
+async def _heartbeat_loop() -> None:
+    while True:
+        await asyncio.sleep(settings.EXCEL_JOB_HEARTBEAT_SECONDS)
+        if not _active:
+            continue
+        try:
+            async with get_session_factory()() as session:
+                await session.execute(
+                    update(ExcelJob).where(ExcelJob.id.in_(list(_active))).values(updated_at=datetime.utcnow())
+                )
+                await session.commit()
+        except Exception:
+            logger.exception("excel job heartbeat failed")
+
+
+async def _create_job(kind: ExcelJobKind, company_id: UUID, user_id: UUID, params: dict, **values) -> ExcelJob:
+    # 작업 태스크가 바로 읽을 수 있도록 요청 트랜잭션과 별개로 커밋합니다
+    async with get_session_factory()() as session:
+        await _purge_expired(session)
+        await _fail_orphaned(session)
+        job = ExcelJob(
+            kind=kind.value,
+            status=ExcelJobStatus.QUEUED.value,
+            company_id=company_id,
+            user_id=user_id,
+            params=json.dumps(params),
+            **values,
+        )
+        session.add(job)
+        await session.commit()
+        return job
+
+
+def _spawn(job_id: UUID, work) -> None:
+    task = asyncio.create_task(_run_job(job_id, work))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _run_job(job_id: UUID, work) -> None:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.EXCEL_WORKERS)
+
+    _active.add(job_id)
+    try:
+        async with _slots:
+            await _update_job(job_id, status=ExcelJobStatus.RUNNING.value)
+            try:
+                values = await work()
+            except Exception as e:
+                logger.exception("excel job %s failed", job_id)
+                error = e.detail if isinstance(e, HTTPException) else str(e)
+                await _update_job(
+                    job_id, status=ExcelJobStatus.FAILED.value, error=error, finished_at=datetime.utcnow(),
+                )
+                return
+            await _update_job(job_id, status=ExcelJobStatus.DONE.value, finished_at=datetime.utcnow(), **values)
+    except asyncio.CancelledError:
+        # 종료로 취소된 작업이 queued/running으로 남지 않게 합니다
+        await _update_job(
+            job_id,
+            status=ExcelJobStatus.FAILED.value,
+            error="Job was interrupted by server shutdown",
+            finished_at=datetime.utcnow(),
+        )
+        raise
+    finally:
+        _active.discard(job_id)
+
+
+async def submit_export_job(
+    db: AsyncSession,
+    user_id: UUID,
+    company_id: UUID,
+    year: int | None = None,
+    category: str | None = None,
+) -> dict:
+    """Excel 내보내기 작업을 제출합니다."""
+    await require_member(db, user_id, company_id, detail="Access denied")
+    job = await _create_job(
+        ExcelJobKind.EXPORT, company_id, user_id, {"year": year, "category": category},
+    )
+
+    async def progress(processed: int) -> None:
+        await _update_job(job.id, processed=processed)
+
+    async def work() -> dict:
+        async with get_session_factory()() as session:
+            await _update_job(job.id, total=await count_export_rows(session, company_id, year, category))
+            wb = await build_export_workbook(session, company_id, year, category, on_progress=progress)
+        path = str(_job_dir() / f"{job.id}.xlsx")
+        await excel_executor.run(wb.save, path)
+        return {"file_path": path}
+
+    _spawn(job.id, work)
+    return _job_response(job)
+
+
+async def submit_import_job(
+    db: AsyncSession,
+    user_id: UUID,
+    company_id: UUID,
+    file: UploadFile,
+) -> dict:
+    """Excel 가져오기 작업을 제출합니다. 업로드 파일은 작업 디렉터리에 먼저 저장합니다."""
+    await require_member(db, user_id, company_id, detail="Access denied")
+    check_upload_size(file)
+
+    upload_path = str(_job_dir() / f"{uuid4()}.upload.xlsx")
+
+    def save_upload() -> None:
+        file.file.seek(0)
+        with open(upload_path, "wb") as out:
+            shutil.copyfileobj(file.file, out)
+
+    await asyncio.to_thread(save_upload)
+    job = await _create_job(ExcelJobKind.IMPORT, company_id, user_id, {"filename": file.filename})
+
+    async def progress(report: dict) -> None:
+        # 행별 오류는 진행 중에도 작업 조회로 확인할 수 있습니다
+        await _update_job(
+            job.id,
+            processed=report["processed"],
+            total=report["total"],
+            result=json.dumps(
+                {k: v for k, v in report.items() if k not in ("processed", "total")}, ensure_ascii=False,
+            ),
+        )
+
+    async def work() -> dict:
+        try:
+            async with get_session_factory()() as session:
+                result = await import_reminders_from_path(
+                    session, company_id, user_id, upload_path, on_progress=progress,
+                )
+                await session.commit()
+        finally:
+            await asyncio.to_thread(_remove_file, upload_path)
+        if result["imported_count"] or result["updated_count"]:
+            await manager.broadcast_to_company(company_id, create_sync_message("bulk_created", "reminder"))
+        return {"result": json.dumps(result, ensure_ascii=False)}
+
+    _spawn(job.id, work)
+    return _job_response(job)
+
+
+async def _get_own_job(db: AsyncSession, user_id: UUID, job_id: UUID) -> ExcelJob:
+    result = await db.execute(select(ExcelJob).where(ExcelJob.id == job_id, ExcelJob.user_id == user_id))
+    job = result.scalar_one_or_none()
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+async def get_job(db: AsyncSession, user_id: UUID, job_id: UUID) -> dict:
+    """작업 상태와 진행률을 반환합니다. 본인이 제출한 작업만 조회할 수 있습니다."""
+    return _job_response(await _get_own_job(db, user_id, job_id))
+
+
+async def get_job_file(db: AsyncSession, user_id: UUID, job_id: UUID) -> tuple[str, str]:
+    """완료된 내보내기 작업의 (파일 경로, 다운로드 파일명)을 반환합니다."""
+    job = await _get_own_job(db, user_id, job_id)
+    if job.kind != ExcelJobKind.EXPORT.value:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Job has no download")
+    if job.status != ExcelJobStatus.DONE.value:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job is not finished")
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Export file expired")
+
+    params = json.loads(job.params or "{}")
+    return job.file_path, f"reminders_{params.get('year') or 'all'}.xlsx"
+
+
+async def start_excel_jobs() -> None:
+    """시작 시 중단된 작업을 정리하고 작업 상태 갱신을 시작합니다."""
+    global _heartbeat
+    async with get_session_factory()() as session:
+        await _fail_orphaned(session)
+        await session.commit()
+    _heartbeat = asyncio.create_task(_heartbeat_loop())
+
+
+async def stop_excel_jobs() -> None:
+    """종료 시 실행 중인 작업을 취소합니다."""
+    global _heartbeat
+    if _heartbeat is not None:
+        _heartbeat.cancel()
+        await asyncio.gather(_heartbeat, return_exceptions=True)
+        _heartbeat = None
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    excel_executor.shutdown()
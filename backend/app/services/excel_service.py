@@ -2,17 +2,32 @@
 
 openpyxl을 사용하여 리마인더 데이터를 Excel 파일로 내보내거나
 Excel 파일에서 리마인더 데이터를 가져옵니다.
+내보내기는 write-only 워크북과 공유 named style을 사용하여 행 수와 무관하게 메모리를 일정하게 유지합니다.
 """
-import io
+import asyncio
+import os
+import re
 from datetime import date, datetime
-from uuid import UUID
+from itertools import groupby
+from operator import attrgetter
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable
+from uuid import UUID, uuid4
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, bindparam, func
 from fastapi import HTTPException, status, UploadFile
-from app.models.reminder import Reminder
-from app.models.company import CompanyMember
+from app.models.company import Company, CompanyMember
+from app.models.reminder import Reminder, reminder_fingerprint
+from app.services.access_service import require_member
+from app.services.export_cache import export_cache, get_data_version, bump_data_version
+from app.services.pending_index import index_reminders
+from app.config import settings
+from app.services.deadline_scheduler import track_reminders
+from app.utils.executor import BoundedExecutor, ExecutorBusyError
+from app.utils.streaming import stream_writer_output
 
 CATEGORY_MAP = {
     "원천세": "원천세",
@@ -37,201 +52,552 @@ THIN_BORDER = Border(
     top=Side(style="thin"),
     bottom=Side(style="thin"),
 )
+CENTER = Alignment(horizontal="center", vertical="center")
+
+EXPORT_HEADERS = ["번호", "제목", "카테고리", "마감일", "원래 마감일", "완료 여부", "우선순위", "설명"]
+EXPORT_COLUMN_WIDTHS = [8, 40, 15, 15, 15, 12, 10, 50]
+# 가운데 정렬 열 (0부터)
+_CENTERED_COLUMNS = frozenset({0, 3, 4, 5, 6})
+# DB에서 한 번에 가져오는 행 수
+_EXPORT_BATCH_SIZE = 1000
+
+# openpyxl은 순수 파이썬 CPU 작업이라 전용 스레드 풀에서 실행합니다
+excel_executor = BoundedExecutor(
+    "excel_worker",
+    max_workers=settings.EXCEL_WORKERS,
+    max_pending=settings.EXCEL_MAX_PENDING,
+)
 
 
-async def export_reminders_to_excel(
-    db: AsyncSession,
-    company_id: UUID,
-    user_id: UUID,
-    year: int | None = None,
-    category: str | None = None,
-) -> io.BytesIO:
-    """리마인더를 Excel 파일로 내보냅니다."""
-    # 접근 권한 확인
-    member_result = await db.execute(
-        select(CompanyMember).where(
-            CompanyMember.user_id == user_id,
-            CompanyMember.company_id == company_id,
-        )
-    )
-    if not member_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied",
-        )
+def _register_styles(wb: Workbook) -> None:
+    """셀마다 스타일 객체를 만들지 않도록 공유 named style을 등록합니다."""
+    styles = [NamedStyle("header", font=HEADER_FONT, fill=HEADER_FILL, border=THIN_BORDER, alignment=CENTER)]
+    styles.append(NamedStyle("title", font=Font(size=14, bold=True)))
+    for state, fill in (("", None), ("_completed", COMPLETED_FILL), ("_overdue", OVERDUE_FILL)):
+        for align, alignment in (("", None), ("_center", Alignment(horizontal="center"))):
+            style = NamedStyle(f"data{align}{state}", font=DATA_FONT, border=THIN_BORDER)
+            if fill is not None:
+                style.fill = fill
+            if alignment is not None:
+                style.alignment = alignment
+            styles.append(style)
+    for style in styles:
+        wb.add_named_style(style)
+
+
+def _styled_row(ws, values: list, state: str = "") -> list[WriteOnlyCell]:
+    cells = []
+    for col, value in enumerate(values):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = f"data{'_center' if col in _CENTERED_COLUMNS else ''}{state}"
+        cells.append(cell)
+    return cells
+
+
+def _header_row(ws, headers: list[str], widths: list[int]) -> list[WriteOnlyCell]:
+    for col, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+    cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.style = "header"
+        cells.append(cell)
+    return cells
+
+
+EXPORT_COLUMNS = (
+    Reminder.title,
+    Reminder.category,
+    Reminder.deadline,
+    Reminder.original_deadline,
+    Reminder.completed,
+    Reminder.priority,
+    Reminder.description,
+)
+
 
-    query = select(Reminder).where(Reminder.company_id == company_id)
+def _apply_filters(query, year: int | None, category: str | None):
     if year:
-        from sqlalchemy import func
         query = query.where(func.extract("year", Reminder.deadline) == year)
     if category:
         query = query.where(Reminder.category == category)
-    query = query.order_by(Reminder.deadline)
-
-    result = await db.execute(query)
-    reminders = result.scalars().all()
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "일정 목록"
-
-    # 헤더
-    headers = ["번호", "제목", "카테고리", "마감일", "원래 마감일", "완료 여부", "우선순위", "설명"]
-    col_widths = [8, 40, 15, 15, 15, 12, 10, 50]
-
-    for col_idx, (header, width) in enumerate(zip(headers, col_widths), 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.fill = HEADER_FILL
-        cell.font = HEADER_FONT
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = THIN_BORDER
-        ws.column_dimensions[chr(64 + col_idx)].width = width
-
-    today = date.today()
-
-    for row_idx, reminder in enumerate(reminders, 2):
-        row_data = [
-            row_idx - 1,
-            reminder.title,
-            reminder.category,
-            reminder.deadline.strftime("%Y-%m-%d"),
-            reminder.original_deadline.strftime("%Y-%m-%d") if reminder.original_deadline else "",
-            "완료" if reminder.completed else "미완료",
-            _priority_label(reminder.priority),
-            reminder.description or "",
-        ]
-
-        for col_idx, value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.font = DATA_FONT
-            cell.border = THIN_BORDER
-
-            if col_idx in (1, 4, 5, 6, 7):
-                cell.alignment = Alignment(horizontal="center")
-
-        if reminder.completed:
-            for col_idx in range(1, len(headers) + 1):
-                ws.cell(row=row_idx, column=col_idx).fill = COMPLETED_FILL
-        elif reminder.deadline < today and not reminder.completed:
-            for col_idx in range(1, len(headers) + 1):
-                ws.cell(row=row_idx, column=col_idx).fill = OVERDUE_FILL
+    return query
+
+
+def export_query(company_id: UUID, year: int | None, category: str | None, columns=EXPORT_COLUMNS):
+    """내보내기 공통 필터(회사, 연도, 카테고리)를 적용한 SELECT."""
+    return _apply_filters(select(*columns).where(Reminder.company_id == company_id), year, category)
+
+
+def category_summary_query(company_ids: list[UUID], year: int | None, category: str | None, by_company: bool = False):
+    """요약 시트용 카테고리별 (전체, 완료) 건수 집계. by_company면 회사명 열이 앞에 붙습니다."""
+    keys = [Reminder.category]
+    query = select(Reminder.category)
+    if by_company:
+        keys = [Company.name, Company.id, Reminder.category]
+        query = select(Company.name, Reminder.category).join(Company, Company.id == Reminder.company_id)
+    query = query.add_columns(
+        func.count().label("total"),
+        func.count().filter(Reminder.completed == True).label("completed"),
+    ).where(Reminder.company_id.in_(company_ids))
+    return _apply_filters(query, year, category).group_by(*keys).order_by(*keys)
+
+
+async def count_export_rows(db: AsyncSession, company_id: UUID, year: int | None, category: str | None) -> int:
+    subquery = export_query(company_id, year, category).subquery()
+    result = await db.execute(select(func.count()).select_from(subquery))
+    return result.scalar_one()
+
+
+async def run_cpu(fn: Callable, *args):
+    """openpyxl 작업을 이벤트 루프 밖(excel_executor)에서 실행합니다."""
+    try:
+        return await excel_executor.run(fn, *args)
+    except ExecutorBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many Excel operations in progress, please retry",
+            headers={"Retry-After": "5"},
+        )
+
+
+class _ReminderSheetWriter:
+    """일정 목록 시트에 행을 추가합니다. 스레드 풀에서 호출됩니다."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.today = date.today()
+        self.count = 0
+
+    def append_rows(self, rows) -> None:
+        for reminder in rows:
+            self.count += 1
+            if reminder.completed:
+                state = "_completed"
+            elif reminder.deadline < self.today:
+                state = "_overdue"
+            else:
+                state = ""
+            self.ws.append(_styled_row(self.ws, [
+                self.count,
+                reminder.title,
+                reminder.category,
+                reminder.deadline.strftime("%Y-%m-%d"),
+                reminder.original_deadline.strftime("%Y-%m-%d") if reminder.original_deadline else "",
+                "완료" if reminder.completed else "미완료",
+                _priority_label(reminder.priority),
+                reminder.description or "",
+            ], state))
+
+
+async def build_export_workbook(
+    db: AsyncSession,
+    company_id: UUID,
+    year: int | None = None,
+    category: str | None = None,
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
+) -> Workbook:
+    """DB 결과를 청크 단위로 읽어 write-only 워크북에 기록합니다(행은 임시 파일로 내려감).
+
+    행 추가는 청크마다 excel_executor에서 실행됩니다.
+    """
+    query = export_query(company_id, year, category).order_by(Reminder.deadline, Reminder.id)
+    # 커서를 열기 전에 요약을 SQL로 집계합니다
+    summary = (await db.execute(category_summary_query([company_id], year, category))).all()
+
+    wb = Workbook(write_only=True)
+    _register_styles(wb)
+    ws = wb.create_sheet("일정 목록")
+    ws.append(_header_row(ws, EXPORT_HEADERS, EXPORT_COLUMN_WIDTHS))
+    writer = _ReminderSheetWriter(ws)
+
+    result = await db.stream(query.execution_options(yield_per=_EXPORT_BATCH_SIZE))
+    async for partition in result.partitions():
+        await run_cpu(writer.append_rows, partition)
+        if on_progress is not None:
+            await on_progress(writer.count)
 
     # 요약 시트
-    _add_summary_sheet(wb, reminders)
+    await run_cpu(_add_summary_sheet, wb, summary)
+    return wb
 
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    return output
 
+async def open_cached_export(
+    db: AsyncSession,
+    company_id: UUID,
+    user_id: UUID,
+    year: int | None = None,
+    category: str | None = None,
+) -> tuple[BinaryIO, int, str] | AsyncIterator[bytes]:
+    """Excel 내보내기 파일을 캐시에서 열어 (파일, 크기, ETag)를 반환합니다.
+
+    회사 데이터가 바뀌어 캐시에 없으면 워크북을 만들어, 저장되는 xlsx 바이트를 캐시에 쓰면서
+    그대로 내보내는 비동기 이터레이터를 반환합니다.
+    """
+    await require_member(db, user_id, company_id, detail="Access denied")
+    # 데이터 버전과 리마인더를 같은 세션(트랜잭션)에서 읽어 캐시 키와 내용이 어긋나지 않게 합니다
+    version = await get_data_version(db, company_id)
+    cached = await export_cache.open(company_id, year, category, version)
+    if cached is not None:
+        return cached
+
+    wb = await build_export_workbook(db, company_id, year, category)
+    stream = stream_writer_output(wb.save, excel_executor)
+    return export_cache.tee(company_id, year, category, version, stream)
+
+
+# 포트폴리오 내보내기에 넣을 수 있는 최대 회사(시트) 수
+PORTFOLIO_MAX_COMPANIES = 200
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def _sheet_title(name: str, used: set[str]) -> str:
+    """Excel 시트 이름 규칙(31자 이하, 금지 문자 없음, 대소문자 무시 중복 불가)에 맞춥니다."""
+    base = _INVALID_SHEET_CHARS.sub("_", name).strip("' ")[:31] or "회사"
+    title, n = base, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+
+async def _portfolio_companies(db: AsyncSession, user_id: UUID, company_ids: list[UUID] | None) -> list:
+    """내보낼 (id, 이름) 목록. company_ids가 없으면 사용자가 속한 모든 회사입니다."""
+    query = select(Company.id, Company.name)
+    if company_ids:
+        for company_id in set(company_ids):
+            await require_member(db, user_id, company_id, detail="Access denied")
+        query = query.where(Company.id.in_(company_ids))
+    else:
+        query = query.join(CompanyMember, CompanyMember.company_id == Company.id).where(
+            CompanyMember.user_id == user_id
+        )
+    companies = (await db.execute(query.order_by(Company.name, Company.id))).all()
 
-def _priority_label(priority: int) -> str:
-    labels = {0: "보통", 1: "낮음", 2: "높음", 3: "긴급"}
-    return labels.get(priority, "보통")
+    if not companies:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No companies to export")
+    if len(companies) > PORTFOLIO_MAX_COMPANIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many companies (max {PORTFOLIO_MAX_COMPANIES})",
+        )
+    return companies
 
 
-def _add_summary_sheet(wb: Workbook, reminders: list) -> None:
-    """요약 시트를 추가합니다."""
-    ws = wb.create_sheet("요약")
+async def _append_after(previous: asyncio.Future | None, writer: _ReminderSheetWriter, rows: list) -> None:
+    # openpyxl 워크북은 스레드 안전하지 않으므로 앞선 청크가 끝난 뒤 추가합니다
+    if previous is not None:
+        await previous
+    await run_cpu(writer.append_rows, rows)
 
-    ws.cell(row=1, column=1, value="카테고리별 요약").font = Font(size=14, bold=True)
 
-    categories = {}
-    for r in reminders:
-        cat = r.category
-        if cat not in categories:
-            categories[cat] = {"total": 0, "completed": 0}
-        categories[cat]["total"] += 1
-        if r.completed:
-            categories[cat]["completed"] += 1
+async def build_portfolio_workbook(
+    db: AsyncSession,
+    companies: list,
+    year: int | None = None,
+    category: str | None = None,
+) -> Workbook:
+    """회사별 시트와 통합 요약 시트로 구성된 워크북을 만듭니다.
+
+    모든 회사의 리마인더를 (회사, 마감일) 순서의 커서 하나로 읽고, 청크를 회사별로 나눠
+    excel_executor에서 기록합니다. 기록은 한 번에 하나씩 순서대로 하되 다음 청크 읽기와 겹쳐 실행됩니다.
+    """
+    company_ids = [company.id for company in companies]
+    summary = (await db.execute(category_summary_query(company_ids, year, category, by_company=True))).all()
+
+    wb = Workbook(write_only=True)
+    _register_styles(wb)
+    await run_cpu(_add_summary_sheet, wb, summary, True)
+
+    used = {"요약"}
+    writers = {}
+    for company in companies:
+        ws = wb.create_sheet(_sheet_title(company.name, used))
+        ws.append(_header_row(ws, EXPORT_HEADERS, EXPORT_COLUMN_WIDTHS))
+        writers[company.id] = _ReminderSheetWriter(ws)
+
+    query = _apply_filters(
+        select(Reminder.company_id, *EXPORT_COLUMNS).where(Reminder.company_id.in_(company_ids)),
+        year, category,
+    ).order_by(Reminder.company_id, Reminder.deadline, Reminder.id)
+
+    tail: asyncio.Future | None = None
+    in_flight: set[asyncio.Future] = set()
+    try:
+        result = await db.stream(query.execution_options(yield_per=_EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            for company_id, rows in groupby(partition, key=attrgetter("company_id")):
+                tail = asyncio.ensure_future(_append_after(tail, writers[company_id], list(rows)))
+                in_flight.add(tail)
+                tail.add_done_callback(in_flight.discard)
+                # 워커 수만큼만 앞서 나가 메모리에 쌓이는 청크를 제한합니다
+                if len(in_flight) >= settings.EXCEL_WORKERS:
+                    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        if tail is not None:
+            await tail
+    except BaseException:
+        for task in in_flight:
+            task.cancel()
+        raise
+    return wb
+
+
+async def export_portfolio_to_excel(
+    db: AsyncSession,
+    user_id: UUID,
+    company_ids: list[UUID] | None = None,
+    year: int | None = None,
+    category: str | None = None,
+) -> AsyncIterator[bytes]:
+    """여러 회사의 리마인더를 한 워크북(회사별 시트 + 요약)으로 내보냅니다."""
+    companies = await _portfolio_companies(db, user_id, company_ids)
+    wb = await build_portfolio_workbook(db, companies, year, category)
+    return stream_writer_output(wb.save, excel_executor)
 
-    headers = ["카테고리", "전체", "완료", "미완료", "완료율"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=3, column=col, value=header)
-        cell.fill = HEADER_FILL
-        cell.font = HEADER_FONT
-        cell.border = THIN_BORDER
-        cell.alignment = Alignment(horizontal="center")
 
-    for row, (cat, data) in enumerate(sorted(categories.items()), 4):
-        incomplete = data["total"] - data["completed"]
-        rate = f'{data["completed"] / data["total"] * 100:.1f}%' if data["total"] > 0 else "0%"
+def _priority_label(priority: int) -> str:
+    labels = {0: "보통", 1: "낮음", 2: "높음", 3: "긴급"}
+    return labels.get(priority, "보통")
 
-        for col, value in enumerate([cat, data["total"], data["completed"], incomplete, rate], 1):
-            cell = ws.cell(row=row, column=col, value=value)
-            cell.font = DATA_FONT
-            cell.border = THIN_BORDER
-            cell.alignment = Alignment(horizontal="center")
 
-    for col, width in enumerate([20, 10, 10, 10, 12], 1):
-        ws.column_dimensions[chr(64 + col)].width = width
+def _add_summary_sheet(wb: Workbook, rows, by_company: bool = False, index: int | None = None) -> None:
+    """요약 시트를 추가합니다.
+
+    rows는 category_summary_query 결과인 (카테고리, 전체, 완료) 행이며 by_company면 회사명이 앞에 붙습니다.
+    """
+    ws = wb.create_sheet("요약", index)
+
+    title = WriteOnlyCell(ws, value="회사별 카테고리 요약" if by_company else "카테고리별 요약")
+    title.style = "title"
+    ws.append([title])
+    ws.append([])
+
+    headers, widths = ["카테고리", "전체", "완료", "미완료", "완료율"], [20, 10, 10, 10, 12]
+    if by_company:
+        headers, widths = ["회사", *headers], [30, *widths]
+    ws.append(_header_row(ws, headers, widths))
+
+    for *labels, total, completed in rows:
+        rate = f"{completed / total * 100:.1f}%" if total > 0 else "0%"
+
+        cells = []
+        for value in [*labels, total, completed, total - completed, rate]:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = "data_center"
+            cells.append(cell)
+        ws.append(cells)
+
+
+def check_field_lengths(title: str, category: str) -> None:
+    """제목/카테고리가 리마인더 열 길이를 넘으면 ValueError. 한 행 때문에 batch INSERT 전체가 실패하지 않게 합니다."""
+    for label, value, column in (("제목", title, Reminder.title), ("카테고리", category, Reminder.category)):
+        if len(value) > column.type.length:
+            raise ValueError(f"{label} 길이가 최대 {column.type.length}자를 넘습니다")
+
+
+def _parse_row(row) -> dict:
+    """가져오기 한 행을 검증하여 리마인더 필드로 바꿉니다. 잘못된 행은 ValueError."""
+    title = str(row[1]) if len(row) > 1 and row[1] else None
+    category = str(row[2]) if len(row) > 2 and row[2] else None
+    deadline_str = str(row[3]) if len(row) > 3 and row[3] else None
+
+    if not title or not category or not deadline_str:
+        raise ValueError("필수 필드 누락 (제목, 카테고리, 마감일)")
+    check_field_lengths(title, category)
+
+    if isinstance(row[3], datetime):
+        deadline = row[3].date()
+    elif isinstance(row[3], date):
+        deadline = row[3]
+    else:
+        deadline = datetime.strptime(deadline_str, "%Y-%m-%d").date()
+
+    description = str(row[7]) if len(row) > 7 and row[7] else None
+    return {"title": title, "category": category, "deadline": deadline, "description": description}
+
+
+class _WorkbookReader:
+    """read-only 워크북을 batch 단위로 읽습니다. 스레드 풀에서 호출됩니다."""
+
+    def __init__(self, source):
+        self._wb = load_workbook(source, read_only=True)
+        ws = self._wb.active
+        # 시트 dimension 기준 예상 행 수 (헤더 제외, 없으면 None)
+        self.total = ws.max_row - 1 if ws.max_row else None
+        self._rows = enumerate(ws.iter_rows(min_row=2, values_only=True), 2)
+
+    def read(self, batch_size: int) -> tuple[list[dict], list[dict], int]:
+        """(유효한 행, 오류, 읽은 행 수)를 반환합니다. 읽은 행 수가 0이면 끝입니다."""
+        parsed, errors, seen = [], [], 0
+        for row_idx, row in self._rows:
+            seen += 1
+            if row and row[0]:
+                try:
+                    parsed.append(_parse_row(row))
+                except Exception as e:
+                    errors.append({"row": row_idx, "error": str(e)})
+            if seen >= batch_size:
+                break
+        return parsed, errors, seen
+
+    def close(self) -> None:
+        self._wb.close()
+
+
+def check_upload_size(file: UploadFile) -> None:
+    """업로드 크기 제한(EXCEL_IMPORT_MAX_BYTES)을 확인합니다.
+
+    업로드 본문은 Starlette가 임시 파일로 스풀하므로 메모리에 올리지 않고 크기만 확인합니다.
+    스풀 자체의 크기는 BodySizeLimitMiddleware가 본문을 읽는 동안 제한합니다.
+    """
+    size = file.size
+    if size is None:
+        position = file.file.tell()
+        file.file.seek(0, os.SEEK_END)
+        size = file.file.tell()
+        file.file.seek(position)
+    if size > settings.EXCEL_IMPORT_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large (max {settings.EXCEL_IMPORT_MAX_BYTES} bytes)",
+        )
 
 
-async def import_reminders_from_excel(
+async def write_import_batch(
     db: AsyncSession,
     company_id: UUID,
     user_id: UUID,
-    file: UploadFile,
-) -> list[dict]:
-    """Excel 파일에서 리마인더를 가져옵니다."""
-    member_result = await db.execute(
-        select(CompanyMember).where(
-            CompanyMember.user_id == user_id,
-            CompanyMember.company_id == company_id,
+    rows: list[dict],
+) -> tuple[list[dict], int, int]:
+    """batch의 지문을 한 번에 조회하여 기존 리마인더와 비교합니다.
+
+    새 행은 다중 행 INSERT, 설명이 바뀐 행은 UPDATE, 같은 행은 건너뜁니다.
+    (추가된 행, 수정 건수, 건너뛴 건수)를 반환합니다.
+    """
+    for fields in rows:
+        fields["fingerprint"] = reminder_fingerprint(fields["title"], fields["category"], fields["deadline"])
+
+    result = await db.execute(
+        select(Reminder.fingerprint, Reminder.id, Reminder.description).where(
+            Reminder.company_id == company_id,
+            Reminder.fingerprint.in_({fields["fingerprint"] for fields in rows}),
         )
     )
-    if not member_result.scalar_one_or_none():
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    existing = {fingerprint: (reminder_id, description) for fingerprint, reminder_id, description in result.all()}
+
+    inserts, changes = [], {}
+    updated = skipped = 0
+    for fields in rows:
+        current = existing.get(fields["fingerprint"])
+        if current is None:
+            values = {
+                "id": uuid4(), "company_id": company_id, "created_by": user_id,
+                "priority": 0, "completed": False, **fields,
+            }
+            inserts.append(values)
+            existing[fields["fingerprint"]] = (values["id"], fields["description"])
+        elif current[1] == fields["description"]:
+            skipped += 1
+        else:
+            updated += 1
+            changes[current[0]] = fields["description"]
+            existing[fields["fingerprint"]] = (current[0], fields["description"])
+
+    if inserts:
+        await db.execute(insert(Reminder.__table__).values(inserts))
+        await index_reminders(db, [v["id"] for v in inserts])
+        track_reminders(Reminder(**v) for v in inserts)
+    if changes:
+        # 설명은 알림 인덱스에 없으므로 인덱스/스케줄러 갱신은 필요 없고 데이터 버전만 올립니다
+        table = Reminder.__table__
+        await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("reminder_id"))
+            .values(description=bindparam("new_description"), updated_at=datetime.utcnow()),
+            [{"reminder_id": k, "new_description": v} for k, v in changes.items()],
+        )
+        await bump_data_version(db, [company_id])
+    return inserts, updated, skipped
 
-    content = await file.read()
-    wb = load_workbook(io.BytesIO(content), read_only=True)
-    ws = wb.active
 
+async def _import_rows(
+    db: AsyncSession,
+    company_id: UUID,
+    user_id: UUID,
+    source,
+    on_progress: Callable[[dict], Awaitable[None]] | None = None,
+) -> dict:
+    """source를 batch 단위로 파싱하여 저장합니다.
+
+    on_progress는 batch마다 지금까지의 처리 건수와 행별 오류를 받습니다.
+    """
+    reader = await run_cpu(_WorkbookReader, source)
+    batch_size = settings.EXCEL_IMPORT_BATCH_SIZE
     imported = []
     errors = []
-    rows = list(ws.iter_rows(min_row=2, values_only=True))
+    processed = updated = skipped = 0
+    try:
+        while True:
+            parsed, batch_errors, seen = await run_cpu(reader.read, batch_size)
+            if not seen:
+                break
+            processed += seen
+            errors.extend(batch_errors)
+            if parsed:
+                inserted, batch_updated, batch_skipped = await write_import_batch(db, company_id, user_id, parsed)
+                updated += batch_updated
+                skipped += batch_skipped
+                imported.extend(
+                    {"title": r["title"], "category": r["category"], "deadline": r["deadline"].isoformat()}
+                    for r in inserted
+                )
+            if on_progress is not None:
+                await on_progress({
+                    "processed": processed,
+                    "total": reader.total,
+                    "imported_count": len(imported),
+                    "updated_count": updated,
+                    "skipped_count": skipped,
+                    "errors": errors,
+                })
+    finally:
+        await run_cpu(reader.close)
+
+    return {
+        "imported": imported,
+        "imported_count": len(imported),
+        "updated_count": updated,
+        "skipped_count": skipped,
+        "errors": errors,
+    }
 
-    for row_idx, row in enumerate(rows, 2):
-        if not row or not row[0]:
-            continue
 
-        try:
-            title = str(row[1]) if len(row) > 1 and row[1] else None
-            category = str(row[2]) if len(row) > 2 and row[2] else None
-            deadline_str = str(row[3]) if len(row) > 3 and row[3] else None
+async def import_reminders_from_excel(
+    db: AsyncSession,
+    company_id: UUID,
+    user_id: UUID,
+    file: UploadFile,
+) -> dict:
+    """Excel 파일에서 리마인더를 가져옵니다.
 
-            if not title or not category or not deadline_str:
-                errors.append({"row": row_idx, "error": "필수 필드 누락 (제목, 카테고리, 마감일)"})
-                continue
+    스풀된 업로드 파일을 batch 단위로 파싱(excel_executor)하고 batch마다 다중 행 INSERT로 저장합니다.
+    제목/카테고리/마감일이 같은 기존 리마인더는 건너뛰거나(설명이 같을 때) 설명만 수정합니다.
+    """
+    await require_member(db, user_id, company_id, detail="Access denied")
+    check_upload_size(file)
 
-            if isinstance(row[3], datetime):
-                deadline = row[3].date()
-            elif isinstance(row[3], date):
-                deadline = row[3]
-            else:
-                deadline = datetime.strptime(deadline_str, "%Y-%m-%d").date()
-
-            description = str(row[7]) if len(row) > 7 and row[7] else None
-
-            reminder = Reminder(
-                company_id=company_id,
-                title=title,
-                category=category,
-                deadline=deadline,
-                description=description,
-                priority=0,
-                created_by=user_id,
-            )
-            db.add(reminder)
-            imported.append({
-                "title": title,
-                "category": category,
-                "deadline": deadline.isoformat(),
-            })
-
-        except Exception as e:
-            errors.append({"row": row_idx, "error": str(e)})
-
-    await db.flush()
-
-    return {"imported": imported, "imported_count": len(imported), "errors": errors}
+    file.file.seek(0)
+    return await _import_rows(db, company_id, user_id, file.file)
+
+
+async def import_reminders_from_path(
+    db: AsyncSession,
+    company_id: UUID,
+    user_id: UUID,
+    path: str,
+    on_progress: Callable[[dict], Awaitable[None]] | None = None,
+) -> dict:
+    """저장된 업로드 파일에서 가져옵니다 (가져오기 작업용, 권한은 제출 시 확인)."""
+    return await _import_rows(db, company_id, user_id, path, on_progress)
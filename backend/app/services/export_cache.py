@@ -0,0 +1,188 @@
+"""Excel 내보내기 결과 디스크 캐시.
+
+같은 데이터의 워크북을 반복해서 만들지 않도록 생성한 파일을 EXPORT_CACHE_DIR에 보관합니다.
+
+- 키는 (회사, 연도, 카테고리, 회사 데이터 버전, 날짜)입니다. 데이터 버전(companies.data_version)은
+  리마인더 쓰기마다 pending_index 훅에서 올라갑니다. 지난 기한 표시가 날짜에 따라 달라지므로
+  날짜도 키에 포함합니다.
+- 같은 회사/연도/카테고리의 이전 버전 파일은 새 파일을 저장할 때 지우고,
+  전체 크기가 EXPORT_CACHE_MAX_BYTES를 넘으면 가장 오래 사용되지 않은 파일부터 지웁니다.
+- 캐시에 없으면 워크북을 클라이언트로 스트리밍하면서 같은 바이트를 임시 파일에 쓰고(tee),
+  끝까지 보낸 뒤 캐시에 설치합니다.
+- 파일은 링크로 설치하여 먼저 만든 쪽이 유지됩니다. 따라서 같은 ETag는 항상 같은 바이트를 가리킵니다.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO
+from uuid import UUID, uuid4
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.company import Company
+from app.utils.metrics import register_collector
+
+_counters = defaultdict(int)
+
+
+async def bump_data_version(db: AsyncSession, company_ids) -> None:
+    """해당 회사(id 목록 또는 SELECT)의 데이터 버전을 올립니다."""
+    await db.execute(
+        update(Company)
+        .where(Company.id.in_(company_ids))
+        # 회사 정보 수정 시각은 그대로 둡니다
+        .values(data_version=Company.data_version + 1, updated_at=Company.updated_at),
+        execution_options={"synchronize_session": False},
+    )
+
+
+async def get_data_version(db: AsyncSession, company_id: UUID) -> int:
+    result = await db.execute(select(Company.data_version).where(Company.id == company_id))
+    return result.scalar_one_or_none() or 0
+
+
+class ExportCache:
+    """크기가 제한된 내보내기 파일 캐시. 파일 시스템 작업은 스레드에서 실행합니다."""
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ".xlsx"):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._building: dict[str, asyncio.Future] = {}
+
+    def _paths(self, company_id: UUID, year: int | None, category: str | None, version: int) -> tuple[str, Path]:
+        """(같은 범위 파일의 접두어, 캐시 파일 경로)."""
+        scope = hashlib.sha1(f"{year or ''}\x1f{category or ''}".encode("utf-8")).hexdigest()[:12]
+        prefix = f"{company_id.hex}_{scope}_"
+        return prefix, self.directory / f"{prefix}{version}_{date.today():%Y%m%d}{self.suffix}"
+
+    @staticmethod
+    def _etag(version: int, stat: os.stat_result) -> str:
+        return f'"{version}-{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    @staticmethod
+    def _open(path: Path) -> tuple[BinaryIO, os.stat_result] | None:
+        try:
+            fileobj = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        stat = os.fstat(fileobj.fileno())
+        try:
+            # 접근 시각만 갱신하여 LRU 순서로 씁니다 (수정 시각은 ETag에 쓰이므로 유지)
+            os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        except OSError:
+            pass
+        return fileobj, stat
+
+    def _install(self, prefix: str, tmp_path: Path, path: Path) -> None:
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(self.suffix) or entry.path == str(path):
+                continue
+            try:
+                if entry.name.startswith(prefix):
+                    # 같은 범위의 이전 버전/날짜 파일 (내려받는 중인 응답은 열린 파일로 계속 읽힘)
+                    os.remove(entry.path)
+                    _counters["superseded"] += 1
+                else:
+                    stat = entry.stat()
+                    entries.append((stat.st_atime_ns, stat.st_size, entry.path))
+            except FileNotFoundError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        if path.exists():
+            total += path.stat().st_size
+        for _, size, victim in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(victim)
+            except FileNotFoundError:
+                pass
+            total -= size
+            _counters["evictions"] += 1
+
+    async def open(
+        self,
+        company_id: UUID,
+        year: int | None,
+        category: str | None,
+        version: int,
+    ) -> tuple[BinaryIO, int, str] | None:
+        """캐시 파일을 열어 (파일, 크기, ETag)를 반환합니다. 없으면 None입니다.
+
+        이 워커에서 같은 키를 만드는 중이면 끝날 때까지 기다렸다가 엽니다.
+        """
+        _, path = self._paths(company_id, year, category, version)
+        building = self._building.get(str(path))
+        if building is not None:
+            await asyncio.shield(building)
+        opened = await asyncio.to_thread(self._open, path)
+        if opened is None:
+            _counters["misses"] += 1
+            return None
+        _counters["hits"] += 1
+        fileobj, stat = opened
+        return fileobj, stat.st_size, self._etag(version, stat)
+
+    async def tee(
+        self,
+        company_id: UUID,
+        year: int | None,
+        category: str | None,
+        version: int,
+        stream: AsyncIterator[bytes],
+    ) -> AsyncIterator[bytes]:
+        """stream을 그대로 내보내면서 임시 파일에도 씁니다. 끝까지 내보내면 캐시에 설치합니다.
+
+        첫 바이트를 기다리지 않고 보낼 수 있도록 만들기와 전송을 함께 진행합니다.
+        중간에 연결이 끊기면 임시 파일을 버립니다.
+        """
+        prefix, path = self._paths(company_id, year, category, version)
+        key = str(path)
+        future = None
+        if key not in self._building:
+            future = asyncio.get_running_loop().create_future()
+            self._building[key] = future
+        tmp_path = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+        complete = False
+        try:
+            await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+            fileobj = await asyncio.to_thread(open, tmp_path, "wb")
+            try:
+                async for chunk in stream:
+                    await asyncio.to_thread(fileobj.write, chunk)
+                    yield chunk
+            finally:
+                await asyncio.to_thread(fileobj.close)
+            complete = True
+            await asyncio.to_thread(self._install, prefix, tmp_path, path)
+            _counters["builds"] += 1
+        finally:
+            if not complete:
+                _counters["aborted"] += 1
+            await stream.aclose()
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            if future is not None:
+                self._building.pop(key, None)
+                future.set_result(None)
+
+    def stats(self) -> dict:
+        return {"max_bytes": self.max_bytes, **_counters}
+
+
+# 전역 내보내기 캐시 인스턴스
+export_cache = ExportCache(settings.EXPORT_CACHE_DIR, settings.EXPORT_CACHE_MAX_BYTES)
+register_collector("export_cache", export_cache.stats)
@@ -0,0 +1,272 @@
+"""알림 발송 파이프라인.
+
+스케줄러가 넘긴 마감 알림을 큐에 모았다가, 짧은 수집 구간마다
+수신자별 다이제스트로 묶어 배치 단위로 전송합니다.
+
+- 수신자: 알림 대상 회사의 활성 멤버
+- 중복 방지: notification_deliveries 원장에 먼저 기록(claim)한 건만 전송
+- 전송 실패: 다이제스트 단위로 실패한 것만 지수 백오프로 재시도하고, 끝내 실패하면
+  그 다이제스트의 원장 기록만 되돌린 뒤 잠시 후 큐에 다시 넣음 (NOTIFICATION_MAX_REQUEUES회까지)
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from sqlalchemy import select, delete, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.company import CompanyMember
+from app.models.notification import NotificationDelivery
+from app.models.user import User
+from app.services.notification_transports import Alert, Digest, Transport, create_transport
+from app.utils.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """큐 기반 배치 알림 디스패처."""
+
+    def __init__(
+        self,
+        transport: Transport | None = None,
+        batch_size: int = settings.NOTIFICATION_BATCH_SIZE,
+        concurrency: int = settings.NOTIFICATION_CONCURRENCY,
+        max_retries: int = settings.NOTIFICATION_MAX_RETRIES,
+        window_seconds: float = settings.NOTIFICATION_DIGEST_WINDOW_SECONDS,
+        queue_size: int = settings.NOTIFICATION_QUEUE_SIZE,
+        retry_base_seconds: float = 1.0,
+        max_requeues: int = settings.NOTIFICATION_MAX_REQUEUES,
+        requeue_delay_seconds: float = settings.NOTIFICATION_REQUEUE_DELAY_SECONDS,
+    ):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.window_seconds = window_seconds
+        self.queue_size = queue_size
+        self.retry_base_seconds = retry_base_seconds
+        self.max_requeues = max_requeues
+        self.requeue_delay_seconds = requeue_delay_seconds
+        # (user_id, reminder_id, alert) -> 다시 넣은 횟수
+        self._requeues: dict[tuple, int] = {}
+        self._queue: asyncio.Queue[Alert] | None = None
+        self._session_factory = None
+        self._task: asyncio.Task | None = None
+        self._counters = defaultdict(int)
+
+    # --- 큐 -------------------------------------------------------------------
+
+    def enqueue(self, alerts: list[Alert]) -> None:
+        if self._queue is None:
+            return
+        for alert in alerts:
+            try:
+                self._queue.put_nowait(alert)
+                self._counters["enqueued"] += 1
+            except asyncio.QueueFull:
+                self._counters["dropped"] += 1
+
+    async def _collect(self) -> list[Alert]:
+        """첫 알림이 들어온 뒤 수집 구간 동안 모인 알림을 한 번에 꺼냅니다."""
+        alerts = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window_seconds
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                alerts.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return alerts
+
+    # --- 처리 -----------------------------------------------------------------
+
+    async def process(self, alerts: list[Alert]) -> None:
+        async with self._session_factory() as session:
+            digests = await self._build_digests(session, alerts)
+            digests = await self._claim(session, digests)
+            await session.commit()
+
+        if not digests:
+            return
+
+        failed = await self._deliver(digests)
+        if failed:
+            async with self._session_factory() as session:
+                await self._release(session, failed)
+                await session.commit()
+        self._requeue(digests, failed)
+
+    @staticmethod
+    def _keys(digest: Digest) -> list[tuple]:
+        return [(digest.user_id, a.reminder_id, a.d_day_label) for a in digest.alerts]
+
+    def _requeue(self, digests: list[Digest], failed: list[Digest]) -> None:
+        """원장에서 되돌린 알림을 잠시 후 큐에 다시 넣습니다. 다른 수신자에게 이미 보낸 건은 원장이 걸러냅니다."""
+        failed_ids = {id(d) for d in failed}
+        for digest in digests:
+            if id(digest) not in failed_ids:
+                for key in self._keys(digest):
+                    self._requeues.pop(key, None)
+
+        alerts = {}
+        for digest in failed:
+            for key, alert in zip(self._keys(digest), digest.alerts):
+                count = self._requeues.get(key, 0) + 1
+                if count > self.max_requeues:
+                    self._requeues.pop(key, None)
+                    self._counters["abandoned"] += 1
+                    logger.error("giving up notification %s for user %s", alert.d_day_label, digest.user_id)
+                    continue
+                self._requeues[key] = count
+                alerts[(alert.reminder_id, alert.d_day_label)] = alert
+        if alerts and self._queue is not None:
+            self._counters["requeued"] += len(alerts)
+            asyncio.get_running_loop().call_later(self.requeue_delay_seconds, self.enqueue, list(alerts.values()))
+
+    async def _build_digests(self, session: AsyncSession, alerts: list[Alert]) -> list[Digest]:
+        """알림을 회사 멤버별로 묶습니다."""
+        company_ids = {a.company_id for a in alerts}
+        result = await session.execute(
+            select(CompanyMember.company_id, User.id, User.email, User.name)
+            .join(User, User.id == CompanyMember.user_id)
+            .where(CompanyMember.company_id.in_(company_ids), User.is_active == True)
+        )
+        members = defaultdict(list)
+        for company_id, user_id, email, name in result.all():
+            members[company_id].append((user_id, email, name))
+
+        digests: dict = {}
+        seen = set()
+        for alert in alerts:
+            for user_id, email, name in members.get(alert.company_id, []):
+                key = (user_id, alert.reminder_id, alert.d_day_label)
+                if key in seen:
+                    continue
+                seen.add(key)
+                digest = digests.get(user_id)
+                if digest is None:
+                    digest = digests[user_id] = Digest(user_id, email, name)
+                digest.alerts.append(alert)
+        return list(digests.values())
+
+    async def _claim(self, session: AsyncSession, digests: list[Digest]) -> list[Digest]:
+        """원장에 기록을 시도하고, 새로 기록된(아직 보내지 않은) 알림만 남깁니다."""
+        rows = [
+            {
+                "user_id": d.user_id,
+                "reminder_id": a.reminder_id,
+                "alert": a.d_day_label,
+                "channel": self.transport.channel,
+            }
+            for d in digests for a in d.alerts
+        ]
+        if not rows:
+            return []
+
+        dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+        claimed = set()
+        for i in range(0, len(rows), 1000):
+            stmt = (
+                dialect.insert(NotificationDelivery)
+                .values(rows[i:i + 1000])
+                .on_conflict_do_nothing()
+                .returning(
+                    NotificationDelivery.user_id,
+                    NotificationDelivery.reminder_id,
+                    NotificationDelivery.alert,
+                )
+            )
+            result = await session.execute(stmt)
+            claimed.update(tuple(r) for r in result.all())
+
+        self._counters["deduplicated"] += len(rows) - len(claimed)
+        remaining = []
+        for d in digests:
+            d.alerts = [a for a in d.alerts if (d.user_id, a.reminder_id, a.d_day_label) in claimed]
+            if d.alerts:
+                remaining.append(d)
+        return remaining
+
+    async def _release(self, session: AsyncSession, digests: list[Digest]) -> None:
+        keys = [(d.user_id, a.reminder_id, a.d_day_label) for d in digests for a in d.alerts]
+        await session.execute(
+            delete(NotificationDelivery).where(
+                NotificationDelivery.channel == self.transport.channel,
+                tuple_(
+                    NotificationDelivery.user_id,
+                    NotificationDelivery.reminder_id,
+                    NotificationDelivery.alert,
+                ).in_(keys),
+            )
+        )
+
+    async def _deliver(self, digests: list[Digest]) -> list[Digest]:
+        """배치 단위로 동시 전송하고, 끝내 실패한 다이제스트를 반환합니다."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batches = [digests[i:i + self.batch_size] for i in range(0, len(digests), self.batch_size)]
+
+        async def send(batch: list[Digest]) -> list[Digest]:
+            # 이미 전달된 다이제스트는 다시 보내지 않도록 실패한 것만 재시도합니다
+            pending = batch
+            async with semaphore:
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        failed = await self.transport.send_batch(pending)
+                    except Exception:
+                        logger.warning("notification batch failed (attempt %d)", attempt + 1, exc_info=True)
+                        failed = pending
+                    self._counters["sent"] += len(pending) - len(failed)
+                    if not failed:
+                        return []
+                    pending = failed
+                    self._counters["retries"] += 1
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(self.retry_base_seconds * 2 ** attempt)
+                self._counters["failed"] += len(pending)
+                return pending
+
+        results = await asyncio.gather(*(send(b) for b in batches))
+        return [d for failed in results for d in failed]
+
+    # --- 수명 주기 ------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            alerts = await self._collect()
+            try:
+                await self.process(alerts)
+            except Exception:
+                logger.exception("notification dispatch failed")
+
+    async def start(self, session_factory) -> None:
+        if self.transport is None:
+            self.transport = create_transport()
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "channel": self.transport.channel if self.transport else None,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            **self._counters,
+        }
+
+
+# 전역 디스패처 인스턴스
+dispatcher = NotificationDispatcher()
+register_collector("notification_dispatcher", dispatcher.stats)
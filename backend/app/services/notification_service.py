@@ -3,170 +3,321 @@
 D-Day 기반 알림 생성, 이메일 알림 큐, 푸시 알림 등을 처리합니다.
 실제 이메일/푸시 전송은 외부 서비스(SendGrid, FCM 등)와 연동합니다.
 """
+import base64
+import json
 from datetime import date, datetime, timedelta
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
-from app.models.reminder import Reminder
-from app.models.company import CompanyMember
-from app.models.user import User
+from sqlalchemy import select, and_, or_, case, func
+from fastapi import HTTPException, status
+from app.models.reminder import UserPendingReminder
+
+# 모든 알림 조회는 사용자별 미완료 인덱스(user_pending_reminders)만 읽습니다
+_index = UserPendingReminder.__table__.c
+_COLUMNS = {
+    "id": _index.reminder_id.label("id"),
+    "title": _index.title,
+    "category": _index.category,
+    "deadline": _index.deadline,
+    "priority": _index.priority,
+    "company_id": _index.company_id,
+}
+_NOTIFICATION_FIELDS = tuple(_COLUMNS)
+_NOTIFICATION_COLUMNS = tuple(_COLUMNS.values())
+
+# 피드별 정렬 키 (컬럼명, 내림차순 여부). 커서는 마지막 행의 정렬 키 값입니다.
+_ORDER_BY_DEADLINE = (("deadline", False), ("id", False))
+_ORDER_BY_PRIORITY = (("priority", True), ("id", False))
+_CURSOR_PARSERS = {"deadline": date.fromisoformat, "priority": int, "id": UUID}
+
+DEFAULT_FEED_LIMIT = 50
+DEFAULT_SUMMARY_TOP = 5
+
+
+def _pending_for_user(user_id: UUID):
+    return _index.user_id == user_id
+
+
+def _order_by(columns, order) -> list:
+    return [columns[name].desc() if desc else columns[name].asc() for name, desc in order]
+
+
+def _encode_cursor(row, order) -> str:
+    values = []
+    for name, _ in order:
+        value = getattr(row, name)
+        if isinstance(value, date):
+            value = value.isoformat()
+        elif isinstance(value, UUID):
+            value = str(value)
+        values.append(value)
+    raw = json.dumps(values)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, order) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if len(values) != len(order):
+            raise ValueError("cursor length mismatch")
+        return [_CURSOR_PARSERS[name](value) for (name, _), value in zip(order, values)]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _after_cursor(columns, order, values):
+    """정렬 키 기준으로 커서 이후의 행만 남기는 keyset 조건."""
+    clauses = []
+    for i, (name, desc) in enumerate(order):
+        column = columns[name]
+        preceding = [columns[n] == values[j] for j, (n, _) in enumerate(order[:i])]
+        clauses.append(and_(*preceding, column < values[i] if desc else column > values[i]))
+    return or_(*clauses)
+
+
+async def _fetch_feed(
+    db: AsyncSession,
+    user_id: UUID,
+    conditions: list,
+    order,
+    limit: int,
+    cursor: str | None,
+    per_company_limit: int | None,
+    per_category_limit: int | None,
+) -> tuple[list, str | None]:
+    """피드 한 페이지와 다음 커서를 반환합니다."""
+    columns = _COLUMNS
+    query = select(*_NOTIFICATION_COLUMNS).where(_pending_for_user(user_id), *conditions)
+
+    if per_company_limit or per_category_limit:
+        # 회사/카테고리별 상한은 커서와 무관하게 전체 결과 기준으로 순위를 매깁니다
+        ranking = _order_by(columns, order)
+        if per_company_limit:
+            query = query.add_columns(
+                func.row_number().over(partition_by=columns["company_id"], order_by=ranking).label("company_rank")
+            )
+        if per_category_limit:
+            query = query.add_columns(
+                func.row_number().over(partition_by=columns["category"], order_by=ranking).label("category_rank")
+            )
+        ranked = query.subquery()
+        query = select(*(ranked.c[name] for name in _NOTIFICATION_FIELDS))
+        if per_company_limit:
+            query = query.where(ranked.c.company_rank <= per_company_limit)
+        if per_category_limit:
+            query = query.where(ranked.c.category_rank <= per_category_limit)
+        columns = ranked.c
+
+    if cursor:
+        query = query.where(_after_cursor(columns, order, _decode_cursor(cursor, order)))
+
+    result = await db.execute(query.order_by(*_order_by(columns, order)).limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = _encode_cursor(rows[limit - 1], order) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+async def _count_feed(db: AsyncSession, user_id: UUID, conditions: list) -> dict:
+    result = await db.execute(
+        select(func.count()).select_from(UserPendingReminder).where(_pending_for_user(user_id), *conditions)
+    )
+    return {"count": result.scalar_one()}
+
+
+def _upcoming_item(row, today: date) -> dict:
+    days_left = (row.deadline - today).days
+    return {
+        "reminder_id": str(row.id),
+        "title": row.title,
+        "category": row.category,
+        "deadline": row.deadline.isoformat(),
+        "days_left": days_left,
+        "d_day_label": _d_day_label(days_left),
+        "priority": row.priority,
+        "company_id": str(row.company_id),
+    }
+
+
+def _overdue_item(row, today: date) -> dict:
+    days_overdue = (today - row.deadline).days
+    return {
+        "reminder_id": str(row.id),
+        "title": row.title,
+        "category": row.category,
+        "deadline": row.deadline.isoformat(),
+        "days_overdue": days_overdue,
+        "d_day_label": f"D+{days_overdue}",
+        "priority": row.priority,
+        "company_id": str(row.company_id),
+    }
+
+
+def _today_item(row) -> dict:
+    return {
+        "reminder_id": str(row.id),
+        "title": row.title,
+        "category": row.category,
+        "deadline": row.deadline.isoformat(),
+        "d_day_label": "D-Day",
+        "priority": row.priority,
+        "company_id": str(row.company_id),
+    }
 
 
 async def get_upcoming_deadlines(
     db: AsyncSession,
     user_id: UUID,
     days_ahead: int = 7,
-) -> list[dict]:
+    limit: int = DEFAULT_FEED_LIMIT,
+    cursor: str | None = None,
+    per_company_limit: int | None = None,
+    per_category_limit: int | None = None,
+    count_only: bool = False,
+) -> dict:
     """향후 N일 이내 마감되는 미완료 리마인더를 조회합니다."""
     today = date.today()
     end_date = today + timedelta(days=days_ahead)
+    conditions = [_index.deadline >= today, _index.deadline <= end_date]
 
-    # 사용자가 속한 모든 회사 ID 조회
-    member_result = await db.execute(
-        select(CompanyMember.company_id).where(CompanyMember.user_id == user_id)
-    )
-    company_ids = [row[0] for row in member_result.all()]
+    if count_only:
+        return await _count_feed(db, user_id, conditions)
 
-    if not company_ids:
-        return []
-
-    result = await db.execute(
-        select(Reminder).where(
-            and_(
-                Reminder.company_id.in_(company_ids),
-                Reminder.completed == False,
-                Reminder.deadline >= today,
-                Reminder.deadline <= end_date,
-            )
-        ).order_by(Reminder.deadline)
+    rows, next_cursor = await _fetch_feed(
+        db, user_id, conditions, _ORDER_BY_DEADLINE,
+        limit, cursor, per_company_limit, per_category_limit,
     )
-    reminders = result.scalars().all()
-
-    notifications = []
-    for r in reminders:
-        days_left = (r.deadline - today).days
-        notifications.append({
-            "reminder_id": str(r.id),
-            "title": r.title,
-            "category": r.category,
-            "deadline": r.deadline.isoformat(),
-            "days_left": days_left,
-            "d_day_label": _d_day_label(days_left),
-            "priority": r.priority,
-            "company_id": str(r.company_id),
-        })
-
-    return notifications
+    return {"items": [_upcoming_item(row, today) for row in rows], "next_cursor": next_cursor}
 
 
 async def get_overdue_reminders(
     db: AsyncSession,
     user_id: UUID,
-) -> list[dict]:
+    limit: int = DEFAULT_FEED_LIMIT,
+    cursor: str | None = None,
+    per_company_limit: int | None = None,
+    per_category_limit: int | None = None,
+    count_only: bool = False,
+) -> dict:
     """마감일이 지난 미완료 리마인더를 조회합니다."""
     today = date.today()
+    conditions = [_index.deadline < today]
 
-    member_result = await db.execute(
-        select(CompanyMember.company_id).where(CompanyMember.user_id == user_id)
-    )
-    company_ids = [row[0] for row in member_result.all()]
+    if count_only:
+        return await _count_feed(db, user_id, conditions)
 
-    if not company_ids:
-        return []
-
-    result = await db.execute(
-        select(Reminder).where(
-            and_(
-                Reminder.company_id.in_(company_ids),
-                Reminder.completed == False,
-                Reminder.deadline < today,
-            )
-        ).order_by(Reminder.deadline)
+    rows, next_cursor = await _fetch_feed(
+        db, user_id, conditions, _ORDER_BY_DEADLINE,
+        limit, cursor, per_company_limit, per_category_limit,
     )
-    reminders = result.scalars().all()
-
-    return [
-        {
-            "reminder_id": str(r.id),
-            "title": r.title,
-            "category": r.category,
-            "deadline": r.deadline.isoformat(),
-            "days_overdue": (today - r.deadline).days,
-            "d_day_label": f"D+{(today - r.deadline).days}",
-            "priority": r.priority,
-            "company_id": str(r.company_id),
-        }
-        for r in reminders
-    ]
+    return {"items": [_overdue_item(row, today) for row in rows], "next_cursor": next_cursor}
 
 
 async def get_today_reminders(
     db: AsyncSession,
     user_id: UUID,
-) -> list[dict]:
+    limit: int = DEFAULT_FEED_LIMIT,
+    cursor: str | None = None,
+    per_company_limit: int | None = None,
+    per_category_limit: int | None = None,
+    count_only: bool = False,
+) -> dict:
     """오늘 마감인 미완료 리마인더를 조회합니다."""
     today = date.today()
+    conditions = [_index.deadline == today]
 
-    member_result = await db.execute(
-        select(CompanyMember.company_id).where(CompanyMember.user_id == user_id)
+    if count_only:
+        return await _count_feed(db, user_id, conditions)
+
+    rows, next_cursor = await _fetch_feed(
+        db, user_id, conditions, _ORDER_BY_PRIORITY,
+        limit, cursor, per_company_limit, per_category_limit,
     )
-    company_ids = [row[0] for row in member_result.all()]
+    return {"items": [_today_item(row) for row in rows], "next_cursor": next_cursor}
 
-    if not company_ids:
-        return []
 
-    result = await db.execute(
-        select(Reminder).where(
-            and_(
-                Reminder.company_id.in_(company_ids),
-                Reminder.completed == False,
-                Reminder.deadline == today,
-            )
-        ).order_by(Reminder.priority.desc())
+def _summary_query(today: date, top: int, user_ids=None):
+    """오늘/지연/7일 이내 구간별 건수와 상위 top개 행을 한 번에 조회하는 쿼리.
+
+    user_ids를 주면 여러 사용자를 한 번에 집계합니다 (사용자별로 순위를 매김).
+    """
+    end_date = today + timedelta(days=7)
+    bucket = case(
+        (_index.deadline < today, "overdue"),
+        (_index.deadline == today, "today"),
+        else_="upcoming",
     )
-    reminders = result.scalars().all()
-
-    return [
-        {
-            "reminder_id": str(r.id),
-            "title": r.title,
-            "category": r.category,
-            "deadline": r.deadline.isoformat(),
-            "d_day_label": "D-Day",
-            "priority": r.priority,
-            "company_id": str(r.company_id),
-        }
-        for r in reminders
-    ]
+    partition = (_index.user_id, bucket)
+    ranked = select(
+        _index.user_id,
+        *_NOTIFICATION_COLUMNS,
+        bucket.label("bucket"),
+        func.row_number().over(
+            partition_by=partition,
+            order_by=(_index.deadline, _index.priority.desc(), _index.reminder_id),
+        ).label("bucket_rank"),
+        func.count().over(partition_by=partition).label("bucket_count"),
+    ).where(
+        _index.user_id.in_(user_ids),
+        _index.deadline <= end_date,
+    ).subquery()
 
+    return (
+        select(ranked)
+        .where(ranked.c.bucket_rank <= max(top, 1))
+        .order_by(ranked.c.user_id, ranked.c.deadline, ranked.c.priority.desc(), ranked.c.id)
+    )
 
-async def get_notification_summary(
-    db: AsyncSession,
-    user_id: UUID,
-) -> dict:
-    """알림 요약 정보를 반환합니다."""
-    today_items = await get_today_reminders(db, user_id)
-    overdue_items = await get_overdue_reminders(db, user_id)
-    upcoming_items = await get_upcoming_deadlines(db, user_id, days_ahead=7)
+
+def _build_summary(rows, today: date, top: int, generated_at: datetime) -> dict:
+    """_summary_query 결과(한 사용자분)로 요약 응답을 만듭니다."""
+    counts = {"today": 0, "overdue": 0, "upcoming": 0}
+    today_items, overdue_items, upcoming_items = [], [], []
+    for row in rows:
+        counts[row.bucket] = row.bucket_count
+        if row.bucket == "overdue":
+            overdue_items.append(_overdue_item(row, today))
+            continue
+        if row.bucket == "today":
+            today_items.append(_today_item(row))
+        # 7일 이내 목록은 오늘 마감분을 포함합니다
+        upcoming_items.append(_upcoming_item(row, today))
+
+    upcoming_count = counts["today"] + counts["upcoming"]
 
     return {
         "today": {
-            "count": len(today_items),
-            "items": today_items,
+            "count": counts["today"],
+            "items": today_items[:top],
         },
         "overdue": {
-            "count": len(overdue_items),
-            "items": overdue_items,
+            "count": counts["overdue"],
+            "items": overdue_items[:top],
         },
         "upcoming_7days": {
-            "count": len(upcoming_items),
-            "items": upcoming_items,
+            "count": upcoming_count,
+            "items": upcoming_items[:top],
         },
-        "total_pending": len(today_items) + len(overdue_items) + len(upcoming_items),
-        "generated_at": datetime.utcnow().isoformat(),
+        "total_pending": counts["today"] + counts["overdue"] + upcoming_count,
+        "generated_at": generated_at.isoformat(),
     }
 
 
+async def get_notification_summary(
+    db: AsyncSession,
+    user_id: UUID,
+    top: int = DEFAULT_SUMMARY_TOP,
+) -> dict:
+    """알림 요약 정보를 반환합니다.
+
+    미완료 리마인더를 한 번의 쿼리로 조회하고 CASE 식으로 오늘/지연/예정 구간을 나눕니다.
+    구간별 전체 건수와 상위 top개 항목만 반환합니다.
+    """
+    today = date.today()
+    result = await db.execute(_summary_query(today, top, [user_id]))
+    return _build_summary(result.all(), today, top, datetime.utcnow())
+
+
 def _d_day_label(days_left: int) -> str:
     if days_left == 0:
         return "D-Day"
@@ -0,0 +1,138 @@
+"""알림 전송 채널.
+
+Transport는 다이제스트 묶음을 받아 외부로 전달하고, 전달하지 못한 다이제스트를 반환합니다.
+묶음 전체가 실패하면 예외를 발생시킵니다. 디스패처는 실패한 다이제스트만 재시도합니다.
+개발/테스트에서는 FileTransport를 사용합니다.
+"""
+import asyncio
+import json
+import logging
+import smtplib
+from dataclasses import dataclass, field
+from datetime import date
+from email.message import EmailMessage
+from pathlib import Path
+from uuid import UUID
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Alert:
+    reminder_id: UUID
+    company_id: UUID
+    title: str
+    deadline: date
+    d_day_label: str
+
+
+@dataclass(slots=True)
+class Digest:
+    """한 수신자에게 보낼 알림 묶음."""
+
+    user_id: UUID
+    email: str
+    name: str
+    alerts: list[Alert] = field(default_factory=list)
+
+    @property
+    def subject(self) -> str:
+        return f"[{settings.APP_NAME}] 마감 알림 {len(self.alerts)}건"
+
+    def render_text(self) -> str:
+        lines = [f"{self.name}님, 확인이 필요한 일정입니다.", ""]
+        for alert in sorted(self.alerts, key=lambda a: a.deadline):
+            lines.append(f"[{alert.d_day_label}] {alert.deadline.isoformat()} {alert.title}")
+        return "\n".join(lines)
+
+
+class Transport:
+    """전송 채널 기본 클래스."""
+
+    channel = "none"
+
+    async def send_batch(self, digests: list[Digest]) -> list[Digest]:
+        """전송하고 전달하지 못한 다이제스트 목록을 반환합니다."""
+        raise NotImplementedError
+
+
+class NullTransport(Transport):
+    """아무것도 보내지 않습니다 (전송 비활성화)."""
+
+    async def send_batch(self, digests: list[Digest]) -> list[Digest]:
+        return []
+
+
+class FileTransport(Transport):
+    """다이제스트를 JSON Lines 파일에 기록합니다. 로컬 개발/테스트용."""
+
+    channel = "file"
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    async def send_batch(self, digests: list[Digest]) -> list[Digest]:
+        lines = [
+            json.dumps({
+                "user_id": str(d.user_id),
+                "email": d.email,
+                "subject": d.subject,
+                "body": d.render_text(),
+                "reminder_ids": [str(a.reminder_id) for a in d.alerts],
+            }, ensure_ascii=False)
+            for d in digests
+        ]
+        await asyncio.to_thread(self._append, lines)
+        return []
+
+    def _append(self, lines: list[str]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+
+
+class SMTPTransport(Transport):
+    """SMTP로 이메일을 보냅니다. 배치당 연결 하나를 재사용합니다.
+
+    메일마다 결과를 따로 봅니다. 수신 거부 등은 그 메일만 실패로, 연결이 끊기면 남은 메일 전체를 실패로 반환합니다.
+    """
+
+    channel = "email"
+
+    def __init__(self, host: str, port: int, sender: str):
+        self.host = host
+        self.port = port
+        self.sender = sender
+
+    async def send_batch(self, digests: list[Digest]) -> list[Digest]:
+        return await asyncio.to_thread(self._send, digests)
+
+    def _send(self, digests: list[Digest]) -> list[Digest]:
+        failed = []
+        with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+            for i, digest in enumerate(digests):
+                message = EmailMessage()
+                message["From"] = self.sender
+                message["To"] = digest.email
+                message["Subject"] = digest.subject
+                message.set_content(digest.render_text())
+                try:
+                    smtp.send_message(message)
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    logger.warning("SMTP connection lost after %d of %d messages", i, len(digests), exc_info=True)
+                    return failed + digests[i:]
+                except smtplib.SMTPException:
+                    logger.warning("SMTP rejected message to %s", digest.email, exc_info=True)
+                    failed.append(digest)
+        return failed
+
+
+def create_transport() -> Transport:
+    """설정(NOTIFICATION_TRANSPORT)에 따라 전송 채널을 만듭니다."""
+    kind = settings.NOTIFICATION_TRANSPORT
+    if kind == "smtp":
+        return SMTPTransport(settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_SENDER)
+    if kind == "file":
+        return FileTransport(settings.NOTIFICATION_FILE_PATH)
+    return NullTransport()
@@ -0,0 +1,105 @@
+"""사용자별 미완료 리마인더 인덱스(user_pending_reminders) 유지 서비스.
+
+리마인더 생성/수정/삭제, 템플릿 적용, Excel 가져오기, 멤버십 변경 시
+같은 트랜잭션 안에서 호출하여 읽기 모델을 갱신합니다.
+모든 갱신은 reminders/company_members에서 INSERT ... SELECT로 다시 만드는 방식이라
+호출 순서와 무관하게 DB 상태와 일치합니다.
+인덱스가 바뀐 사용자의 일일 다이제스트는 stale로 표시하고,
+리마인더가 바뀐 회사의 데이터 버전(내보내기 캐시 키)을 올립니다.
+"""
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete
+from app.models.reminder import Reminder, UserPendingReminder
+from app.models.company import CompanyMember
+from app.services.digest_service import mark_digests_stale
+from app.services.export_cache import bump_data_version
+
+# IN 절 파라미터 수 제한
+_CHUNK_SIZE = 1000
+
+_INDEX_COLUMNS = ["user_id", "reminder_id", "company_id", "title", "category", "deadline", "priority"]
+
+
+def _pending_rows():
+    """(멤버 × 미완료 리마인더) 행을 만드는 SELECT."""
+    return (
+        select(
+            CompanyMember.user_id,
+            Reminder.id,
+            Reminder.company_id,
+            Reminder.title,
+            Reminder.category,
+            Reminder.deadline,
+            Reminder.priority,
+        )
+        .join(CompanyMember, CompanyMember.company_id == Reminder.company_id)
+        .where(Reminder.completed == False)
+    )
+
+
+async def _delete(db: AsyncSession, *conditions) -> None:
+    await db.execute(
+        delete(UserPendingReminder).where(*conditions),
+        execution_options={"synchronize_session": False},
+    )
+
+
+async def _insert(db: AsyncSession, rows) -> None:
+    await db.execute(insert(UserPendingReminder).from_select(_INDEX_COLUMNS, rows))
+
+
+async def index_reminders(db: AsyncSession, reminder_ids: list[UUID]) -> None:
+    """생성/수정된 리마인더의 인덱스 행을 다시 만듭니다. 완료된 리마인더는 제거됩니다."""
+    for i in range(0, len(reminder_ids), _CHUNK_SIZE):
+        chunk = reminder_ids[i:i + _CHUNK_SIZE]
+        await bump_data_version(db, select(Reminder.company_id).where(Reminder.id.in_(chunk)))
+        await mark_digests_stale(
+            db,
+            select(CompanyMember.user_id)
+            .join(Reminder, Reminder.company_id == CompanyMember.company_id)
+            .where(Reminder.id.in_(chunk)),
+        )
+        await _delete(db, UserPendingReminder.reminder_id.in_(chunk))
+        await _insert(db, _pending_rows().where(Reminder.id.in_(chunk)))
+
+
+async def unindex_reminders(db: AsyncSession, reminder_ids: list[UUID]) -> None:
+    """삭제된 리마인더의 인덱스 행을 제거합니다."""
+    for i in range(0, len(reminder_ids), _CHUNK_SIZE):
+        chunk = reminder_ids[i:i + _CHUNK_SIZE]
+        await bump_data_version(db, select(Reminder.company_id).where(Reminder.id.in_(chunk)))
+        await mark_digests_stale(
+            db,
+            select(UserPendingReminder.user_id).where(UserPendingReminder.reminder_id.in_(chunk)),
+        )
+        await _delete(db, UserPendingReminder.reminder_id.in_(chunk))
+
+
+async def index_membership(db: AsyncSession, user_id: UUID, company_id: UUID) -> None:
+    """멤버 추가 시 해당 회사의 미완료 리마인더를 사용자 인덱스에 추가합니다."""
+    await unindex_membership(db, user_id, company_id)
+    await _insert(
+        db,
+        _pending_rows().where(
+            CompanyMember.user_id == user_id,
+            CompanyMember.company_id == company_id,
+        ),
+    )
+
+
+async def unindex_membership(db: AsyncSession, user_id: UUID, company_id: UUID) -> None:
+    """멤버 제거 시 해당 회사의 리마인더를 사용자 인덱스에서 제거합니다."""
+    await mark_digests_stale(db, [user_id])
+    await _delete(
+        db,
+        UserPendingReminder.user_id == user_id,
+        UserPendingReminder.company_id == company_id,
+    )
+
+
+async def rebuild_pending_index(db: AsyncSession) -> None:
+    """인덱스 전체를 다시 만듭니다. 데이터 복구나 초기 적재용입니다."""
+    await mark_digests_stale(db, select(CompanyMember.user_id))
+    await _delete(db)
+    await _insert(db, _pending_rows())
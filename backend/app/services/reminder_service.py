@@ -2,33 +2,23 @@ import math
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func
 from fastapi import HTTPException, status
 from app.models.reminder import Reminder
-from app.models.company import CompanyMember
-from app.models.user import User
 from app.schemas.reminder import ReminderCreate, ReminderUpdate
+from app.services.access_service import require_member
+from app.services.pending_index import index_reminders, unindex_reminders
+from app.services.deadline_scheduler import track_reminders, untrack_reminders
+from app.utils.security import Principal
 
 
 async def _check_company_access(db: AsyncSession, user_id: UUID, company_id: UUID) -> None:
-    result = await db.execute(
-        select(CompanyMember).where(
-            and_(
-                CompanyMember.user_id == user_id,
-                CompanyMember.company_id == company_id,
-            )
-        )
-    )
-    if not result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have access to this company",
-        )
+    await require_member(db, user_id, company_id)
 
 
 async def get_reminders(
     db: AsyncSession,
-    user: User,
+    user: Principal,
     company_id: UUID,
     page: int = 1,
     page_size: int = 20,
@@ -71,7 +61,7 @@ async def get_reminders(
     }
 
 
-async def get_reminder(db: AsyncSession, user: User, reminder_id: UUID) -> Reminder:
+async def get_reminder(db: AsyncSession, user: Principal, reminder_id: UUID) -> Reminder:
     result = await db.execute(select(Reminder).where(Reminder.id == reminder_id))
     reminder = result.scalar_one_or_none()
 
@@ -83,7 +73,7 @@ async def get_reminder(db: AsyncSession, user: User, reminder_id: UUID) -> Remin
 
 
 async def create_reminder(
-    db: AsyncSession, user: User, company_id: UUID, data: ReminderCreate
+    db: AsyncSession, user: Principal, company_id: UUID, data: ReminderCreate
 ) -> Reminder:
     await _check_company_access(db, user.id, company_id)
 
@@ -98,11 +88,13 @@ async def create_reminder(
     )
     db.add(reminder)
     await db.flush()
+    await index_reminders(db, [reminder.id])
+    track_reminders([reminder])
     return reminder
 
 
 async def update_reminder(
-    db: AsyncSession, user: User, reminder_id: UUID, data: ReminderUpdate
+    db: AsyncSession, user: Principal, reminder_id: UUID, data: ReminderUpdate
 ) -> Reminder:
     reminder = await get_reminder(db, user, reminder_id)
 
@@ -116,17 +108,21 @@ async def update_reminder(
 
     reminder.updated_at = datetime.utcnow()
     await db.flush()
+    await index_reminders(db, [reminder.id])
+    track_reminders([reminder])
     return reminder
 
 
-async def delete_reminder(db: AsyncSession, user: User, reminder_id: UUID) -> None:
+async def delete_reminder(db: AsyncSession, user: Principal, reminder_id: UUID) -> None:
     reminder = await get_reminder(db, user, reminder_id)
+    await unindex_reminders(db, [reminder.id])
     await db.delete(reminder)
     await db.flush()
+    untrack_reminders([reminder_id])
 
 
 async def bulk_create_reminders(
-    db: AsyncSession, user: User, company_id: UUID, reminders_data: list[dict]
+    db: AsyncSession, user: Principal, company_id: UUID, reminders_data: list[dict]
 ) -> list[Reminder]:
     await _check_company_access(db, user.id, company_id)
 
@@ -141,4 +137,6 @@ async def bulk_create_reminders(
         reminders.append(reminder)
 
     await db.flush()
+    await index_reminders(db, [r.id for r in reminders])
+    track_reminders(reminders)
     return reminders
@@ -10,7 +10,9 @@ from sqlalchemy import select
 from fastapi import HTTPException, status
 from app.models.template import Template, TemplateItem
 from app.models.reminder import Reminder
-from app.models.company import CompanyMember
+from app.services.access_service import require_member
+from app.services.pending_index import index_reminders
+from app.services.deadline_scheduler import track_reminders
 from app.services.holiday_service import (
     next_business_day, last_business_day_of_month, add_business_days,
 )
@@ -412,17 +414,7 @@ async def apply_template(
         )
 
     # 접근 권한 확인
-    member_result = await db.execute(
-        select(CompanyMember).where(
-            CompanyMember.user_id == user_id,
-            CompanyMember.company_id == company_id,
-        )
-    )
-    if not member_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have access to this company",
-        )
+    await require_member(db, user_id, company_id)
 
     # 템플릿 항목을 dict로 변환
     template_data = {
@@ -462,4 +454,6 @@ async def apply_template(
         reminders.append(reminder)
 
     await db.flush()
+    await index_reminders(db, [r.id for r in reminders])
+    track_reminders(reminders)
     return reminders
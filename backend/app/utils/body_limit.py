@@ -0,0 +1,55 @@
+"""요청 본문 크기 제한 미들웨어.
+
+업로드 엔드포인트는 Starlette가 본문 전체를 임시 파일로 스풀한 뒤에 실행되므로,
+엔드포인트 안의 크기 확인으로는 스풀 자체를 막을 수 없습니다.
+이 미들웨어는 Content-Length로 먼저 거절하고, 길이가 없으면(chunked) 읽는 동안 누적 크기를 확인합니다.
+"""
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    """path_prefixes로 시작하는 경로의 요청 본문을 max_bytes로 제한합니다."""
+
+    def __init__(self, app: ASGIApp, max_bytes: int, path_prefixes: tuple[str, ...]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes = path_prefixes
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body too large (max {self.max_bytes} bytes)",
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    too_large = int(value) > self.max_bytes
+                except ValueError:
+                    too_large = False
+                if too_large:
+                    error = self._too_large()
+                    response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+                    await response(scope, receive, send)
+                    return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # 본문 파싱 중에 발생하므로 FastAPI가 그대로 413 응답으로 바꿉니다
+                    raise self._too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
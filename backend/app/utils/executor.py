@@ -0,0 +1,95 @@
+"""이벤트 루프 밖에서 CPU 작업을 실행하는 제한된 스레드 풀.
+
+대기열 깊이를 제한하여, 한도를 넘는 요청은 쌓아두지 않고 즉시 거절합니다.
+"""
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.utils.metrics import register_collector
+
+
+class ExecutorBusyError(Exception):
+    """대기열이 가득 차 작업을 받을 수 없을 때 발생합니다."""
+
+
+class BoundedExecutor:
+    """동시 실행 수와 대기 작업 수가 제한된 스레드 풀."""
+
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._outstanding = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+        # 카운터는 이벤트 루프와 작업 스레드 양쪽에서 갱신됩니다
+        self._lock = threading.Lock()
+        register_collector(name, self.stats)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=self.name,
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            if self._outstanding >= self.max_workers + self.max_pending:
+                self._rejected += 1
+                raise ExecutorBusyError(f"{self.name} queue is full")
+            self._outstanding += 1
+
+        call = functools.partial(self._timed, fn, *args, **kwargs)
+        try:
+            future = self._get_executor().submit(call)
+        except BaseException:
+            with self._lock:
+                self._outstanding -= 1
+            raise
+        # 기다리던 쪽이 취소돼도 스레드는 계속 돌기 때문에, 작업이 실제로 끝날 때 집계합니다
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future: Future) -> None:
+        failed = future.cancelled() or future.exception() is not None
+        with self._lock:
+            self._outstanding -= 1
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def _timed(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._busy_seconds += elapsed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": min(self._outstanding, self.max_workers),
+                "queued": max(self._outstanding - self.max_workers, 0),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "busy_seconds": round(self._busy_seconds, 3),
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
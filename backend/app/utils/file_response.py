@@ -0,0 +1,119 @@
+"""ETag 재검증과 Range 요청을 지원하는 파일 응답.
+
+고정된 Starlette 버전의 FileResponse는 Range를 처리하지 않으므로 단일 bytes 범위를 직접 처리합니다.
+열린 파일 객체를 받아 응답을 보낸 뒤 닫습니다. 경로가 아니라 파일 객체를 쓰므로
+응답 도중 캐시에서 파일이 지워져도 끝까지 읽을 수 있습니다.
+"""
+from typing import BinaryIO
+from fastapi import Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """요청한 범위가 파일 밖에 있습니다."""
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Range 헤더의 단일 bytes 범위를 (시작, 끝) - 끝 포함 - 으로 해석합니다.
+
+    지원하지 않거나 형식이 잘못된 헤더는 None(전체 응답)입니다.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+
+    if start is None:
+        # bytes=-N: 마지막 N바이트
+        if end is None:
+            return None
+        if end == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - end, 0), size - 1
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end if end is not None else size - 1, size - 1)
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+async def _iter_file(fileobj: BinaryIO, start: int, length: int):
+    try:
+        await run_in_threadpool(fileobj.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await run_in_threadpool(fileobj.read, min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def file_response(
+    request: Request,
+    fileobj: BinaryIO,
+    size: int,
+    etag: str,
+    media_type: str,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """If-None-Match가 맞으면 304, 유효한 Range(및 If-Range)가 있으면 206, 아니면 전체 파일을 반환합니다."""
+    headers = {
+        **(headers or {}),
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # 브라우저는 저장해 두되 매번 ETag로 재검증합니다
+        "Cache-Control": "private, no-cache",
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        fileobj.close()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range", etag) == etag:
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            fileobj.close()
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            return StreamingResponse(
+                _iter_file(fileobj, start, end - start + 1),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=media_type,
+                headers={
+                    **headers,
+                    "Content-Range": f"bytes {start}-{end}/{size}",
+                    "Content-Length": str(end - start + 1),
+                },
+            )
+
+    return StreamingResponse(
+        _iter_file(fileobj, 0, size),
+        media_type=media_type,
+        headers={**headers, "Content-Length": str(size)},
+    )
@@ -0,0 +1,162 @@
+"""워커 간 리더 선출.
+
+스케줄러처럼 모든 워커 중 하나에서만 실행해야 하는 작업에 사용합니다.
+리더가 된 워커만 on_elected를 실행하고, 잠금을 잃거나 종료할 때 on_demoted를 실행합니다.
+
+- LeaderLock: 잠금 없음. 워커가 하나일 때 사용합니다 (항상 리더).
+- RedisLeaderLock: Redis SET NX PX 잠금. 리더는 TTL의 1/3마다 갱신하고, 리더가 죽으면 TTL 후 다른 워커가 이어받습니다.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from uuid import uuid4
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 자기 토큰일 때만 만료 시각을 늘리거나 지웁니다
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaderLock:
+    """잠금 없음. 이 워커가 항상 리더입니다."""
+
+    kind = "none"
+    ttl = 30.0
+
+    async def acquire(self) -> bool:
+        return True
+
+    async def renew(self) -> bool:
+        return True
+
+    async def release(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisLeaderLock(LeaderLock):
+    """Redis 키 하나로 리더를 정합니다. 값은 워커별 토큰입니다."""
+
+    kind = "redis"
+
+    def __init__(self, url: str, key: str, ttl: float):
+        self._url = url
+        self._key = key
+        self.ttl = ttl
+        self._token = uuid4().hex
+        self._redis = None
+
+    def _client(self):
+        if self._redis is None:
+            # redis 잠금을 쓸 때만 필요한 의존성입니다
+            from redis import asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._url, decode_responses=True)
+        return self._redis
+
+    async def acquire(self) -> bool:
+        return bool(await self._client().set(self._key, self._token, nx=True, px=int(self.ttl * 1000)))
+
+    async def renew(self) -> bool:
+        return bool(await self._client().eval(_RENEW_SCRIPT, 1, self._key, self._token, int(self.ttl * 1000)))
+
+    async def release(self) -> None:
+        await self._client().eval(_RELEASE_SCRIPT, 1, self._key, self._token)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+def create_leader_lock(name: str) -> LeaderLock:
+    """설정(LEADER_LOCK)에 따라 잠금을 만듭니다."""
+    if settings.LEADER_LOCK == "redis":
+        return RedisLeaderLock(settings.REDIS_URL, f"leader:{name}", settings.LEADER_LOCK_TTL_SECONDS)
+    return LeaderLock()
+
+
+class LeaderElection:
+    """잠금을 얻은 동안에만 on_elected로 시작한 작업을 유지합니다."""
+
+    def __init__(
+        self,
+        lock: LeaderLock,
+        on_elected: Callable[[], Awaitable[None]],
+        on_demoted: Callable[[], Awaitable[None]],
+    ):
+        self._lock = lock
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._task: asyncio.Task | None = None
+        self.is_leader = False
+        self.elections = 0
+
+    async def _elect(self) -> None:
+        self.is_leader = True
+        self.elections += 1
+        await self._on_elected()
+
+    async def _demote(self) -> None:
+        if self.is_leader:
+            self.is_leader = False
+            await self._on_demoted()
+
+    async def _run(self) -> None:
+        interval = self._lock.ttl / 3
+        while True:
+            try:
+                if self.is_leader:
+                    if not await self._lock.renew():
+                        logger.warning("lost leader lock; stopping leader-only jobs")
+                        await self._demote()
+                elif await self._lock.acquire():
+                    await self._elect()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # 잠금 상태를 확인할 수 없으면 두 워커가 함께 실행하지 않도록 물러납니다
+                logger.exception("leader lock check failed")
+                await self._demote()
+            await asyncio.sleep(interval)
+
+    async def start(self) -> None:
+        if self._lock.kind == "none":
+            # 잠금이 없으면 바로 리더가 됩니다
+            await self._elect()
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        was_leader = self.is_leader
+        await self._demote()
+        if was_leader:
+            try:
+                await self._lock.release()
+            except Exception:
+                logger.exception("leader lock release failed")
+        await self._lock.close()
+
+    def stats(self) -> dict:
+        return {"kind": self._lock.kind, "is_leader": self.is_leader, "elections": self.elections}
@@ -0,0 +1,40 @@
+"""프로세스 내 메트릭 수집.
+
+각 컴포넌트가 이름과 함께 수집 함수를 등록하면 /metrics 엔드포인트가
+등록된 모든 수집 결과를 한 번에 반환합니다.
+"""
+from bisect import bisect_left
+from typing import Any, Callable
+
+_collectors: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register_collector(name: str, collector: Callable[[], dict[str, Any]]) -> None:
+    _collectors[name] = collector
+
+
+def collect() -> dict[str, dict[str, Any]]:
+    return {name: collector() for name, collector in _collectors.items()}
+
+
+class Histogram:
+    """고정 구간 누적 히스토그램. 구간 경계(bounds)는 오름차순이며 마지막 구간은 +Inf입니다."""
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """{"le_<경계>": 누적 건수, ..., "count", "sum"} 형식으로 반환합니다."""
+        buckets, total = {}, 0
+        for bound, n in zip((*self.bounds, "inf"), self._counts):
+            total += n
+            buckets[f"le_{bound:g}" if bound != "inf" else "le_inf"] = total
+        return {**buckets, "count": self.count, "sum": round(self.sum, 3)}
@@ -0,0 +1,206 @@
+"""워커 간 메시지 전달(Pub/Sub) 브로커.
+
+WebSocket 동기화 메시지를 모든 워커에 퍼뜨리는 데 사용합니다.
+각 워커는 로컬 연결이 있는 채널만 구독하고, 받은 메시지를 자기 연결에만 전달합니다.
+
+- InProcessBroker: 같은 프로세스 안에서만 전달합니다. 단일 노드와 테스트용입니다.
+- RedisBroker: Redis Pub/Sub. 워커가 여러 개이거나 여러 호스트에서 실행할 때 사용합니다.
+
+publish_retained는 채널별 순번(seq)을 붙여 발행하고 최근 메시지를 보관합니다.
+재연결한 클라이언트가 놓친 메시지는 history로 다시 받습니다.
+"""
+import asyncio
+import logging
+from collections import defaultdict, deque
+from typing import Awaitable, Callable
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# handler(channel, data)
+MessageHandler = Callable[[str, str], Awaitable[None]]
+# build(seq) -> data
+DataBuilder = Callable[[int], str]
+
+
+class Broker:
+    """브로커 기본 클래스. 구독한 채널의 메시지는 start에 넘긴 handler로 전달됩니다."""
+
+    kind = "none"
+
+    async def start(self, handler: MessageHandler) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        return None
+
+    async def publish(self, channel: str, data: str) -> None:
+        raise NotImplementedError
+
+    async def subscribe(self, channel: str) -> None:
+        raise NotImplementedError
+
+    async def unsubscribe(self, channel: str) -> None:
+        raise NotImplementedError
+
+    async def publish_retained(self, channel: str, build: DataBuilder, retain: int) -> int:
+        """채널의 다음 순번으로 build(seq)를 발행하고 최근 retain개를 보관합니다. 순번을 반환합니다."""
+        raise NotImplementedError
+
+    async def history(self, channel: str, after: int) -> tuple[int, list[tuple[int, str]]]:
+        """(채널의 마지막 순번, 보관 중인 after 이후 메시지 [(seq, data)] 순번 순)."""
+        raise NotImplementedError
+
+
+class InProcessHub:
+    """프로세스 내 브로커들이 공유하는 구독자 목록과 채널별 보관 메시지."""
+
+    def __init__(self):
+        self.subscribers: dict[str, set["InProcessBroker"]] = defaultdict(set)
+        self.seq: dict[str, int] = defaultdict(int)
+        self.retained: dict[str, deque[tuple[int, str]]] = {}
+
+
+class InProcessBroker(Broker):
+    """프로세스 내 브로커. hub를 공유하면 여러 인스턴스(워커 흉내)끼리 메시지를 주고받습니다."""
+
+    kind = "memory"
+
+    def __init__(self, hub: InProcessHub | None = None):
+        self._hub = hub if hub is not None else InProcessHub()
+        self._handler: MessageHandler | None = None
+
+    async def start(self, handler: MessageHandler) -> None:
+        self._handler = handler
+
+    async def stop(self) -> None:
+        for subscribers in self._hub.subscribers.values():
+            subscribers.discard(self)
+        self._handler = None
+
+    async def publish(self, channel: str, data: str) -> None:
+        for broker in list(self._hub.subscribers.get(channel, ())):
+            if broker._handler is not None:
+                await broker._handler(channel, data)
+
+    async def subscribe(self, channel: str) -> None:
+        self._hub.subscribers[channel].add(self)
+
+    async def unsubscribe(self, channel: str) -> None:
+        subscribers = self._hub.subscribers.get(channel)
+        if subscribers is not None:
+            subscribers.discard(self)
+            if not subscribers:
+                del self._hub.subscribers[channel]
+
+    async def publish_retained(self, channel: str, build: DataBuilder, retain: int) -> int:
+        self._hub.seq[channel] += 1
+        seq = self._hub.seq[channel]
+        data = build(seq)
+        retained = self._hub.retained.get(channel)
+        if retained is None or retained.maxlen != retain:
+            retained = self._hub.retained[channel] = deque(retained or (), maxlen=retain)
+        retained.append((seq, data))
+        await self.publish(channel, data)
+        return seq
+
+    async def history(self, channel: str, after: int) -> tuple[int, list[tuple[int, str]]]:
+        retained = self._hub.retained.get(channel, ())
+        return self._hub.seq.get(channel, 0), [(seq, data) for seq, data in retained if seq > after]
+
+
+# 보관 메시지 키의 만료 시간. 메시지가 없는 회사의 키가 남지 않게 합니다
+_RETAINED_TTL_SECONDS = 24 * 3600
+
+
+class RedisBroker(Broker):
+    """Redis Pub/Sub 브로커. 워커마다 구독 연결 하나로 활성 채널을 모두 구독합니다.
+
+    순번은 {channel}:seq (INCR), 보관 메시지는 순번을 점수로 하는 {channel}:retained 정렬 집합입니다.
+    """
+
+    kind = "redis"
+
+    def __init__(self, url: str):
+        self._url = url
+        self._redis = None
+        self._pubsub = None
+        self._handler: MessageHandler | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self, handler: MessageHandler) -> None:
+        # redis 브로커를 쓸 때만 필요한 의존성입니다
+        from redis import asyncio as aioredis
+
+        self._handler = handler
+        self._redis = aioredis.from_url(self._url, decode_responses=True)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    async def publish(self, channel: str, data: str) -> None:
+        await self._redis.publish(channel, data)
+
+    async def subscribe(self, channel: str) -> None:
+        await self._pubsub.subscribe(channel)
+        # 구독이 하나라도 있어야 수신할 수 있으므로 첫 구독 때 수신 태스크를 시작합니다
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def unsubscribe(self, channel: str) -> None:
+        await self._pubsub.unsubscribe(channel)
+
+    async def publish_retained(self, channel: str, build: DataBuilder, retain: int) -> int:
+        seq = await self._redis.incr(f"{channel}:seq")
+        data = build(seq)
+        retained_key = f"{channel}:retained"
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(retained_key, {data: seq})
+            pipe.zremrangebyrank(retained_key, 0, -(retain + 1))
+            pipe.expire(retained_key, _RETAINED_TTL_SECONDS)
+            pipe.expire(f"{channel}:seq", _RETAINED_TTL_SECONDS)
+            pipe.publish(channel, data)
+            await pipe.execute()
+        return seq
+
+    async def history(self, channel: str, after: int) -> tuple[int, list[tuple[int, str]]]:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.get(f"{channel}:seq")
+            pipe.zrangebyscore(f"{channel}:retained", f"({after}", "+inf", withscores=True)
+            current, entries = await pipe.execute()
+        return int(current or 0), [(int(seq), data) for data, seq in entries]
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("redis pubsub receive failed")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message.get("type") != "message":
+                continue
+            try:
+                await self._handler(message["channel"], message["data"])
+            except Exception:
+                logger.exception("pubsub handler failed for %s", message["channel"])
+
+
+def create_broker() -> Broker:
+    """설정(WS_BROKER)에 따라 브로커를 만듭니다."""
+    if settings.WS_BROKER == "redis":
+        return RedisBroker(settings.REDIS_URL)
+    return InProcessBroker()
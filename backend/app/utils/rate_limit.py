@@ -0,0 +1,29 @@
+"""프로세스 내 토큰 버킷.
+
+초당 rate개씩 토큰이 채워지고 최대 burst개까지 쌓입니다. 워커 프로세스 단위이며 공유되지 않습니다.
+"""
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한기."""
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated", "_clock")
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def allow(self, cost: float = 1.0) -> bool:
+        """토큰이 충분하면 cost만큼 쓰고 True, 아니면 False를 반환합니다."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < cost:
+            return False
+        self._tokens -= cost
+        return True
@@ -1,3 +1,6 @@
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from uuid import UUID
 import jwt
@@ -6,16 +9,50 @@ import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, event
+from sqlalchemy.orm import object_session
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, run_after_commit
 from app.models.user import User
+from app.utils.cache import TTLCache
+from app.utils.executor import BoundedExecutor, ExecutorBusyError
 
 security_scheme = HTTPBearer()
 
 
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """인증된 사용자의 불변 식별 정보. ORM 관계를 포함하지 않습니다."""
+
+    id: UUID
+    email: str
+    name: str
+    is_active: bool
+    created_at: datetime
+
+
+# bcrypt 전용 스레드 풀 (이벤트 루프 블로킹 방지)
+password_hasher = BoundedExecutor(
+    "password_hasher",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+# sha256(token) -> 검증된 payload (토큰 exp에 만료)
+_token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+# user_id -> Principal
+_user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
 def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 
@@ -23,6 +60,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """해시의 cost factor가 현재 설정(BCRYPT_ROUNDS)과 다르면 True."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hasher(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hasher(verify_password, plain_password, hashed_password)
+
+
+async def _run_hasher(fn, *args):
+    try:
+        return await password_hasher.run(fn, *args)
+    except ExecutorBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+
 def create_access_token(user_id: UUID) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
@@ -44,20 +109,39 @@ def create_refresh_token(user_id: UUID) -> str:
 
 
 def decode_token(token: str) -> dict:
+    """토큰을 검증하고 payload를 반환합니다.
+
+    이미 검증된 토큰은 서명 검증을 건너뛰지만, 만료 시각은 매번 확인합니다.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return dict(payload)
+        _token_cache.pop(key)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])  # type: ignore
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
 
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        _token_cache.set(key, dict(payload), ttl=exp - time.time())
+    return payload
+
+
+def clear_token_cache() -> None:
+    _token_cache.clear()
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> Principal:
     payload = decode_token(credentials.credentials)
 
     if payload.get("type") != "access":
@@ -73,13 +157,55 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
-    result = await db.execute(select(User).where(User.id == UUID(user_id)))
-    user = result.scalar_one_or_none()
+    principal = await load_principal(db, UUID(user_id))
 
-    if user is None or not user.is_active:
+    if principal is None or not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
 
-    return user
+    return principal
+
+
+async def load_principal(db: AsyncSession, user_id: UUID) -> Principal | None:
+    """캐시된 Principal을 반환하고, 없으면 필요한 컬럼만 조회합니다."""
+    principal = _user_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(
+        select(User.id, User.email, User.name, User.is_active, User.created_at)
+        .where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    principal = Principal(*row)
+    if principal.is_active:
+        _user_cache.set(user_id, principal)
+    return principal
+
+
+def invalidate_user(user_id: UUID) -> None:
+    """사용자 정보 변경(비활성화 등) 시 캐시에서 제거합니다."""
+    _user_cache.pop(user_id)
+
+
+def clear_user_cache() -> None:
+    _user_cache.clear()
+
+
+@event.listens_for(User.is_active, "set")
+def _on_user_active_changed(target: User, value: bool, oldvalue, initiator) -> None:
+    # 비활성화는 어느 경로로 일어나든 캐시에서 제거합니다.
+    # 세션에 속한 객체면 커밋 뒤에 제거해야 그 사이 다른 요청이 활성 상태를 다시 캐싱하지 않습니다.
+    if value or target.id is None:
+        return
+    session = object_session(target)
+    if session is None:
+        invalidate_user(target.id)
+    else:
+        user_id = target.id
+        run_after_commit(session, lambda: invalidate_user(user_id))
@@ -0,0 +1,101 @@
+"""동기 writer 출력을 비동기 바이트 스트림으로 넘기는 유틸리티.
+
+openpyxl의 save처럼 파일 객체에 쓰는 동기 코드를 스레드에서 실행하고,
+쓰인 바이트를 청크 단위로 StreamingResponse에 흘려보냅니다.
+writer는 호출한 쪽의 BoundedExecutor에서 실행되므로 동시에 쓰는 수도 그 풀의 한도를 따릅니다.
+큐 크기가 제한되어 있어 클라이언트가 느리면 writer 쪽이 기다립니다.
+"""
+import asyncio
+from typing import AsyncIterator, Callable, BinaryIO
+from app.utils.executor import BoundedExecutor, ExecutorBusyError
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class _StreamClosed(Exception):
+    """읽는 쪽이 스트림을 닫았습니다."""
+
+
+class _QueueWriter:
+    """쓰기 전용(seek 불가) 파일 객체. 청크가 차면 이벤트 루프의 큐로 넘깁니다."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, chunk_size: int):
+        self._loop = loop
+        self._queue = queue
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._aborted = False
+        self.cancelled = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_size:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._buffer:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _put(self, item) -> None:
+        if self.cancelled:
+            # 한 번만 예외로 writer를 중단시키고, 이후 정리 중의 쓰기(zip 종료 레코드 등)는 버립니다
+            if not self._aborted:
+                self._aborted = True
+                raise _StreamClosed()
+            return
+        asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop).result()
+
+
+async def stream_writer_output(
+    write: Callable[[BinaryIO], None],
+    executor: BoundedExecutor,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    max_chunks: int = 8,
+) -> AsyncIterator[bytes]:
+    """write(fileobj)를 executor에서 실행하며 쓰인 바이트를 차례로 내보냅니다."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_chunks)
+    writer = _QueueWriter(loop, queue, chunk_size)
+    done = object()
+
+    def run() -> None:
+        try:
+            write(writer)
+            writer.close()
+        except _StreamClosed:
+            return
+        finally:
+            if not writer.cancelled:
+                asyncio.run_coroutine_threadsafe(queue.put(done), loop).result()
+
+    async def execute() -> None:
+        try:
+            await executor.run(run)
+        except ExecutorBusyError as e:
+            # writer가 시작되지 않았으므로 읽는 쪽에 직접 알립니다
+            await queue.put(e)
+
+    task = asyncio.ensure_future(execute())
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is done:
+                break
+            if isinstance(chunk, ExecutorBusyError):
+                raise chunk
+            yield chunk
+    finally:
+        # 중간에 연결이 끊기면 writer를 멈추고 대기 중인 put을 풀어줍니다
+        writer.cancelled = True
+        while not queue.empty():
+            queue.get_nowait()
+        await task
@@ -1,65 +1,549 @@
 """WebSocket 연결 관리 및 실시간 동기화.
 
-Redis Pub/Sub을 활용하여 회사별 채널로 실시간 메시지를 전달합니다.
+회사별 채널로 실시간 메시지를 전달합니다. 브로드캐스트는 브로커(app.utils.pubsub)에 발행되고,
+각 워커는 로컬 연결이 있는 회사 채널만 구독하여 받은 메시지를 자기 연결에 전달합니다.
+워커가 여러 개이면 Redis 브로커(WS_BROKER=redis)를 사용해야 모든 클라이언트가 받습니다.
+
+연결마다 크기가 제한된 전송 큐와 전송 태스크가 있어 브로드캐스트는 큐에 넣기만 합니다.
+큐가 가득 찬 느린 클라이언트는 연결을 끊어 다른 클라이언트의 전달을 막지 않게 합니다.
+
+동기화 메시지는 회사별로 WS_COALESCE_WINDOW_MS 동안 모았다가 한 프레임으로 보냅니다.
+같은 항목의 이벤트는 하나로 합치고, 너무 많으면 전체 재조회(resync) 신호로 대신합니다.
+
+서버가 보내는 메시지에는 회사별 순번(seq)이 붙고 최근 WS_REPLAY_BUFFER_SIZE개가 브로커에 보관됩니다.
+재연결할 때 last_seq를 주면 그 뒤의 메시지를 다시 보내고, 보관 범위를 벗어났으면 resync를 보냅니다.
+
+클라이언트가 보낸 메시지의 중계(relay)는 연결별, 회사별 토큰 버킷으로 제한하고 넘치면 버립니다.
+
+WS_PING_INTERVAL_SECONDS마다 {"type": "ping"}을 보내고, WS_IDLE_TIMEOUT_SECONDS 동안 아무 메시지(pong 포함)도
+받지 못한 연결은 끊습니다. 사용자별, 회사별 연결 수 제한은 워커 단위입니다.
 """
+import asyncio
 import json
-from uuid import UUID
+import logging
+import time
+from uuid import UUID, uuid4
 from typing import Any
 from fastapi import WebSocket
 from collections import defaultdict
+from app.config import settings
+from app.utils.metrics import Histogram, register_collector
+from app.utils.pubsub import Broker, InProcessBroker
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL_PREFIX = "ws:company:"
+
+
+def _channel(company_id: UUID | str) -> str:
+    return f"{_CHANNEL_PREFIX}{company_id}"
+
+
+def _dumps(message: dict[str, Any]) -> str:
+    # WebSocket.send_json과 같은 형식
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+# 같은 항목(entity, id)에 대해 합쳐지는 행 변경 이벤트
+_ROW_EVENTS = frozenset({"created", "updated", "deleted"})
+
+
+def _event_key(message: dict[str, Any]) -> tuple:
+    event = message.get("event")
+    kind = "row" if event in _ROW_EVENTS else event
+    return kind, message.get("entity"), message.get("id")
+
+
+def _merge_event(previous: dict[str, Any], message: dict[str, Any]) -> dict[str, Any]:
+    """같은 항목의 이벤트 두 개를 하나로 합칩니다.
+
+    created의 data는 행 전체, updated의 data는 변경된 필드입니다. 뒤따르는 updated는 앞 이벤트의
+    data에 덮어써 합치고, 어느 한쪽이라도 data가 없으면 data 없이(클라이언트가 다시 조회) 보냅니다.
+    """
+    if message.get("event") != "updated" or previous.get("event") not in ("created", "updated"):
+        return message
+    data = None
+    if previous.get("data") is not None and message.get("data") is not None:
+        data = {**previous["data"], **message["data"]}
+    # 클라이언트가 아직 생성을 받지 못했으면 최신 내용의 생성 이벤트로 보냅니다
+    return {**message, "event": previous["event"], "data": data}
+
+
+def coalesce_messages(messages: list[dict[str, Any]], max_events: int) -> dict[str, Any]:
+    """창 안에 모인 메시지를 한 프레임으로 합칩니다.
+
+    하나뿐이면 그대로, 여러 개면 항목별로 합친 batch, max_events를 넘으면 resync 신호입니다.
+    """
+    merged: dict[tuple, dict[str, Any]] = {}
+    for message in messages:
+        key = _event_key(message)
+        merged[key] = _merge_event(merged[key], message) if key in merged else message
+
+    events = list(merged.values())
+    entities = {event.get("entity") for event in events}
+    entity = entities.pop() if len(entities) == 1 else None
+    if len(events) == 1:
+        return events[0]
+    if len(events) > max_events:
+        return {"event": "resync", "entity": entity, "id": None, "data": None}
+    return {"event": "batch", "entity": entity, "id": None, "data": None, "events": events}
+
+
+def _resync_message(key: str, seq: int) -> dict[str, Any]:
+    return {"event": "resync", "entity": None, "id": None, "data": None, "company_id": key, "seq": seq}
+
+
+# 느린 클라이언트를 끊을 때의 close 코드 (1013: Try Again Later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# 하트비트에 응답하지 않는 유휴 연결, 연결 수 제한 초과의 close 코드
+IDLE_CLOSE_CODE = 4008
+CONNECTION_LIMIT_CLOSE_CODE = 4029
+_PING = json.dumps({"type": "ping"})
+# 발행부터 전송 완료까지의 지연 구간 (ms)
+_LATENCY_BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# 회사별 연결 수 분포 구간. /metrics는 인증이 없으므로 회사 ID 대신 분포만 공개합니다
+_COMPANY_SIZE_BOUNDS = (1, 5, 10, 50, 100, 500)
+_CLOSE_TIMEOUT_SECONDS = 5.0
+
+
+class _Connection:
+    """연결 하나의 구독 회사, 전송 큐와 큐를 비우는 전송 태스크.
+
+    구독 회사가 여러 개여도 큐와 태스크는 연결당 하나입니다.
+    """
+
+    __slots__ = ("websocket", "user_id", "companies", "queue", "task", "held", "relay_bucket", "last_seen")
+
+    def __init__(self, websocket: WebSocket, max_queue: int, user_id: UUID | None = None):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.companies: set[str] = set()
+        # (발행 시각 또는 None, 직렬화된 메시지)
+        self.queue: asyncio.Queue[tuple[float | None, str]] = asyncio.Queue(maxsize=max_queue)
+        self.task: asyncio.Task | None = None
+        self.last_seen = time.monotonic()
+        self.relay_bucket = TokenBucket(settings.WS_RELAY_RATE, settings.WS_RELAY_BURST)
+        # 회사별로 재전송 중에 도착한 실시간 메시지 [(seq, payload)]. 재전송이 끝나면 이어서 보냅니다
+        self.held: dict[str, list[tuple[int | None, str]]] = {}
 
 
 class ConnectionManager:
-    """WebSocket 연결을 관리하는 클래스."""
+    """WebSocket 연결과 연결별 회사 구독을 관리하는 클래스."""
+
+    def __init__(
+        self,
+        broker: Broker | None = None,
+        max_queue: int = settings.WS_SEND_QUEUE_SIZE,
+        coalesce_window: float = settings.WS_COALESCE_WINDOW_MS / 1000,
+        coalesce_max_events: int = settings.WS_COALESCE_MAX_EVENTS,
+        replay_size: int = settings.WS_REPLAY_BUFFER_SIZE,
+        ping_interval: float = settings.WS_PING_INTERVAL_SECONDS,
+        idle_timeout: float = settings.WS_IDLE_TIMEOUT_SECONDS,
+        max_per_user: int = settings.WS_MAX_CONNECTIONS_PER_USER,
+        max_per_company: int = settings.WS_MAX_CONNECTIONS_PER_COMPANY,
+    ):
+        # company_id -> 구독 중인 연결 집합
+        self._connections: dict[str, set[_Connection]] = defaultdict(set)
+        self._sockets: dict[WebSocket, _Connection] = {}
+        self._broker = broker or InProcessBroker()
+        self._started = False
+        self._max_queue = max_queue
+        self._closing: set[asyncio.Task] = set()
+        self.evicted = 0
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_events = coalesce_max_events
+        # company_id -> 창 안에 모인 동기화 메시지
+        self._pending: dict[str, list[dict[str, Any]]] = {}
+        self._flushers: set[asyncio.Task] = set()
+        self.replay_size = replay_size
+        self.replayed = 0
+        self.resyncs = 0
+        # company_id -> 회사별 중계 토큰 버킷 (구독이 있는 동안만 유지)
+        self._company_buckets: dict[str, TokenBucket] = {}
+        self.relayed = 0
+        # 사유별 버린 클라이언트 메시지 수
+        self.dropped: dict[str, int] = defaultdict(int)
+        self.ping_interval = ping_interval
+        self.idle_timeout = idle_timeout
+        self._heartbeat_task: asyncio.Task | None = None
+        self.reaped = 0
+        self.max_per_user = max_per_user
+        self.max_per_company = max_per_company
+        # user_id -> 이 워커의 연결 수
+        self._users: dict[UUID, int] = defaultdict(int)
+        # 사유별 거절한 연결/구독 수
+        self.rejected: dict[str, int] = defaultdict(int)
+        self.fanout_latency = Histogram(_LATENCY_BOUNDS_MS)
+        # 브로커를 거쳐 돌아온 메시지에서 자기 워커를 구분하는 id
+        self.worker_id = uuid4().hex
 
-    def __init__(self):
-        # company_id -> list of WebSocket connections
-        self._connections: dict[str, list[WebSocket]] = defaultdict(list)
+    async def start(self, broker: Broker | None = None) -> None:
+        if broker is not None:
+            await self.stop()
+            self._broker = broker
+        if not self._started:
+            await self._broker.start(self._on_message)
+            self._started = True
+        if self._heartbeat_task is None and self.ping_interval > 0:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
 
-    async def connect(self, websocket: WebSocket, company_id: UUID) -> None:
+    async def stop(self) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        await self.flush()
+        for conn in list(self._sockets.values()):
+            if conn.task is not None:
+                conn.task.cancel()
+        if self._started:
+            await self._broker.stop()
+            self._started = False
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        company_id: UUID | None = None,
+        last_seq: int | None = None,
+        user_id: UUID | None = None,
+    ) -> bool:
+        """연결을 등록합니다. company_id가 있으면 바로 구독합니다 (subscribe 참고).
+
+        사용자나 회사의 연결 수 제한을 넘으면 close 코드 4029로 닫고 False를 반환합니다.
+        """
         await websocket.accept()
-        key = str(company_id)
-        self._connections[key].append(websocket)
+        await self.start()
+        if user_id is not None and self._users.get(user_id, 0) >= self.max_per_user:
+            await self._reject(websocket, "user_limit")
+            return False
+
+        conn = _Connection(websocket, self._max_queue, user_id)
+        conn.task = asyncio.create_task(self._drain(conn))
+        self._sockets[websocket] = conn
+        if user_id is not None:
+            self._users[user_id] += 1
+        if company_id is not None and not await self.subscribe(websocket, company_id, last_seq):
+            await self.disconnect(websocket)
+            await self._reject(websocket, None)
+            return False
+        return True
+
+    async def _reject(self, websocket: WebSocket, reason: str | None) -> None:
+        if reason is not None:
+            self.rejected[reason] += 1
+        try:
+            await websocket.close(code=CONNECTION_LIMIT_CLOSE_CODE, reason="Too many connections")
+        except Exception:
+            pass
 
-    def disconnect(self, websocket: WebSocket, company_id: UUID) -> None:
+    async def subscribe(self, websocket: WebSocket, company_id: UUID, last_seq: int | None = None) -> bool:
+        """연결이 회사 채널을 받도록 구독합니다. last_seq가 있으면 그 뒤에 발행된 메시지를 먼저 보냅니다.
+
+        권한 확인은 호출하는 쪽에서 합니다. 회사의 연결 수 제한을 넘으면 False를 반환합니다.
+        """
+        conn = self._sockets.get(websocket)
         key = str(company_id)
-        if websocket in self._connections[key]:
-            self._connections[key].remove(websocket)
-        if not self._connections[key]:
-            del self._connections[key]
+        if conn is None:
+            return False
+        if key in conn.companies:
+            return True
+        if len(self._connections.get(key, ())) >= self.max_per_company:
+            self.rejected["company_limit"] += 1
+            return False
+        first = key not in self._connections
+        if last_seq is not None:
+            conn.held[key] = []
+        conn.companies.add(key)
+        self._connections[key].add(conn)
+        if first:
+            await self._broker.subscribe(_channel(key))
+        if last_seq is not None:
+            await self._replay(conn, key, last_seq)
+        return True
 
-    async def broadcast_to_company(
-        self, company_id: UUID, message: dict[str, Any], exclude: WebSocket | None = None
-    ) -> None:
-        """특정 회사의 모든 연결에 메시지를 브로드캐스트합니다."""
+    async def unsubscribe(self, websocket: WebSocket, company_id: UUID) -> None:
+        conn = self._sockets.get(websocket)
         key = str(company_id)
-        disconnected = []
+        if conn is None or key not in conn.companies:
+            return
+        if self._discard(conn, key):
+            await self._release(key)
+
+    async def _replay(self, conn: _Connection, key: str, last_seq: int) -> None:
+        """보관된 메시지 중 last_seq 이후를 보냅니다. 빠진 순번이 있으면 resync를 보냅니다.
+
+        구독 후에 보관 메시지를 읽으므로 그 사이 실시간 메시지는 held에 모았다가 중복을 빼고 이어 보냅니다.
+        """
+        current, entries = await self._broker.history(_channel(key), last_seq)
+        held = conn.held.pop(key, None) or []
+        if self._sockets.get(conn.websocket) is not conn or key not in conn.companies:
+            return
 
-        for ws in self._connections.get(key, []):
-            if ws == exclude:
+        missing = last_seq < current and (not entries or entries[0][0] > last_seq + 1)
+        if last_seq > current or missing or len(entries) >= self._max_queue:
+            # 보관 범위를 벗어났거나(또는 순번이 초기화됨) 한 번에 보내기에 너무 많음
+            self.resyncs += 1
+            self._enqueue(conn, _dumps(_resync_message(key, current)))
+            # 클라이언트가 다시 조회하므로 current까지의 메시지는 보내지 않습니다
+            floor, sent = current, set()
+        else:
+            self.replayed += len(entries)
+            for _, data in entries:
+                self._enqueue(conn, data.partition("\n")[2])
+            floor, sent = 0, {seq for seq, _ in entries}
+
+        for seq, payload in held:
+            if seq is not None and (seq <= floor or seq in sent):
                 continue
+            self._enqueue(conn, payload)
+
+    def _discard(self, conn: _Connection, key: str) -> bool:
+        """연결의 회사 구독을 뺍니다. 회사의 마지막 구독이었으면 True."""
+        conn.companies.discard(key)
+        conn.held.pop(key, None)
+        conns = self._connections.get(key)
+        if conns is None:
+            return False
+        conns.discard(conn)
+        if conns:
+            return False
+        del self._connections[key]
+        self._company_buckets.pop(key, None)
+        return True
+
+    def _remove(self, conn: _Connection) -> list[str]:
+        """연결을 목록에서 빼고 전송 태스크를 멈춥니다. 마지막 구독이 빠진 회사 키들을 반환합니다."""
+        if self._sockets.pop(conn.websocket, None) is conn and conn.user_id is not None:
+            self._users[conn.user_id] -= 1
+            if self._users[conn.user_id] <= 0:
+                del self._users[conn.user_id]
+        if conn.task is not None and conn.task is not asyncio.current_task():
+            conn.task.cancel()
+        return [key for key in list(conn.companies) if self._discard(conn, key)]
+
+    async def _release(self, key: str) -> None:
+        await self._broker.unsubscribe(_channel(key))
+        # 구독 해제를 기다리는 동안 새 구독이 생겼으면 다시 구독합니다
+        if key in self._connections:
+            await self._broker.subscribe(_channel(key))
+
+    async def disconnect(self, websocket: WebSocket, company_id: UUID | None = None) -> None:
+        conn = self._sockets.get(websocket)
+        if conn is None:
+            return
+        for key in self._remove(conn):
+            await self._release(key)
+
+    async def _drain(self, conn: _Connection) -> None:
+        """연결의 전송 큐를 순서대로 보냅니다. 전송에 실패하면 연결을 정리합니다."""
+        try:
+            while True:
+                published_at, payload = await conn.queue.get()
+                await conn.websocket.send_text(payload)
+                if published_at is not None:
+                    self.fanout_latency.observe((time.time() - published_at) * 1000)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await self.disconnect(conn.websocket)
+
+    def _enqueue(self, conn: _Connection, payload: str, published_at: float | None = None) -> None:
+        try:
+            conn.queue.put_nowait((published_at, payload))
+        except asyncio.QueueFull:
+            self._evict(conn)
+
+    def _evict(self, conn: _Connection) -> None:
+        """큐가 넘친 느린 클라이언트를 끊습니다."""
+        if self._sockets.get(conn.websocket) is not conn:
+            return
+        self.evicted += 1
+        logger.info("evicting slow websocket consumer subscribed to %d companies", len(conn.companies))
+        self._terminate(conn, SLOW_CONSUMER_CLOSE_CODE, "Slow consumer")
+
+    def _terminate(self, conn: _Connection, code: int, reason: str) -> None:
+        """연결을 정리하고 close는 기다리지 않고 백그라운드에서 보냅니다."""
+        task = asyncio.create_task(self._close(conn.websocket, self._remove(conn), code, reason))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket, keys: list[str], code: int, reason: str) -> None:
+        for key in keys:
+            await self._release(key)
+        try:
+            await asyncio.wait_for(websocket.close(code=code, reason=reason), _CLOSE_TIMEOUT_SECONDS)
+        except Exception:
+            pass
+
+    def touch(self, websocket: WebSocket) -> None:
+        """클라이언트에서 메시지(pong 포함)를 받았음을 기록합니다."""
+        conn = self._sockets.get(websocket)
+        if conn is not None:
+            conn.last_seen = time.monotonic()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.ping_interval)
             try:
-                await ws.send_json(message)
+                self.check_idle()
             except Exception:
-                disconnected.append(ws)
+                logger.exception("websocket heartbeat failed")
 
-        for ws in disconnected:
-            self.disconnect(ws, company_id)
+    def check_idle(self, now: float | None = None) -> None:
+        """유휴 시간이 지난 연결은 끊고, 나머지 연결에는 ping을 보냅니다."""
+        now = time.monotonic() if now is None else now
+        for conn in list(self._sockets.values()):
+            if now - conn.last_seen > self.idle_timeout:
+                self.reaped += 1
+                self._terminate(conn, IDLE_CLOSE_CODE, "Idle timeout")
+            else:
+                self._enqueue(conn, _PING)
+
+    async def broadcast_to_company(
+        self,
+        company_id: UUID,
+        message: dict[str, Any],
+        exclude: WebSocket | None = None,
+        coalesce: bool = True,
+    ) -> None:
+        """특정 회사의 모든 연결(모든 워커)에 메시지를 브로드캐스트합니다.
+
+        coalesce이면 창이 끝날 때 같은 회사의 다른 메시지와 합쳐 보냅니다. exclude가 있으면 바로 보냅니다.
+        """
+        if not coalesce or exclude is not None or self.coalesce_window <= 0:
+            await self._publish(str(company_id), message, exclude)
+            return
+
+        key = str(company_id)
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending.append(message)
+            return
+        self._pending[key] = [message]
+        task = asyncio.create_task(self._flush_later(key))
+        self._flushers.add(task)
+        task.add_done_callback(self._flushers.discard)
+
+    async def _flush_later(self, key: str) -> None:
+        await asyncio.sleep(self.coalesce_window)
+        await self._flush_company(key)
+
+    async def _flush_company(self, key: str) -> None:
+        messages = self._pending.pop(key, None)
+        if messages:
+            await self._publish(key, coalesce_messages(messages, self.coalesce_max_events))
+
+    async def flush(self) -> None:
+        """모아 둔 메시지를 창이 끝나기를 기다리지 않고 모두 보냅니다."""
+        for key in list(self._pending):
+            await self._flush_company(key)
+
+    async def _publish(self, key: str, message: dict[str, Any], exclude: WebSocket | None = None) -> None:
+        await self.start()
+        # 헤더(발행 워커, 제외할 연결, 순번, 발행 시각) 다음 줄에 직렬화된 메시지를 그대로 싣습니다.
+        # 한 연결이 여러 회사를 구독할 수 있으므로 서버 메시지에는 company_id를 붙입니다
+        if exclude is not None:
+            # 클라이언트 메시지 중계는 순번을 붙이지 않고 보관하지도 않습니다
+            await self._broker.publish(
+                _channel(key), f"{self.worker_id} {id(exclude)}  {time.time():.6f}\n{_dumps(message)}"
+            )
+            return
+        await self._broker.publish_retained(
+            _channel(key),
+            lambda seq: f"{self.worker_id}  {seq} {time.time():.6f}\n{_dumps({**message, 'company_id': key, 'seq': seq})}",
+            self.replay_size,
+        )
+
+    async def _on_message(self, channel: str, data: str) -> None:
+        """브로커에서 받은 메시지를 이 워커의 연결에 전달합니다."""
+        header, _, payload = data.partition("\n")
+        origin, excluded, seq, *rest = header.split(" ")
+        published_at = float(rest[0]) if rest and rest[0] else None
+        key = channel[len(_CHANNEL_PREFIX):]
+        skip = excluded if origin == self.worker_id else None
+
+        for conn in list(self._connections.get(key, ())):
+            if skip and str(id(conn.websocket)) == skip:
+                continue
+            held = conn.held.get(key) if conn.held else None
+            if held is not None:
+                held.append((int(seq) if seq else None, payload))
+                continue
+            self._enqueue(conn, payload, published_at)
 
     async def send_personal(self, websocket: WebSocket, message: dict[str, Any]) -> None:
-        """개인 메시지를 전송합니다."""
+        """개인 메시지를 전송합니다. 관리 중인 연결이면 브로드캐스트와 같은 큐로 순서대로 보냅니다."""
+        conn = self._sockets.get(websocket)
+        if conn is not None:
+            self._enqueue(conn, _dumps(message))
+            return
         try:
             await websocket.send_json(message)
         except Exception:
             pass
 
+    async def relay(self, websocket: WebSocket, company_id: UUID, message: dict[str, Any]) -> str | None:
+        """클라이언트 메시지를 같은 회사의 다른 연결에 전달합니다. 버렸으면 사유를 반환합니다."""
+        conn = self._sockets.get(websocket)
+        key = str(company_id)
+        if conn is None or key not in conn.companies:
+            return self.drop("not_subscribed")
+        if not conn.relay_bucket.allow():
+            return self.drop("rate_limited")
+        bucket = self._company_buckets.get(key)
+        if bucket is None:
+            bucket = self._company_buckets[key] = TokenBucket(
+                settings.WS_COMPANY_RELAY_RATE, settings.WS_COMPANY_RELAY_BURST
+            )
+        if not bucket.allow():
+            return self.drop("company_rate_limited")
+
+        self.relayed += 1
+        await self.broadcast_to_company(company_id, message, exclude=websocket, coalesce=False)
+        return None
+
+    def drop(self, reason: str) -> str:
+        """버린 클라이언트 메시지를 사유별로 셉니다."""
+        self.dropped[reason] += 1
+        return reason
+
+    def is_subscribed(self, websocket: WebSocket, company_id: UUID) -> bool:
+        conn = self._sockets.get(websocket)
+        return conn is not None and str(company_id) in conn.companies
+
     @property
     def active_connections_count(self) -> int:
-        return sum(len(conns) for conns in self._connections.values())
+        return len(self._sockets)
+
+    def stats(self) -> dict:
+        depths = [conn.queue.qsize() for conn in self._sockets.values()]
+        company_sizes = Histogram(_COMPANY_SIZE_BOUNDS)
+        for conns in self._connections.values():
+            company_sizes.observe(len(conns))
+        return {
+            "worker_id": self.worker_id,
+            "connections": len(self._sockets),
+            "users": len(self._users),
+            "companies": len(self._connections),
+            "subscriptions": sum(len(conns) for conns in self._connections.values()),
+            "company_connections": company_sizes.snapshot(),
+            "company_connections_max": max((len(conns) for conns in self._connections.values()), default=0),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "evicted": self.evicted,
+            "reaped": self.reaped,
+            "rejected": dict(self.rejected),
+            "replayed": self.replayed,
+            "resyncs": self.resyncs,
+            "relayed": self.relayed,
+            "dropped": dict(self.dropped),
+            "fanout_latency_ms": self.fanout_latency.snapshot(),
+        }
 
 
 # 전역 ConnectionManager 인스턴스
 manager = ConnectionManager()
+register_collector("websocket", manager.stats)
 
 
 def create_sync_message(
@@ -68,9 +552,13 @@ def create_sync_message(
     entity_id: str | None = None,
     data: dict | None = None,
 ) -> dict:
-    """동기화 메시지를 생성합니다."""
+    """동기화 메시지를 생성합니다.
+
+    data는 created이면 직렬화된 행 전체, updated이면 변경된 필드만 담습니다.
+    """
     return {
-        "event": event_type,  # created, updated, deleted
+        # created, updated, deleted, bulk_created, deadline_alert (묶음 전송 시 batch, resync)
+        "event": event_type,
         "entity": entity_type,  # reminder, template
         "id": entity_id,
         "data": data,
@@ -0,0 +1,68 @@
+"""테스트 공용 픽스처.
+
+실제 DB 없이 서비스 함수를 검증하기 위한 가짜 세션을 제공합니다.
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def mock_db():
+    """가짜 AsyncSession을 만드는 팩토리.
+
+    키워드 인자는 execute 결과 객체의 메서드 반환값입니다.
+    예: mock_db(scalar_one_or_none=role), mock_db(all=rows)
+    """
+    def make(**returns):
+        result = MagicMock()
+        for name, value in returns.items():
+            getattr(result, name).return_value = value
+        db = MagicMock()
+        db.info = {}
+        db.execute = AsyncMock(return_value=result)
+        return db
+
+    return make
+
+
+@pytest.fixture
+def session_factory():
+    """`async with factory() as session`에서 주어진 세션을 돌려주는 세션 팩토리 목."""
+    def make(session):
+        factory = MagicMock()
+        factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        return factory
+
+    return make
+
+
+@pytest.fixture
+def api_client(mock_db):
+    """인증 사용자와 DB 세션 의존성을 바꾼 TestClient.
+
+    lifespan(실제 DB 연결, 백그라운드 작업)은 실행하지 않습니다. 세션은 client.db로 확인합니다.
+    """
+    from datetime import datetime
+    from uuid import uuid4
+    from fastapi.testclient import TestClient
+    import app.main as main
+    from app.database import get_db
+    from app.utils.security import get_current_user, Principal
+
+    db = mock_db()
+
+    async def get_test_db():
+        yield db
+
+    main.app.dependency_overrides[get_current_user] = lambda: Principal(
+        uuid4(), "test@example.com", "테스트", True, datetime.utcnow(),
+    )
+    main.app.dependency_overrides[get_db] = get_test_db
+    client = TestClient(main.app)
+    client.db = db
+    try:
+        yield client
+    finally:
+        main.app.dependency_overrides.clear()
@@ -0,0 +1,120 @@
+"""접근 권한과 캐시 테스트."""
+import pytest
+
+
+class TestTTLCache:
+    """프로세스 내 TTL 캐시 테스트."""
+
+    def _cache(self, maxsize=3, ttl=10):
+        from app.utils.cache import TTLCache
+        self.now = 0.0
+        return TTLCache(maxsize=maxsize, ttl=ttl, clock=lambda: self.now)
+
+    def test_get_set(self):
+        cache = self._cache()
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+    def test_entry_expires(self):
+        cache = self._cache(ttl=10)
+        cache.set("a", 1)
+        self.now = 10.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_cannot_exceed_default(self):
+        cache = self._cache(ttl=10)
+        cache.set("a", 1, ttl=100)
+        self.now = 11.0
+        assert "a" not in cache
+
+    def test_lru_eviction(self):
+        cache = self._cache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+
+
+class TestAccessService:
+    """회사 접근 권한 캐시 테스트."""
+
+    def setup_method(self):
+        from app.services.access_service import clear_member_role_cache
+        clear_member_role_cache()
+
+    def test_role_is_memoized_per_request_and_process(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from app.models.company import MemberRole
+        from app.services.access_service import get_member_role
+
+        user_id, company_id = uuid4(), uuid4()
+        db = mock_db(scalar_one_or_none=MemberRole.ADMIN)
+        assert asyncio.run(get_member_role(db, user_id, company_id)) == MemberRole.ADMIN
+        assert asyncio.run(get_member_role(db, user_id, company_id)) == MemberRole.ADMIN
+        assert db.execute.await_count == 1
+
+        # 새 요청(세션)도 프로세스 캐시를 사용
+        other = mock_db(scalar_one_or_none=MemberRole.ADMIN)
+        asyncio.run(get_member_role(other, user_id, company_id))
+        assert other.execute.await_count == 0
+
+    def test_non_member_is_forbidden(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from fastapi import HTTPException
+        from app.services.access_service import require_member
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(require_member(mock_db(scalar_one_or_none=None), uuid4(), uuid4()))
+        assert exc.value.status_code == 403
+
+    def test_invalidate_forces_reload(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from app.models.company import MemberRole
+        from app.services.access_service import get_member_role, invalidate_member_role
+
+        user_id, company_id = uuid4(), uuid4()
+        db = mock_db(scalar_one_or_none=None)
+        assert asyncio.run(get_member_role(db, user_id, company_id)) is None
+
+        db.execute.return_value.scalar_one_or_none.return_value = MemberRole.MEMBER
+        invalidate_member_role(user_id, company_id, db)
+        assert asyncio.run(get_member_role(db, user_id, company_id)) == MemberRole.MEMBER
+
+    def test_process_cache_is_invalidated_after_commit(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from sqlalchemy.orm import Session
+        from app.models.company import MemberRole
+        from app.services.access_service import get_member_role, invalidate_member_role
+
+        user_id, company_id = uuid4(), uuid4()
+        asyncio.run(get_member_role(mock_db(scalar_one_or_none=MemberRole.MEMBER), user_id, company_id))
+
+        # 실제 세션으로 커밋/롤백 이벤트를 확인 (연결 없이 트랜잭션만 시작/종료)
+        session = Session()
+        writer = mock_db(scalar_one_or_none=MemberRole.ADMIN)
+        writer.info = session.info
+        invalidate_member_role(user_id, company_id, writer)
+
+        # 커밋 전: 다른 요청은 커밋된 이전 역할을 보고, 변경한 세션은 캐시를 건너뜀
+        other = mock_db(scalar_one_or_none=MemberRole.MEMBER)
+        assert asyncio.run(get_member_role(other, user_id, company_id)) == MemberRole.MEMBER
+        assert other.execute.await_count == 0
+        assert asyncio.run(get_member_role(writer, user_id, company_id)) == MemberRole.ADMIN
+
+        session.rollback()
+        fresh = mock_db(scalar_one_or_none=MemberRole.ADMIN)
+        assert asyncio.run(get_member_role(fresh, user_id, company_id)) == MemberRole.MEMBER
+
+        invalidate_member_role(user_id, company_id, writer)
+        session.commit()
+        reader = mock_db(scalar_one_or_none=MemberRole.ADMIN)
+        assert asyncio.run(get_member_role(reader, user_id, company_id)) == MemberRole.ADMIN
+        assert reader.execute.await_count == 1
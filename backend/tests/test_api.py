@@ -115,3 +115,168 @@ class TestCompanySchema:
         from app.schemas.user import CompanyCreate
         company = CompanyCreate(name="테스트 회사")
         assert company.business_number is None
+
+
+class TestExcelExportEndpoint:
+    """Excel 내보내기 엔드포인트의 캐시 응답(ETag/Range)과 스트리밍 테스트."""
+
+    def _cached(self, data, etag):
+        import io
+        return AsyncMock(side_effect=lambda *args: (io.BytesIO(data), len(data), etag))
+
+    def test_cache_hit_supports_etag_and_range(self, api_client):
+        from app.api import reminders
+
+        data, etag = b"0123456789", '"3-abc"'
+        url = f"/api/reminders/export/excel?company_id={uuid4()}&year=2026"
+        with patch.object(reminders, "open_cached_export", self._cached(data, etag)):
+            full = api_client.get(url)
+            not_modified = api_client.get(url, headers={"If-None-Match": etag})
+            partial = api_client.get(url, headers={"Range": "bytes=2-5"})
+            stale_range = api_client.get(url, headers={"Range": "bytes=2-5", "If-Range": '"2-old"'})
+            unsatisfiable = api_client.get(url, headers={"Range": "bytes=10-"})
+
+        assert full.status_code == 200
+        assert full.content == data
+        assert full.headers["etag"] == etag
+        assert full.headers["accept-ranges"] == "bytes"
+        assert full.headers["content-disposition"] == "attachment; filename=reminders_2026.xlsx"
+
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+        assert partial.status_code == 206
+        assert partial.content == b"2345"
+        assert partial.headers["content-range"] == "bytes 2-5/10"
+
+        # If-Range가 현재 ETag와 다르면 전체 파일을 보냅니다
+        assert stale_range.status_code == 200
+        assert stale_range.content == data
+
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["content-range"] == "bytes */10"
+
+    def test_cache_miss_is_streamed(self, api_client):
+        from app.api import reminders
+
+        async def stream():
+            yield b"PK"
+            yield b"\x03\x04"
+
+        with patch.object(reminders, "open_cached_export", AsyncMock(return_value=stream())):
+            response = api_client.get(f"/api/reminders/export/excel?company_id={uuid4()}")
+
+        assert response.status_code == 200
+        assert response.content == b"PK\x03\x04"
+        assert "etag" not in response.headers
+        assert response.headers["content-disposition"] == "attachment; filename=reminders_all.xlsx"
+
+
+class TestExcelImportEndpoint:
+    """Excel 가져오기 엔드포인트 테스트."""
+
+    def _workbook(self, rows):
+        import io
+        from openpyxl import Workbook
+
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["번호", "제목", "카테고리", "마감일"])
+        for row in rows:
+            ws.append(row)
+        buf = io.BytesIO()
+        wb.save(buf)
+        return buf.getvalue()
+
+    def test_row_errors_are_reported_with_imported_rows(self, api_client):
+        from app.api import reminders
+        from app.services import excel_service
+
+        body = self._workbook([
+            [1, "급여 지급", "급여", "2030-01-25"],
+            [2, "날짜 오류", "급여", "2030/13/01"],
+            [3, "가" * 201, "급여", "2030-01-25"],
+            [4, "", "급여", "2030-01-25"],
+        ])
+        api_client.db.execute.return_value.all.return_value = []
+        broadcast = AsyncMock()
+        with patch.object(excel_service, "require_member", AsyncMock()), \
+                patch.object(excel_service, "index_reminders", AsyncMock()), \
+                patch.object(excel_service, "track_reminders"), \
+                patch.object(reminders.manager, "broadcast_to_company", broadcast):
+            response = api_client.post(
+                f"/api/reminders/import/excel?company_id={uuid4()}",
+                files={"file": ("reminders.xlsx", body)},
+            )
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["imported_count"] == 1
+        assert result["imported"] == [{"title": "급여 지급", "category": "급여", "deadline": "2030-01-25"}]
+        assert [e["row"] for e in result["errors"]] == [3, 4, 5]
+        assert result["errors"][1] == {"row": 4, "error": "제목 길이가 최대 200자를 넘습니다"}
+        assert result["errors"][2] == {"row": 5, "error": "필수 필드 누락 (제목, 카테고리, 마감일)"}
+        broadcast.assert_awaited_once()
+
+    def test_oversized_upload_is_rejected_before_import(self, api_client):
+        from app.api import reminders
+        from app.config import settings
+
+        importer = AsyncMock()
+        body = b"x" * (settings.EXCEL_IMPORT_MAX_BYTES + 128 * 1024)
+        with patch.object(reminders, "import_reminders_from_excel", importer):
+            response = api_client.post(
+                f"/api/reminders/import/excel?company_id={uuid4()}",
+                files={"file": ("reminders.xlsx", body)},
+            )
+
+        assert response.status_code == 413
+        importer.assert_not_awaited()
+
+
+class TestWebSocketEndpoints:
+    """WebSocket 엔드포인트 테스트."""
+
+    def _manager(self):
+        from app.utils.websocket import ConnectionManager
+        return ConnectionManager(coalesce_window=0, ping_interval=0)
+
+    def test_missing_token_is_rejected(self):
+        from fastapi.testclient import TestClient
+        from starlette.websockets import WebSocketDisconnect
+        import app.main as main
+
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with TestClient(main.app).websocket_connect("/ws") as ws:
+                ws.receive_json()
+        assert exc.value.code == 4001
+
+    def test_multiplexed_subscribe_and_invalid_frames(self):
+        from fastapi.testclient import TestClient
+        import app.main as main
+        from app.utils.security import create_access_token
+
+        member, outsider = uuid4(), uuid4()
+        manager = self._manager()
+        is_member = AsyncMock(side_effect=lambda user_id, company_id: company_id == member)
+        token = create_access_token(uuid4())
+        with patch.object(main, "manager", manager), patch.object(main, "_is_member", is_member):
+            with TestClient(main.app).websocket_connect(f"/ws?token={token}") as ws:
+                ws.send_json({"type": "subscribe", "company_id": str(member)})
+                assert ws.receive_json() == {"type": "subscribed", "company_id": str(member)}
+
+                ws.send_json({"type": "subscribe", "company_id": str(outsider)})
+                assert ws.receive_json() == {
+                    "type": "error", "detail": "You don't have access to this company", "company_id": str(outsider),
+                }
+
+                # 잘못된 프레임은 오류로 알리고 연결은 유지합니다
+                for raw in ("not json", "[" * 6000, "x" * (17 * 1024)):
+                    ws.send_text(raw)
+                    assert ws.receive_json()["type"] == "error"
+
+                ws.send_json({"type": "unsubscribe", "company_id": str(member)})
+                assert ws.receive_json() == {"type": "unsubscribed", "company_id": str(member)}
+
+        assert manager.stats()["dropped"] == {"invalid": 2, "too_large": 1}
+        assert manager.active_connections_count == 0
@@ -0,0 +1,116 @@
+"""CSV/NDJSON 데이터 교환 테스트."""
+from datetime import date
+
+
+class TestDataExchange:
+    """CSV/NDJSON 가져오기/내보내기 테스트."""
+
+    def test_encode_rows(self):
+        from uuid import uuid4
+        from app.services.data_service import _encode_rows
+
+        row = (uuid4(), "원천세, 신고", "원천세", date(2030, 1, 10), None, False, 2, None)
+        csv_bytes = _encode_rows("csv", [row], header=True).decode("utf-8")
+        assert csv_bytes.splitlines()[0].startswith("id,title,category,deadline")
+        assert '"원천세, 신고"' in csv_bytes
+
+        import json
+        record = json.loads(_encode_rows("ndjson", [row], header=True))
+        assert record["deadline"] == "2030-01-10"
+        assert record["description"] is None
+
+    def test_accepts_gzip_respects_q_values(self):
+        from app.services.data_service import accepts_gzip
+
+        assert accepts_gzip("gzip, deflate, br")
+        assert accepts_gzip("br;q=1.0, GZIP;q=0.5")
+        assert accepts_gzip("*")
+        assert not accepts_gzip(None)
+        assert not accepts_gzip("identity")
+        assert not accepts_gzip("gzip;q=0")
+        assert not accepts_gzip("gzip;q=0.000, *")
+        assert not accepts_gzip("*;q=0")
+        assert not accepts_gzip("gzip;q=abc")
+
+    def test_export_varies_on_accept_encoding(self, api_client):
+        import gzip
+        from unittest.mock import AsyncMock, patch
+        from uuid import uuid4
+        from app.api import reminders
+
+        async def stream(compress):
+            yield gzip.compress(b"id\n") if compress else b"id\n"
+
+        async def export(*args, compress):
+            return stream(compress)
+
+        with patch.object(reminders, "export_reminders", AsyncMock(side_effect=export)):
+            url = f"/api/reminders/export?company_id={uuid4()}"
+            refused = api_client.get(url, headers={"Accept-Encoding": "gzip;q=0"})
+            accepted = api_client.get(url, headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in refused.headers
+        assert accepted.headers["content-encoding"] == "gzip"
+        for response in (refused, accepted):
+            assert "Accept-Encoding" in response.headers["vary"].split(", ")
+            assert response.content == b"id\n"
+
+    def test_reader_accepts_gzip_and_reports_row_errors(self):
+        import gzip
+        import io
+        from app.services.data_service import _RecordReader
+
+        body = "title,category,deadline,description\n급여 지급,급여,2030-01-25,\n,급여,2030-01-25,\n".encode("utf-8")
+        reader = _RecordReader(io.BytesIO(gzip.compress(body)), "csv")
+        parsed, errors, seen = reader.read(100)
+        assert seen == 2
+        assert parsed[0]["title"] == "급여 지급"
+        assert parsed[0]["description"] is None
+        assert len(parsed[0]["fingerprint"]) == 64
+        assert errors == [{"row": 3, "error": "필수 필드 누락 (title, category, deadline)"}]
+        assert reader.read(100) == ([], [], 0)
+
+    def test_overlong_fields_are_row_errors(self):
+        import io
+        from app.services.data_service import _RecordReader
+
+        body = "title,category,deadline\n{},급여,2030-01-25\n급여 지급,급여,2030-01-25\n".format("가" * 201)
+        parsed, errors, seen = _RecordReader(io.BytesIO(body.encode("utf-8")), "csv").read(100)
+        assert (seen, [r["title"] for r in parsed]) == (2, ["급여 지급"])
+        assert errors == [{"row": 2, "error": "제목 길이가 최대 200자를 넘습니다"}]
+
+    def test_postgres_import_loads_through_copy(self, mock_db):
+        import asyncio
+        import io
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from uuid import uuid4
+        from starlette.datastructures import UploadFile
+        from app.services import data_service
+
+        driver = MagicMock()
+        driver.copy_records_to_table = AsyncMock()
+        raw = MagicMock(driver_connection=driver)
+        connection = MagicMock()
+        connection.get_raw_connection = AsyncMock(return_value=raw)
+        db = mock_db(all=[])
+        db.bind.dialect.name = "postgresql"
+        db.connection = AsyncMock(return_value=connection)
+
+        body = (
+            b'{"title": "a", "category": "b", "deadline": "2030-01-01", "description": "old"}\n'
+            b'{"title": "a", "category": "b", "deadline": "2030-01-01", "description": "new"}\n'
+        )
+        with patch.object(data_service, "require_member", AsyncMock()):
+            report = asyncio.run(
+                data_service.import_reminders(db, uuid4(), uuid4(), "ndjson", UploadFile(io.BytesIO(body), size=len(body)))
+            )
+
+        records = driver.copy_records_to_table.await_args.kwargs["records"]
+        assert [r[1:4] for r in records] == [("a", "b", date(2030, 1, 1))] * 2
+        assert [(r[4], r[6]) for r in records] == [("old", 0), ("new", 1)]
+        statements = [str(call.args[0]) for call in db.execute.await_args_list]
+        assert [sql.split()[0] for sql in statements] == ["CREATE", "TRUNCATE", "UPDATE", "INSERT"]
+        # 같은 지문이 반복되면 batch INSERT 경로와 같이 마지막 행을 씁니다
+        assert "ORDER BY fingerprint, line_no DESC" in statements[2]
+        assert "ORDER BY s.fingerprint, s.line_no DESC" in statements[3]
+        assert report["skipped_count"] == 2
@@ -0,0 +1,517 @@
+"""Excel 내보내기/가져오기와 내보내기 캐시 테스트."""
+import pytest
+from datetime import date
+
+
+class TestExcelExportStreaming:
+    """Excel 스트리밍 내보내기 테스트."""
+
+    def test_writer_output_is_streamed_in_chunks(self):
+        import asyncio
+        from app.utils.executor import BoundedExecutor
+        from app.utils.streaming import stream_writer_output
+
+        executor = BoundedExecutor("test_stream", max_workers=1, max_pending=0)
+
+        def write(f):
+            for _ in range(10):
+                f.write(b"x" * 1000)
+
+        async def collect():
+            return [chunk async for chunk in stream_writer_output(write, executor, chunk_size=4000)]
+
+        chunks = asyncio.run(collect())
+        assert b"".join(chunks) == b"x" * 10000
+        assert len(chunks) == 3
+        # writer는 넘겨받은 풀에서 실행됩니다
+        assert executor.stats()["completed"] == 1
+        executor.shutdown()
+
+    def test_busy_executor_fails_stream(self):
+        import asyncio
+        from app.utils.executor import BoundedExecutor, ExecutorBusyError
+        from app.utils.streaming import stream_writer_output
+
+        executor = BoundedExecutor("test_stream_busy", max_workers=1, max_pending=0)
+        executor._outstanding = 1
+
+        async def collect():
+            return [chunk async for chunk in stream_writer_output(lambda f: f.write(b"x"), executor)]
+
+        with pytest.raises(ExecutorBusyError):
+            asyncio.run(collect())
+
+    def test_closing_stream_stops_writer(self):
+        import asyncio
+        from app.utils.executor import BoundedExecutor
+        from app.utils.streaming import stream_writer_output
+
+        executor = BoundedExecutor("test_stream", max_workers=1, max_pending=0)
+        written = []
+
+        def write(f):
+            for _ in range(1000):
+                f.write(b"x" * 100)
+                written.append(1)
+
+        async def read_one():
+            stream = stream_writer_output(write, executor, chunk_size=100, max_chunks=1)
+            async for _ in stream:
+                break
+            await stream.aclose()
+
+        asyncio.run(read_one())
+        assert len(written) < 1000
+        executor.shutdown()
+
+    def test_write_only_workbook_uses_named_styles(self):
+        import asyncio
+        import io
+        from openpyxl import Workbook, load_workbook
+        from app.services.excel_service import (
+            _register_styles, _header_row, _styled_row, _add_summary_sheet,
+            EXPORT_HEADERS, EXPORT_COLUMN_WIDTHS, excel_executor,
+        )
+        from app.utils.streaming import stream_writer_output
+
+        wb = Workbook(write_only=True)
+        _register_styles(wb)
+        ws = wb.create_sheet("일정 목록")
+        ws.append(_header_row(ws, EXPORT_HEADERS, EXPORT_COLUMN_WIDTHS))
+        ws.append(_styled_row(ws, [1, "원천세 신고", "원천세", "2025-01-10", "", "완료", "보통", ""], "_completed"))
+        _add_summary_sheet(wb, [("원천세", 2, 1)])
+
+        async def collect():
+            return b"".join([chunk async for chunk in stream_writer_output(wb.save, excel_executor)])
+
+        loaded = load_workbook(io.BytesIO(asyncio.run(collect())))
+        sheet = loaded["일정 목록"]
+        assert sheet["A1"].style == "header"
+        assert sheet["A2"].style == "data_center_completed"
+        assert sheet["B2"].style == "data_completed"
+        assert list(loaded["요약"].iter_rows(min_row=4, values_only=True)) == [("원천세", 2, 1, 1, "50.0%")]
+
+
+class TestExcelJobs:
+    """Excel 작업(job) 테스트."""
+
+    def test_download_requires_finished_export(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from fastapi import HTTPException
+        from app.models.excel_job import ExcelJob
+        from app.services.excel_jobs import get_job_file
+
+        cases = [
+            ({"kind": "export", "status": "running"}, 409),
+            ({"kind": "import", "status": "done"}, 400),
+            ({"kind": "export", "status": "done", "file_path": "/nonexistent/x.xlsx"}, 410),
+        ]
+        for fields, expected in cases:
+            db = mock_db(scalar_one_or_none=ExcelJob(**fields))
+            with pytest.raises(HTTPException) as exc:
+                asyncio.run(get_job_file(db, uuid4(), uuid4()))
+            assert exc.value.status_code == expected
+
+    def test_failed_work_marks_job_failed(self):
+        import asyncio
+        from unittest.mock import AsyncMock, patch
+        from uuid import uuid4
+        from fastapi import HTTPException
+        from app.services import excel_jobs
+
+        async def work():
+            raise HTTPException(status_code=503, detail="busy")
+
+        update = AsyncMock()
+        with patch.object(excel_jobs, "_update_job", update):
+            asyncio.run(excel_jobs._run_job(uuid4(), work))
+
+        statuses = [call.kwargs["status"] for call in update.await_args_list]
+        assert statuses == ["running", "failed"]
+        assert update.await_args_list[-1].kwargs["error"] == "busy"
+
+    def test_cancelled_job_is_marked_failed(self):
+        import asyncio
+        from unittest.mock import AsyncMock, patch
+        from uuid import uuid4
+        from app.services import excel_jobs
+
+        job_id = uuid4()
+
+        async def work():
+            await asyncio.Event().wait()
+
+        async def run():
+            task = asyncio.create_task(excel_jobs._run_job(job_id, work))
+            await asyncio.sleep(0.01)
+            assert job_id in excel_jobs._active
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        update = AsyncMock()
+        with patch.object(excel_jobs, "_update_job", update):
+            asyncio.run(run())
+
+        assert [call.kwargs["status"] for call in update.await_args_list] == ["running", "failed"]
+        assert job_id not in excel_jobs._active
+
+    def test_orphaned_jobs_are_failed_after_missed_heartbeats(self, mock_db):
+        import asyncio
+        from datetime import datetime, timedelta
+        from unittest.mock import patch
+        from app.config import settings
+        from app.services import excel_jobs
+
+        db = mock_db()
+        with patch.object(settings, "EXCEL_JOB_HEARTBEAT_SECONDS", 10.0):
+            asyncio.run(excel_jobs._fail_orphaned(db))
+
+        stmt = db.execute.await_args.args[0]
+        params = stmt.compile().params
+        assert params["status"] == "failed"
+        assert set(params["status_1"]) == {"queued", "running"}
+        # 갱신 주기의 3배 동안 updated_at이 바뀌지 않은 작업만 대상입니다
+        assert datetime.utcnow() - params["updated_at_1"] >= timedelta(seconds=30)
+        assert datetime.utcnow() - params["updated_at_1"] < timedelta(seconds=31)
+
+
+class TestExcelImportStreaming:
+    """Excel 스트리밍 가져오기 테스트."""
+
+    def _workbook(self, rows):
+        import io
+        from openpyxl import Workbook
+
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["번호", "제목", "카테고리", "마감일"])
+        for row in rows:
+            ws.append(row)
+        buf = io.BytesIO()
+        wb.save(buf)
+        buf.seek(0)
+        return buf
+
+    def test_rows_are_inserted_in_batches(self, mock_db):
+        import asyncio
+        from unittest.mock import AsyncMock, patch
+        from uuid import uuid4
+        from app.services import excel_service
+
+        rows = [[i, f"일정 {i}", "급여", "2030-01-05"] for i in range(1, 6)]
+        rows.append([6, "날짜 오류", "급여", "2030/13/01"])
+        db = mock_db(all=[])
+        reports = []
+
+        async def progress(report):
+            reports.append((report["processed"], report["imported_count"], len(report["errors"])))
+
+        with patch.object(excel_service.settings, "EXCEL_IMPORT_BATCH_SIZE", 2), \
+                patch.object(excel_service, "index_reminders", AsyncMock()) as index, \
+                patch.object(excel_service, "track_reminders"):
+            result = asyncio.run(excel_service._import_rows(db, uuid4(), uuid4(), self._workbook(rows), progress))
+
+        assert result["imported_count"] == 5
+        assert result["errors"][0]["row"] == 7
+        # batch마다 지문 조회 1번 + INSERT 1번 (마지막 batch는 오류 행 제외 1행)
+        statements = [str(call.args[0]) for call in db.execute.await_args_list]
+        assert [stmt.split()[0] for stmt in statements] == ["SELECT", "INSERT"] * 3
+        assert index.await_count == 3
+        assert reports == [(2, 2, 0), (4, 4, 0), (6, 5, 1)]
+
+    def test_overlong_fields_are_row_errors(self):
+        from app.services.excel_service import _WorkbookReader
+
+        reader = _WorkbookReader(self._workbook([
+            [1, "가" * 200, "급여", "2030-01-05"],
+            [2, "가" * 201, "급여", "2030-01-05"],
+            [3, "급여 지급", "급" * 51, "2030-01-05"],
+        ]))
+        parsed, errors, seen = reader.read(10)
+        reader.close()
+
+        assert (seen, len(parsed)) == (3, 1)
+        assert errors == [
+            {"row": 3, "error": "제목 길이가 최대 200자를 넘습니다"},
+            {"row": 4, "error": "카테고리 길이가 최대 50자를 넘습니다"},
+        ]
+
+    def test_upload_body_is_capped_while_spooling(self):
+        from fastapi import FastAPI, File, UploadFile
+        from fastapi.testclient import TestClient
+        from app.utils.body_limit import BodySizeLimitMiddleware
+
+        app = FastAPI()
+        spooled = []
+
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            spooled.append(file.size)
+            return {"size": file.size}
+
+        app.add_middleware(BodySizeLimitMiddleware, max_bytes=1000, path_prefixes=("/upload",))
+        client = TestClient(app)
+
+        assert client.post("/upload", files={"file": ("a.xlsx", b"x" * 100)}).status_code == 200
+        # Content-Length가 있으면 본문을 읽기 전에 거절
+        assert client.post("/upload", files={"file": ("a.xlsx", b"x" * 2000)}).status_code == 413
+
+        # 길이를 모르는(chunked) 본문은 읽는 도중 한도를 넘으면 거절
+        def chunks():
+            yield b"--abc\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.xlsx\"\r\n\r\n"
+            for _ in range(10):
+                yield b"x" * 500
+            yield b"\r\n--abc--\r\n"
+
+        response = client.post(
+            "/upload", content=chunks(), headers={"content-type": "multipart/form-data; boundary=abc"},
+        )
+        assert response.status_code == 413
+        assert spooled == [100]
+
+    def test_upload_size_cap(self):
+        import io
+        from fastapi import HTTPException
+        from starlette.datastructures import UploadFile
+        from unittest.mock import patch
+        from app.services import excel_service
+
+        upload = UploadFile(io.BytesIO(b"x" * 100))
+        with patch.object(excel_service.settings, "EXCEL_IMPORT_MAX_BYTES", 50):
+            with pytest.raises(HTTPException) as exc:
+                excel_service.check_upload_size(upload)
+        assert exc.value.status_code == 413
+        assert upload.file.tell() == 0
+
+    def test_fingerprint_matches_skip_or_update(self, mock_db):
+        import asyncio
+        from datetime import date as date_
+        from unittest.mock import AsyncMock, patch
+        from uuid import uuid4
+        from app.models.reminder import reminder_fingerprint
+        from app.services import excel_service
+
+        deadline = date_(2030, 1, 5)
+        same_id, changed_id = uuid4(), uuid4()
+        db = mock_db(all=[
+            (reminder_fingerprint("같음", "급여", deadline), same_id, "설명"),
+            (reminder_fingerprint("수정", "급여", deadline), changed_id, "예전 설명"),
+        ])
+        rows = [
+            {"title": "같음", "category": "급여", "deadline": deadline, "description": "설명"},
+            {"title": "수정", "category": "급여", "deadline": deadline, "description": "새 설명"},
+            {"title": "새 일정", "category": "급여", "deadline": deadline, "description": None},
+            {"title": "새 일정", "category": "급여", "deadline": deadline, "description": None},
+        ]
+
+        with patch.object(excel_service, "index_reminders", AsyncMock()), \
+                patch.object(excel_service, "track_reminders"):
+            inserted, updated, skipped = asyncio.run(excel_service.write_import_batch(db, uuid4(), uuid4(), rows))
+
+        assert [r["title"] for r in inserted] == ["새 일정"]
+        assert (updated, skipped) == (1, 2)
+        update_params = db.execute.await_args_list[-2].args[1]
+        assert update_params == [{"reminder_id": changed_id, "new_description": "새 설명"}]
+        # 설명만 바뀌어도 내보내기 캐시 키인 데이터 버전을 올립니다
+        assert str(db.execute.await_args_list[-1].args[0]).startswith("UPDATE companies SET data_version")
+
+
+class TestExportCache:
+    """Excel 내보내기 캐시와 Range 응답 테스트."""
+
+    def test_parse_range(self):
+        from app.utils.file_response import parse_range, RangeNotSatisfiable
+
+        assert parse_range("bytes=10-19", 100) == (10, 19)
+        assert parse_range("bytes=90-", 100) == (90, 99)
+        assert parse_range("bytes=-5", 100) == (95, 99)
+        assert parse_range("bytes=50-500", 100) == (50, 99)
+        # 지원하지 않는 형식은 전체 응답
+        assert parse_range("bytes=0-1,5-6", 100) is None
+        assert parse_range("items=0-1", 100) is None
+        assert parse_range("bytes=9-3", 100) is None
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=100-", 100)
+
+    @staticmethod
+    async def _chunks(*chunks):
+        import asyncio
+
+        for chunk in chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+    def test_streams_miss_into_cache_then_serves_file(self, tmp_path):
+        import asyncio
+        from uuid import uuid4
+        from app.services.export_cache import ExportCache
+
+        cache = ExportCache(str(tmp_path), max_bytes=10_000)
+        company_id = uuid4()
+
+        async def run():
+            assert await cache.open(company_id, 2030, None, 1) is None
+            stream = cache.tee(company_id, 2030, None, 1, self._chunks(b"work", b"book"))
+            first = await stream.__anext__()
+            # 스트리밍 중인 같은 키 요청은 설치될 때까지 기다렸다가 파일을 엽니다
+            waiter = asyncio.ensure_future(cache.open(company_id, 2030, None, 1))
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+            rest = [chunk async for chunk in stream]
+            opened = await waiter
+            again = await cache.open(company_id, 2030, None, 1)
+            for fileobj, _, _ in (opened, again):
+                body = fileobj.read()
+                fileobj.close()
+            return b"".join([first, *rest]), opened, again, body
+
+        streamed, opened, again, body = asyncio.run(run())
+        assert streamed == body == b"workbook"
+        assert opened[2] == again[2]
+        assert again[1] == len(b"workbook")
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_aborted_stream_is_not_cached(self, tmp_path):
+        import asyncio
+        from uuid import uuid4
+        from app.services.export_cache import ExportCache
+
+        cache = ExportCache(str(tmp_path), max_bytes=10_000)
+        company_id = uuid4()
+
+        async def run():
+            stream = cache.tee(company_id, 2030, None, 1, self._chunks(b"work", b"book"))
+            await stream.__anext__()
+            # 클라이언트 연결 끊김
+            await stream.aclose()
+            return await cache.open(company_id, 2030, None, 1)
+
+        assert asyncio.run(run()) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_new_version_supersedes_and_size_is_bounded(self, tmp_path):
+        import asyncio
+        from uuid import uuid4
+        from app.services.export_cache import ExportCache
+
+        cache = ExportCache(str(tmp_path), max_bytes=250)
+
+        async def run(company_id, year, version):
+            async for _ in cache.tee(company_id, year, None, version, self._chunks(b"x" * 100)):
+                pass
+            fileobj, _, etag = await cache.open(company_id, year, None, version)
+            fileobj.close()
+            return etag
+
+        company_id = uuid4()
+        first = asyncio.run(run(company_id, 2030, 1))
+        second = asyncio.run(run(company_id, 2030, 2))
+        assert first != second
+        assert len(list(tmp_path.iterdir())) == 1
+
+        # 크기 제한(250바이트)을 넘으면 가장 오래 사용되지 않은 파일부터 제거
+        asyncio.run(run(company_id, 2031, 1))
+        asyncio.run(run(uuid4(), 2030, 1))
+        assert len(list(tmp_path.iterdir())) == 2
+        assert not cache._paths(company_id, 2030, None, 2)[1].exists()
+
+
+class TestPortfolioExport:
+    """여러 회사 포트폴리오 내보내기 테스트."""
+
+    def test_sheet_titles_follow_excel_rules(self):
+        from app.services.excel_service import _sheet_title
+
+        used = {"요약"}
+        assert _sheet_title("가나/세무:회계", used) == "가나_세무_회계"
+        assert _sheet_title("가나?세무*회계", used) == "가나_세무_회계 (2)"
+        assert _sheet_title("요약", used) == "요약 (2)"
+        assert len(_sheet_title("A" * 40, used)) == 31
+
+    def test_chunks_are_split_per_company_sheet(self, mock_db):
+        import asyncio
+        import io
+        from collections import namedtuple
+        from unittest.mock import AsyncMock
+        from uuid import uuid4
+        from openpyxl import load_workbook
+        from app.services.excel_service import build_portfolio_workbook
+
+        Company = namedtuple("Company", "id name")
+        Row = namedtuple("Row", "company_id title category deadline original_deadline completed priority description")
+        a, b = Company(uuid4(), "가 회사"), Company(uuid4(), "나 회사")
+
+        def rows(company, start, count):
+            return [
+                Row(company.id, f"{company.name} {i}", "급여", date(2030, 1, 1), None, False, 0, None)
+                for i in range(start, start + count)
+            ]
+
+        class Stream:
+            async def partitions(self):
+                # 한 청크에 두 회사가 섞여 있는 경우
+                yield rows(a, 0, 3)
+                yield rows(a, 3, 2) + rows(b, 0, 2)
+                yield rows(b, 2, 1)
+
+        db = mock_db(all=[("가 회사", "급여", 5, 0), ("나 회사", "급여", 3, 0)])
+        db.stream = AsyncMock(return_value=Stream())
+
+        async def build():
+            wb = await build_portfolio_workbook(db, [a, b])
+            buf = io.BytesIO()
+            wb.save(buf)
+            return buf
+
+        loaded = load_workbook(asyncio.run(build()))
+        assert loaded.sheetnames == ["요약", "가 회사", "나 회사"]
+        for company, count in ((a, 5), (b, 3)):
+            sheet_rows = list(loaded[company.name].iter_rows(min_row=2, values_only=True))
+            assert [(r[0], r[1]) for r in sheet_rows] == [(i + 1, f"{company.name} {i}") for i in range(count)]
+        assert list(loaded["요약"].iter_rows(min_row=4, values_only=True)) == [
+            ("가 회사", "급여", 5, 0, 5, "0.0%"),
+            ("나 회사", "급여", 3, 0, 3, "0.0%"),
+        ]
+
+    def test_sheet_writes_do_not_overlap(self, mock_db):
+        import asyncio
+        import io
+        import threading
+        import time
+        from collections import namedtuple
+        from unittest.mock import AsyncMock, patch
+        from uuid import uuid4
+        from app.config import settings
+        from app.services.excel_service import _ReminderSheetWriter, build_portfolio_workbook
+
+        Company = namedtuple("Company", "id name")
+        Row = namedtuple("Row", "company_id title category deadline original_deadline completed priority description")
+        companies = [Company(uuid4(), f"회사 {i}") for i in range(4)]
+
+        class Stream:
+            async def partitions(self):
+                for company in companies:
+                    yield [Row(company.id, "급여", "급여", date(2030, 1, 1), None, False, 0, None)]
+
+        db = mock_db(all=[])
+        db.stream = AsyncMock(return_value=Stream())
+
+        lock, active, peak = threading.Lock(), [0], [0]
+        append_rows = _ReminderSheetWriter.append_rows
+
+        def tracked(writer, rows):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            append_rows(writer, rows)
+            with lock:
+                active[0] -= 1
+
+        # openpyxl 워크북은 스레드 안전하지 않으므로 워커가 여러 개여도 시트를 하나씩 기록합니다
+        with patch.object(settings, "EXCEL_WORKERS", 4), patch.object(_ReminderSheetWriter, "append_rows", tracked):
+            wb = asyncio.run(build_portfolio_workbook(db, companies))
+        wb.save(io.BytesIO())
+        assert peak[0] == 1
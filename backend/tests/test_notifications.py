@@ -0,0 +1,295 @@
+"""알림 요약, 인덱스, 발송, 다이제스트 테스트."""
+import pytest
+from datetime import date
+
+
+class TestNotificationSummary:
+    """단일 쿼리 알림 요약 테스트."""
+
+    def test_summary_buckets_rows(self, mock_db):
+        import asyncio
+        from collections import namedtuple
+        from datetime import timedelta
+        from uuid import uuid4
+        from app.services.notification_service import get_notification_summary
+
+        Row = namedtuple("Row", "id title category deadline priority company_id bucket bucket_rank bucket_count")
+        today = date.today()
+        company_id = uuid4()
+        rows = [
+            Row(uuid4(), "지연", "원천세", today - timedelta(days=2), 0, company_id, "overdue", 1, 40),
+            Row(uuid4(), "오늘", "부가세", today, 3, company_id, "today", 1, 1),
+            Row(uuid4(), "예정", "급여", today + timedelta(days=3), 1, company_id, "upcoming", 1, 2),
+        ]
+        db = mock_db(all=rows)
+
+        summary = asyncio.run(get_notification_summary(db, uuid4()))
+
+        assert db.execute.await_count == 1
+        assert summary["overdue"]["items"][0]["d_day_label"] == "D+2"
+        assert summary["overdue"]["count"] == 40
+        assert summary["today"]["count"] == 1
+        # 7일 이내 목록은 오늘 마감분을 포함
+        assert [i["d_day_label"] for i in summary["upcoming_7days"]["items"]] == ["D-Day", "D-3"]
+        assert summary["upcoming_7days"]["count"] == 3
+        assert summary["total_pending"] == 44
+
+    def test_feed_cursor_round_trip(self):
+        from collections import namedtuple
+        from uuid import uuid4
+        from app.services.notification_service import (
+            _encode_cursor, _decode_cursor, _ORDER_BY_DEADLINE,
+        )
+
+        Row = namedtuple("Row", "id deadline")
+        row = Row(uuid4(), date(2026, 3, 10))
+        assert _decode_cursor(_encode_cursor(row, _ORDER_BY_DEADLINE), _ORDER_BY_DEADLINE) == [
+            row.deadline, row.id,
+        ]
+
+    def test_invalid_cursor_is_rejected(self):
+        from fastapi import HTTPException
+        from app.services.notification_service import _decode_cursor, _ORDER_BY_DEADLINE
+
+        with pytest.raises(HTTPException) as exc:
+            _decode_cursor("not-a-cursor", _ORDER_BY_DEADLINE)
+        assert exc.value.status_code == 400
+
+
+class TestPendingIndex:
+    """사용자별 미완료 리마인더 인덱스 테스트."""
+
+    def test_reindex_deletes_then_inserts_from_select(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from app.services.pending_index import index_reminders
+
+        db = mock_db()
+        asyncio.run(index_reminders(db, [uuid4()]))
+
+        statements = [str(call.args[0]) for call in db.execute.await_args_list]
+        # 회사 데이터 버전을 올리고 영향받는 사용자의 다이제스트를 stale로 표시
+        assert statements[0].startswith("UPDATE companies SET data_version")
+        assert statements[1].startswith("UPDATE notification_digests")
+        assert statements[2].startswith("DELETE FROM user_pending_reminders")
+        assert statements[3].startswith("INSERT INTO user_pending_reminders")
+        assert "JOIN company_members" in statements[3]
+
+    def test_large_batches_are_chunked(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from app.services.pending_index import index_reminders
+
+        db = mock_db()
+        asyncio.run(index_reminders(db, [uuid4() for _ in range(2500)]))
+        assert db.execute.await_count == 12
+
+    def test_empty_batch_is_noop(self, mock_db):
+        import asyncio
+        from app.services.pending_index import index_reminders
+
+        db = mock_db()
+        asyncio.run(index_reminders(db, []))
+        assert db.execute.await_count == 0
+
+
+class TestNotificationDispatch:
+    """알림 발송 파이프라인 테스트."""
+
+    def _digest(self, n=2):
+        from uuid import uuid4
+        from app.services.notification_transports import Alert, Digest
+
+        company_id = uuid4()
+        alerts = [Alert(uuid4(), company_id, f"원천세 신고 {i}", date(2026, 3, 10 + i), "D-3") for i in range(n)]
+        return Digest(uuid4(), "test@example.com", "테스트", alerts)
+
+    def test_digest_groups_alerts(self):
+        digest = self._digest(3)
+        assert "3건" in digest.subject
+        assert digest.render_text().count("[D-3]") == 3
+
+    def test_file_transport_writes_json_lines(self, tmp_path):
+        import asyncio
+        import json
+        from app.services.notification_transports import FileTransport
+
+        path = tmp_path / "out.jsonl"
+        asyncio.run(FileTransport(str(path)).send_batch([self._digest(), self._digest()]))
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert len(json.loads(lines[0])["reminder_ids"]) == 2
+
+    def test_failed_batch_is_retried(self):
+        import asyncio
+        from app.services.notification_dispatch import NotificationDispatcher
+        from app.services.notification_transports import Transport
+
+        class FlakyTransport(Transport):
+            channel = "file"
+
+            def __init__(self):
+                self.calls = 0
+
+            async def send_batch(self, digests):
+                self.calls += 1
+                if self.calls == 1:
+                    raise ConnectionError("temporary failure")
+                return []
+
+        transport = FlakyTransport()
+        dispatcher = NotificationDispatcher(transport=transport, batch_size=10, retry_base_seconds=0)
+        failed = asyncio.run(dispatcher._deliver([self._digest(), self._digest()]))
+
+        assert failed == []
+        assert transport.calls == 2
+        assert dispatcher.stats()["sent"] == 2
+
+    def test_exhausted_retries_return_failed_digests(self):
+        import asyncio
+        from app.services.notification_dispatch import NotificationDispatcher
+        from app.services.notification_transports import Transport
+
+        class DownTransport(Transport):
+            channel = "file"
+
+            async def send_batch(self, digests):
+                raise ConnectionError("down")
+
+        dispatcher = NotificationDispatcher(transport=DownTransport(), max_retries=1, retry_base_seconds=0)
+        digests = [self._digest()]
+        assert asyncio.run(dispatcher._deliver(digests)) == digests
+
+    def test_partial_failure_resends_and_releases_only_undelivered(self, session_factory):
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from app.services.notification_dispatch import NotificationDispatcher
+        from app.services.notification_transports import Transport
+
+        delivered, flaky, bad = self._digest(), self._digest(), self._digest()
+
+        class PartialTransport(Transport):
+            channel = "file"
+
+            def __init__(self):
+                self.batches = []
+
+            async def send_batch(self, digests):
+                self.batches.append(list(digests))
+                # flaky는 첫 시도에만, bad는 항상 실패
+                return [d for d in digests if d is bad or (d is flaky and len(self.batches) == 1)]
+
+        transport = PartialTransport()
+        dispatcher = NotificationDispatcher(
+            transport=transport, max_retries=1, retry_base_seconds=0, requeue_delay_seconds=0,
+        )
+        dispatcher._session_factory = session_factory(MagicMock(commit=AsyncMock()))
+        release = AsyncMock()
+
+        async def run():
+            dispatcher._queue = asyncio.Queue()
+            await dispatcher.process([])
+            await asyncio.sleep(0.01)
+            return [dispatcher._queue.get_nowait() for _ in range(dispatcher._queue.qsize())]
+
+        digests = [delivered, flaky, bad]
+        with patch.multiple(
+            dispatcher,
+            _build_digests=AsyncMock(return_value=digests),
+            _claim=AsyncMock(return_value=digests),
+            _release=release,
+        ):
+            requeued = asyncio.run(run())
+
+        # 이미 전달된 다이제스트는 다시 보내지 않습니다
+        assert transport.batches == [[delivered, flaky, bad], [flaky, bad]]
+        assert dispatcher.stats()["sent"] == 2
+        # 원장은 전달하지 못한 다이제스트만 되돌리고, 그 알림은 큐에 다시 넣습니다
+        assert release.await_args.args[1] == [bad]
+        assert sorted(a.reminder_id for a in requeued) == sorted(a.reminder_id for a in bad.alerts)
+
+    def test_requeue_gives_up_after_limit(self):
+        from app.services.notification_dispatch import NotificationDispatcher
+
+        dispatcher = NotificationDispatcher(max_requeues=1)
+        digest = self._digest(1)
+        dispatcher._requeue([digest], [digest])
+        dispatcher._requeue([digest], [digest])
+        assert dispatcher.stats()["abandoned"] == 1
+        assert dispatcher._requeues == {}
+
+
+class TestDailyDigest:
+    """일일 알림 다이제스트 테스트."""
+
+    def test_fresh_digest_is_served_as_stored(self, mock_db):
+        import asyncio
+        from collections import namedtuple
+        from unittest.mock import patch
+        from uuid import uuid4
+        from app.services import digest_service
+
+        Row = namedtuple("Row", "digest_date payload stale version")
+        db = mock_db(first=Row(date.today(), '{"total_pending":3}', False, 0))
+
+        with patch.object(digest_service, "get_notification_summary") as live:
+            payload = asyncio.run(digest_service.get_daily_summary(db, uuid4()))
+
+        assert payload == '{"total_pending":3}'
+        live.assert_not_called()
+        assert db.execute.await_count == 1
+
+    def test_stale_or_old_digest_is_recomputed(self, mock_db):
+        import asyncio
+        import json
+        from collections import namedtuple
+        from datetime import timedelta
+        from unittest.mock import AsyncMock, patch
+        from uuid import uuid4
+        from app.services import digest_service
+
+        Row = namedtuple("Row", "digest_date payload stale version")
+        rows = [
+            Row(date.today(), "{}", True, 2),
+            Row(date.today() - timedelta(days=1), "{}", False, 0),
+            None,
+        ]
+        for row in rows:
+            db = mock_db(first=row)
+            live = AsyncMock(return_value={"total_pending": 7})
+            with patch.object(digest_service, "get_notification_summary", live):
+                payload = asyncio.run(digest_service.get_daily_summary(db, uuid4()))
+
+            assert json.loads(payload) == {"total_pending": 7}
+            # 조회 1회 + 저장(upsert) 1회
+            assert db.execute.await_count == 2
+
+    def test_nightly_build_does_not_overwrite_newer_stale_marks(self, mock_db):
+        import asyncio
+        from unittest.mock import MagicMock
+        from uuid import uuid4
+        from sqlalchemy.dialects import postgresql
+        from app.services.digest_service import build_digests
+
+        marked, new_user = uuid4(), uuid4()
+        versions, summary = MagicMock(), MagicMock()
+        versions.all.return_value = [(marked, 3)]
+        summary.all.return_value = []
+        db = mock_db()
+        db.bind.dialect.name = "postgresql"
+        db.execute.side_effect = [versions, summary, None]
+
+        assert asyncio.run(build_digests(db, [marked, new_user], date.today())) == 2
+
+        upsert = db.execute.await_args_list[-1].args[0].compile(dialect=postgresql.dialect())
+        # 계산 전에 읽은 version이 그대로일 때만 덮어씁니다
+        assert "WHERE notification_digests.version = excluded.version" in str(upsert)
+        assert [upsert.params[f"version_m{i}"] for i in range(2)] == [3, 0]
+
+    def test_next_run_is_just_after_midnight(self):
+        from datetime import datetime
+        from app.services.digest_service import DailyDigestJob
+
+        job = DailyDigestJob(delay_seconds=60)
+        assert job.next_run_at(datetime(2026, 1, 1, 0, 0, 30)) == datetime(2026, 1, 1, 0, 1)
+        assert job.next_run_at(datetime(2026, 1, 1, 9, 0)) == datetime(2026, 1, 2, 0, 1)
@@ -0,0 +1,210 @@
+"""마감 알림 스케줄러와 리더 선출 테스트."""
+from datetime import date
+
+
+class TestDeadlineScheduler:
+    """D-N 마감 알림 스케줄러 테스트."""
+
+    def _scheduler(self, now):
+        from datetime import timedelta
+        from app.services.deadline_scheduler import DeadlineScheduler
+
+        self.now = now
+        scheduler = DeadlineScheduler(clock=lambda: self.now)
+        scheduler._loaded_until = now.date() + timedelta(days=scheduler.lookahead_days)
+        return scheduler
+
+    def _reminder(self, deadline):
+        from uuid import uuid4
+        from app.services.deadline_scheduler import TrackedReminder
+        return TrackedReminder(uuid4(), uuid4(), "원천세 신고", deadline)
+
+    def test_fires_at_each_boundary(self):
+        from datetime import datetime, timedelta
+        from app.services.deadline_scheduler import alert_label
+
+        scheduler = self._scheduler(datetime(2026, 3, 1, 9, 0))
+        reminder = self._reminder(date(2026, 3, 4))
+        scheduler.track(reminder)
+
+        assert scheduler.next_fire_at() == datetime(2026, 3, 4)
+        labels = []
+        for day in (4, 5):
+            for tracked, offset in scheduler.pop_due(datetime(2026, 3, day)):
+                labels.append(alert_label(offset))
+        assert labels == ["D-Day", "D+1"]
+        assert scheduler.next_fire_at() is None
+
+    def test_rescheduled_reminder_skips_stale_entries(self):
+        from datetime import datetime
+        from dataclasses import replace
+
+        scheduler = self._scheduler(datetime(2026, 3, 1, 9, 0))
+        reminder = self._reminder(date(2026, 3, 2))
+        scheduler.track(reminder)
+        scheduler.track(replace(reminder, deadline=date(2026, 3, 3)))
+
+        due = scheduler.pop_due(datetime(2026, 3, 2))
+        assert due == []
+        due = scheduler.pop_due(datetime(2026, 3, 3))
+        assert [t.deadline for t, _ in due] == [date(2026, 3, 3)]
+
+    def test_untracked_reminder_never_fires(self):
+        from datetime import datetime
+
+        scheduler = self._scheduler(datetime(2026, 3, 1, 9, 0))
+        reminder = self._reminder(date(2026, 3, 2))
+        scheduler.track(reminder)
+        scheduler.untrack(reminder.id)
+        assert scheduler.pop_due(datetime(2026, 3, 10)) == []
+
+    def test_retracked_reminder_fires_once(self):
+        from datetime import datetime
+        from dataclasses import replace
+
+        scheduler = self._scheduler(datetime(2026, 3, 1, 9, 0))
+        reminder = self._reminder(date(2026, 3, 3))
+        # 완료 후 다시 열기
+        scheduler.track(reminder)
+        scheduler.untrack(reminder.id)
+        scheduler.track(reminder)
+        # 마감일 A → B → A
+        other = self._reminder(date(2026, 3, 3))
+        scheduler.track(other)
+        scheduler.track(replace(other, deadline=date(2026, 3, 4)))
+        scheduler.track(other)
+
+        due = scheduler.pop_due(datetime(2026, 3, 3))
+        assert sorted(t.id for t, _ in due) == sorted([reminder.id, other.id])
+
+    def test_deadline_beyond_window_is_deferred(self):
+        from datetime import datetime
+
+        scheduler = self._scheduler(datetime(2026, 3, 1, 9, 0))
+        scheduler.track(self._reminder(date(2026, 4, 1)))
+        assert scheduler.stats()["tracked"] == 0
+
+    def test_leader_picks_up_changes_made_on_other_workers(self, mock_db, session_factory):
+        import asyncio
+        from collections import namedtuple
+        from datetime import datetime, timedelta
+
+        scheduler = self._scheduler(datetime(2026, 3, 1, 9, 0))
+        done = self._reminder(date(2026, 3, 2))
+        scheduler.track(done)
+        created = self._reminder(date(2026, 3, 3))
+
+        Row = namedtuple("Row", "id company_id title deadline completed")
+        session = mock_db(all=[
+            Row(created.id, created.company_id, created.title, created.deadline, False),
+            Row(done.id, done.company_id, done.title, done.deadline, True),
+        ])
+        scheduler._session_factory = session_factory(session)
+        scheduler._polled_at = datetime.utcnow() - timedelta(minutes=1)
+
+        asyncio.run(scheduler._poll_changes())
+
+        # 다른 워커에서 만든 리마인더는 큐에 오르고, 완료된 리마인더는 빠집니다
+        due = scheduler.pop_due(datetime(2026, 3, 10))
+        assert {t.id for t, _ in due} == {created.id}
+        stmt = str(session.execute.await_args.args[0])
+        assert "reminders.updated_at >=" in stmt
+
+    def test_restart_clears_previous_queue(self):
+        import asyncio
+        from datetime import datetime
+        from unittest.mock import MagicMock
+
+        scheduler = self._scheduler(datetime(2026, 3, 1, 9, 0))
+        scheduler.track(self._reminder(date(2026, 3, 2)))
+
+        async def restart():
+            await scheduler.start(MagicMock())
+            stats = scheduler.stats()
+            await scheduler.stop()
+            return stats
+
+        stats = asyncio.run(restart())
+        assert (stats["tracked"], stats["queued"], stats["loaded_until"]) == (0, 0, None)
+
+
+class TestLeaderElection:
+    """스케줄러 리더 선출 테스트."""
+
+    @staticmethod
+    def _locks(holder):
+        from app.utils.leader import LeaderLock
+
+        class SharedLock(LeaderLock):
+            kind = "shared"
+            ttl = 0.03
+
+            def __init__(self, name):
+                self.name = name
+
+            async def acquire(self):
+                if holder.get("owner") is None:
+                    holder["owner"] = self.name
+                return holder.get("owner") == self.name
+
+            async def renew(self):
+                return holder.get("owner") == self.name
+
+            async def release(self):
+                if holder.get("owner") == self.name:
+                    holder["owner"] = None
+
+        return SharedLock("a"), SharedLock("b")
+
+    def test_only_one_worker_runs_jobs_and_failover(self):
+        import asyncio
+        from app.utils.leader import LeaderElection
+
+        holder, running = {}, []
+
+        def election(lock):
+            async def elected():
+                running.append(lock.name)
+
+            async def demoted():
+                running.remove(lock.name)
+
+            return LeaderElection(lock, elected, demoted)
+
+        lock_a, lock_b = self._locks(holder)
+        worker_a, worker_b = election(lock_a), election(lock_b)
+
+        async def run():
+            await worker_a.start()
+            await asyncio.sleep(0.005)
+            await worker_b.start()
+            await asyncio.sleep(0.05)
+            assert running == ["a"]
+            # 리더가 잠금을 잃으면 작업을 멈추고 다른 워커가 이어받습니다
+            holder["owner"] = None
+            await asyncio.sleep(0.05)
+            assert running == ["b"]
+            await worker_b.stop()
+            await worker_a.stop()
+
+        asyncio.run(run())
+        assert running == []
+        assert holder["owner"] is None
+        assert worker_a.elections == 1 and worker_b.elections == 1
+
+    def test_without_lock_worker_is_leader_immediately(self):
+        import asyncio
+        from unittest.mock import AsyncMock
+        from app.utils.leader import LeaderElection, LeaderLock
+
+        elected, demoted = AsyncMock(), AsyncMock()
+        election = LeaderElection(LeaderLock(), elected, demoted)
+
+        async def run():
+            await election.start()
+            assert election.is_leader
+            await election.stop()
+
+        asyncio.run(run())
+        elected.assert_awaited_once()
+        demoted.assert_awaited_once()
@@ -0,0 +1,233 @@
+"""인증 캐시와 비밀번호 해싱 테스트."""
+import pytest
+
+
+class TestPrincipalCache:
+    """사용자 식별 정보 캐시 테스트."""
+
+    def setup_method(self):
+        from app.utils.security import clear_user_cache
+        clear_user_cache()
+
+    def _row(self, user_id, is_active=True):
+        from datetime import datetime
+        return (user_id, "test@example.com", "테스트", is_active, datetime(2026, 1, 1))
+
+    def test_principal_is_cached(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from app.utils.security import load_principal
+
+        user_id = uuid4()
+        db = mock_db(one_or_none=self._row(user_id))
+        first = asyncio.run(load_principal(db, user_id))
+        second = asyncio.run(load_principal(db, user_id))
+        assert first is second
+        assert db.execute.await_count == 1
+
+    def test_principal_is_immutable(self):
+        import dataclasses
+        from uuid import uuid4
+        from app.utils.security import Principal
+
+        principal = Principal(*self._row(uuid4()))
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            principal.name = "변경"
+        assert not hasattr(principal, "__dict__")
+
+    def test_principal_serializes_as_user_response(self):
+        from uuid import uuid4
+        from app.schemas.user import UserResponse
+        from app.utils.security import Principal
+
+        user_id = uuid4()
+        response = UserResponse.model_validate(Principal(*self._row(user_id)))
+        assert response.id == user_id
+
+    def test_deactivation_invalidates_cache(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from app.models.user import User
+        from app.utils.security import load_principal
+
+        user_id = uuid4()
+        db = mock_db(one_or_none=self._row(user_id))
+        asyncio.run(load_principal(db, user_id))
+
+        user = User(id=user_id, email="test@example.com", name="테스트", password_hash="x", is_active=True)
+        user.is_active = False
+
+        db.execute.return_value.one_or_none.return_value = self._row(user_id, is_active=False)
+        principal = asyncio.run(load_principal(db, user_id))
+        assert principal.is_active is False
+        assert db.execute.await_count == 2
+
+    def test_deactivation_in_session_evicts_after_commit(self, mock_db):
+        import asyncio
+        from uuid import uuid4
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from app.models.user import User
+        from app.utils.security import load_principal
+
+        engine = create_engine("sqlite://")
+        User.__table__.create(engine)
+        user_id = uuid4()
+        with Session(engine, expire_on_commit=False) as session:
+            user = User(id=user_id, email="test@example.com", name="테스트", password_hash="x", is_active=True)
+            session.add(user)
+            session.commit()
+            asyncio.run(load_principal(mock_db(one_or_none=self._row(user_id)), user_id))
+
+            # 커밋 전에는 다른 요청이 커밋된 활성 상태를 그대로 봅니다
+            user.is_active = False
+            session.flush()
+            db = mock_db(one_or_none=self._row(user_id))
+            asyncio.run(load_principal(db, user_id))
+            assert db.execute.await_count == 0
+
+            session.commit()
+            db = mock_db(one_or_none=self._row(user_id, is_active=False))
+            assert asyncio.run(load_principal(db, user_id)).is_active is False
+            assert db.execute.await_count == 1
+
+
+class TestTokenCache:
+    """검증된 토큰 캐시 테스트."""
+
+    def setup_method(self):
+        from app.utils.security import clear_token_cache
+        clear_token_cache()
+
+    def test_repeated_decode_skips_verification(self):
+        from unittest.mock import patch
+        from uuid import uuid4
+        import jwt
+        from app.utils.security import create_access_token, decode_token
+
+        token = create_access_token(uuid4())
+        first = decode_token(token)
+        with patch.object(jwt, "decode", side_effect=AssertionError("verified twice")):
+            second = decode_token(token)
+        assert first == second
+        assert second["type"] == "access"
+
+    def test_cached_token_still_expires(self):
+        from unittest.mock import patch
+        from uuid import uuid4
+        from fastapi import HTTPException
+        from app.utils import security
+
+        token = security.create_access_token(uuid4())
+        payload = security.decode_token(token)
+
+        # 만료 시각이 지나면 캐시를 쓰지 않고 jwt 검증으로 되돌아감
+        expired = security.jwt.exceptions.ExpiredSignatureError("expired")
+        with patch.object(security.time, "time", return_value=payload["exp"] + 1), \
+                patch.object(security.jwt, "decode", side_effect=expired):
+            with pytest.raises(HTTPException) as exc:
+                security.decode_token(token)
+        assert exc.value.status_code == 401
+
+    def test_invalid_token_is_not_cached(self):
+        from fastapi import HTTPException
+        from app.utils.security import decode_token
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                decode_token("not-a-token")
+
+
+class TestPasswordHasher:
+    """bcrypt 스레드 풀 오프로딩 테스트."""
+
+    def test_async_hash_and_verify(self):
+        import asyncio
+        from app.utils.security import hash_password_async, verify_password_async
+
+        async def run():
+            hashed = await hash_password_async("test_password_123")
+            return await verify_password_async("test_password_123", hashed)
+
+        assert asyncio.run(run())
+
+    def test_needs_rehash_on_cost_change(self):
+        from unittest.mock import patch
+        from app.config import settings
+        from app.utils.security import hash_password, password_needs_rehash
+
+        hashed = hash_password("test_password_123")
+        assert not password_needs_rehash(hashed)
+        with patch.object(settings, "BCRYPT_ROUNDS", settings.BCRYPT_ROUNDS + 1):
+            assert password_needs_rehash(hashed)
+
+    def test_bounded_executor_rejects_when_full(self):
+        import asyncio
+        import threading
+        from app.utils.executor import BoundedExecutor, ExecutorBusyError
+
+        executor = BoundedExecutor("test_executor", max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        async def run():
+            running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(ExecutorBusyError):
+                await executor.run(release.wait)
+            release.set()
+            await asyncio.gather(*running)
+
+        asyncio.run(run())
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        executor.shutdown()
+
+    def test_bounded_executor_counts_failures_separately(self):
+        import asyncio
+        from app.utils.executor import BoundedExecutor
+
+        executor = BoundedExecutor("test_executor_failures", max_workers=1, max_pending=0)
+
+        async def run():
+            assert await executor.run(lambda: 1) == 1
+            with pytest.raises(ZeroDivisionError):
+                await executor.run(lambda: 1 / 0)
+
+        asyncio.run(run())
+        stats = executor.stats()
+        assert (stats["completed"], stats["failed"], stats["in_flight"]) == (1, 1, 0)
+        executor.shutdown()
+
+    def test_bounded_executor_keeps_slot_until_cancelled_job_finishes(self):
+        import asyncio
+        import threading
+        from app.utils.executor import BoundedExecutor, ExecutorBusyError
+
+        executor = BoundedExecutor("test_executor_cancel", max_workers=1, max_pending=0)
+        started, release = threading.Event(), threading.Event()
+
+        def job():
+            started.set()
+            release.wait()
+
+        async def run():
+            task = asyncio.ensure_future(executor.run(job))
+            await asyncio.to_thread(started.wait)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            # 기다리던 쪽이 취소돼도 스레드는 실행 중이므로 자리를 비우지 않습니다
+            assert executor.stats()["in_flight"] == 1
+            with pytest.raises(ExecutorBusyError):
+                await executor.run(job)
+
+            release.set()
+            while executor.stats()["in_flight"]:
+                await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+        stats = executor.stats()
+        assert (stats["completed"], stats["rejected"]) == (1, 1)
+        executor.shutdown()
@@ -0,0 +1,525 @@
+"""WebSocket 전달, 동기화, 구독, 제한 테스트."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+def _socket():
+    ws = MagicMock()
+    ws.accept = AsyncMock()
+    ws.send_text = AsyncMock()
+    ws.close = AsyncMock()
+    return ws
+
+
+async def _flush():
+    # 연결별 전송 태스크가 큐를 비울 기회를 줍니다
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestWebSocketFanout:
+    """브로커를 통한 워커 간 WebSocket 전달 테스트."""
+
+    def test_broadcast_reaches_sockets_on_every_worker(self):
+        import asyncio
+        import json
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager
+
+        hub = InProcessHub()
+        worker_a = ConnectionManager(InProcessBroker(hub))
+        worker_b = ConnectionManager(InProcessBroker(hub))
+        company_id = uuid4()
+        sender, local, remote = _socket(), _socket(), _socket()
+
+        async def run():
+            await worker_a.connect(sender, company_id)
+            await worker_a.connect(local, company_id)
+            await worker_b.connect(remote, company_id)
+            await worker_a.broadcast_to_company(company_id, {"event": "created"}, exclude=sender)
+            await _flush()
+
+        asyncio.run(run())
+        sender.send_text.assert_not_awaited()
+        for ws in (local, remote):
+            assert json.loads(ws.send_text.await_args.args[0]) == {"event": "created"}
+
+    def test_channel_is_unsubscribed_after_last_disconnect(self):
+        import asyncio
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager
+
+        hub = InProcessHub()
+        manager = ConnectionManager(InProcessBroker(hub), coalesce_window=0)
+        company_id = uuid4()
+        healthy, broken = _socket(), _socket()
+        broken.send_text.side_effect = RuntimeError("closed")
+
+        async def run():
+            await manager.connect(healthy, company_id)
+            await manager.connect(broken, company_id)
+            assert len(hub.subscribers) == 1
+            # 전송에 실패한 연결은 정리됩니다
+            await manager.broadcast_to_company(company_id, {"event": "updated"})
+            await _flush()
+            assert manager.active_connections_count == 1
+            await manager.disconnect(healthy, company_id)
+
+        asyncio.run(run())
+        assert manager.active_connections_count == 0
+        assert not hub.subscribers
+
+    def test_slow_consumer_is_evicted_without_blocking_others(self):
+        import asyncio
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager, SLOW_CONSUMER_CLOSE_CODE
+
+        manager = ConnectionManager(InProcessBroker(InProcessHub()), max_queue=2, coalesce_window=0)
+        company_id = uuid4()
+        fast, slow = _socket(), _socket()
+
+        async def run():
+            stalled = asyncio.Event()
+
+            async def never_finishes(payload):
+                await stalled.wait()
+
+            slow.send_text.side_effect = never_finishes
+            await manager.connect(fast, company_id)
+            await manager.connect(slow, company_id)
+            for i in range(5):
+                # 브로드캐스트는 큐에 넣기만 하므로 느린 연결을 기다리지 않습니다
+                await asyncio.wait_for(manager.broadcast_to_company(company_id, {"n": i}), 0.1)
+                await _flush()
+
+        asyncio.run(run())
+        assert fast.send_text.await_count == 5
+        assert manager.evicted == 1
+        assert manager.active_connections_count == 1
+        assert slow.close.await_args.kwargs["code"] == SLOW_CONSUMER_CLOSE_CODE
+
+
+class TestSyncCoalescing:
+    """동기화 메시지 묶음 전송 테스트."""
+
+    def test_events_for_same_row_are_merged(self):
+        from app.utils.websocket import coalesce_messages, create_sync_message
+
+        batch = coalesce_messages([
+            create_sync_message("created", "reminder", "a"),
+            create_sync_message("updated", "reminder", "a"),
+            create_sync_message("updated", "reminder", "b"),
+            create_sync_message("deleted", "reminder", "b"),
+            create_sync_message("bulk_created", "reminder"),
+            create_sync_message("bulk_created", "reminder"),
+        ], max_events=10)
+
+        assert batch["event"] == "batch"
+        assert batch["entity"] == "reminder"
+        assert [(e["event"], e["id"]) for e in batch["events"]] == [
+            ("created", "a"), ("deleted", "b"), ("bulk_created", None),
+        ]
+
+    def test_single_event_is_sent_unchanged_and_overflow_becomes_resync(self):
+        from app.utils.websocket import coalesce_messages, create_sync_message
+
+        single = create_sync_message("updated", "reminder", "a")
+        assert coalesce_messages([single, single], max_events=10) == single
+
+        many = [create_sync_message("created", "reminder", str(i)) for i in range(11)]
+        assert coalesce_messages(many, max_events=10) == {
+            "event": "resync", "entity": "reminder", "id": None, "data": None,
+        }
+
+    def test_burst_is_published_as_one_frame(self):
+        import asyncio
+        import json
+        from unittest.mock import AsyncMock, MagicMock
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager, create_sync_message
+
+        manager = ConnectionManager(InProcessBroker(InProcessHub()), coalesce_window=0.01)
+        company_id = uuid4()
+        ws = MagicMock()
+        ws.accept = AsyncMock()
+        ws.send_text = AsyncMock()
+
+        async def run():
+            await manager.connect(ws, company_id)
+            for i in range(20):
+                await manager.broadcast_to_company(company_id, create_sync_message("created", "reminder", str(i)))
+            await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+        assert ws.send_text.await_count == 1
+        frame = json.loads(ws.send_text.await_args.args[0])
+        assert [e["id"] for e in frame["events"]] == [str(i) for i in range(20)]
+
+
+class TestSyncPayload:
+    """동기화 메시지 데이터(행, 변경분) 테스트."""
+
+    def test_update_patch_has_only_changed_fields(self):
+        from app.api.reminders import _sync_patch
+        from app.schemas.reminder import ReminderUpdate
+
+        row = {
+            "id": "a", "title": "부가세 신고", "completed": True,
+            "completed_at": "2024-01-02T00:00:00", "priority": 1, "updated_at": "2024-01-02T00:00:00",
+        }
+        assert _sync_patch(row, ReminderUpdate(completed=True)) == {
+            "completed": True, "completed_at": "2024-01-02T00:00:00", "updated_at": "2024-01-02T00:00:00",
+        }
+        assert _sync_patch(row, ReminderUpdate(priority=1)) == {"priority": 1, "updated_at": "2024-01-02T00:00:00"}
+
+    def test_patches_are_merged_into_row(self):
+        from app.utils.websocket import coalesce_messages, create_sync_message
+
+        batch = coalesce_messages([
+            create_sync_message("created", "reminder", "a", data={"id": "a", "title": "원천세", "priority": 0}),
+            create_sync_message("updated", "reminder", "a", data={"priority": 2}),
+            create_sync_message("updated", "reminder", "b", data={"title": "부가세"}),
+            create_sync_message("updated", "reminder", "b", data={"priority": 1}),
+            create_sync_message("updated", "reminder", "c", data={"priority": 1}),
+            create_sync_message("updated", "reminder", "c"),
+        ], max_events=10)
+
+        assert [(e["event"], e["id"], e["data"]) for e in batch["events"]] == [
+            ("created", "a", {"id": "a", "title": "원천세", "priority": 2}),
+            ("updated", "b", {"title": "부가세", "priority": 1}),
+            ("updated", "c", None),
+        ]
+
+
+class TestWebSocketReplay:
+    """재연결 시 놓친 메시지 재전송 테스트."""
+
+    @staticmethod
+    def _frames(ws):
+        import json
+
+        return [json.loads(call.args[0]) for call in ws.send_text.await_args_list]
+
+    def test_reconnect_replays_missed_messages(self):
+        import asyncio
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager
+
+        manager = ConnectionManager(InProcessBroker(InProcessHub()), coalesce_window=0, replay_size=8)
+        company_id = uuid4()
+        first, second = _socket(), _socket()
+
+        async def run():
+            await manager.connect(first, company_id)
+            for i in range(3):
+                await manager.broadcast_to_company(company_id, {"n": i})
+            await _flush()
+            await manager.disconnect(first)
+            # 연결이 없는 동안 발행된 메시지
+            for i in range(3, 5):
+                await manager.broadcast_to_company(company_id, {"n": i})
+            await manager.connect(second, company_id, last_seq=self._frames(first)[-1]["seq"])
+            await _flush()
+
+        asyncio.run(run())
+        assert [f["seq"] for f in self._frames(first)] == [1, 2, 3]
+        key = str(company_id)
+        assert self._frames(second) == [{"n": 3, "company_id": key, "seq": 4}, {"n": 4, "company_id": key, "seq": 5}]
+        assert manager.replayed == 2
+
+    def test_gap_beyond_buffer_sends_resync(self):
+        import asyncio
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager
+
+        manager = ConnectionManager(InProcessBroker(InProcessHub()), coalesce_window=0, replay_size=2)
+        company_id = uuid4()
+        ws = _socket()
+
+        async def run():
+            for i in range(5):
+                await manager.broadcast_to_company(company_id, {"n": i})
+            await manager.connect(ws, company_id, last_seq=1)
+            await _flush()
+
+        asyncio.run(run())
+        assert self._frames(ws) == [
+            {"event": "resync", "entity": None, "id": None, "data": None, "company_id": str(company_id), "seq": 5},
+        ]
+        assert manager.resyncs == 1
+
+    def test_messages_published_during_replay_are_not_duplicated(self):
+        import asyncio
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager
+
+        class RacingBroker(InProcessBroker):
+            async def history(self, channel, after):
+                # 보관 메시지를 읽는 동안 다른 워커가 발행한 상황
+                await manager.broadcast_to_company(company_id, {"n": "live"})
+                return await super().history(channel, after)
+
+        manager = ConnectionManager(RacingBroker(InProcessHub()), coalesce_window=0)
+        company_id = uuid4()
+        ws = _socket()
+
+        async def run():
+            await manager.broadcast_to_company(company_id, {"n": "missed"})
+            await manager.connect(ws, company_id, last_seq=0)
+            await _flush()
+
+        asyncio.run(run())
+        assert [(f["n"], f["seq"]) for f in self._frames(ws)] == [("missed", 1), ("live", 2)]
+
+
+class TestWebSocketSubscriptions:
+    """연결 하나의 여러 회사 구독 테스트."""
+
+    def test_one_connection_receives_every_subscribed_company(self):
+        import asyncio
+        import json
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager
+
+        hub = InProcessHub()
+        manager = ConnectionManager(InProcessBroker(hub), coalesce_window=0)
+        first, second = uuid4(), uuid4()
+        ws = _socket()
+
+        async def run():
+            await manager.connect(ws)
+            await manager.subscribe(ws, first)
+            await manager.subscribe(ws, second)
+            await manager.subscribe(ws, second)
+            assert len(hub.subscribers) == 2
+            await manager.broadcast_to_company(first, {"n": 1})
+            await manager.broadcast_to_company(second, {"n": 2})
+            await _flush()
+
+            await manager.unsubscribe(ws, first)
+            assert list(hub.subscribers) == [f"ws:company:{second}"]
+            assert not manager.is_subscribed(ws, first)
+            await manager.broadcast_to_company(first, {"n": 3})
+            await _flush()
+
+            await manager.disconnect(ws)
+
+        asyncio.run(run())
+        frames = [json.loads(call.args[0]) for call in ws.send_text.await_args_list]
+        assert [(f["n"], f["company_id"]) for f in frames] == [(1, str(first)), (2, str(second))]
+        assert manager.active_connections_count == 0
+        assert not hub.subscribers
+
+
+class TestRelayLimits:
+    """클라이언트 메시지 형식 검사와 중계 속도 제한 테스트."""
+
+    def test_token_bucket_refills_over_time(self):
+        from app.utils.rate_limit import TokenBucket
+
+        now = [0.0]
+        bucket = TokenBucket(rate=2, burst=3, clock=lambda: now[0])
+        assert [bucket.allow() for _ in range(4)] == [True, True, True, False]
+        now[0] = 0.5
+        assert bucket.allow() and not bucket.allow()
+        now[0] = 100.0
+        assert sum(bucket.allow() for _ in range(10)) == 3
+
+    def test_client_messages_are_typed(self):
+        import pytest
+        from uuid import uuid4
+        from app.schemas.websocket import (
+            parse_client_message, SubscribeMessage, UnsubscribeMessage, RelayMessage,
+        )
+
+        company_id = uuid4()
+        assert isinstance(parse_client_message(f'{{"type": "subscribe", "company_id": "{company_id}"}}'), SubscribeMessage)
+        assert isinstance(parse_client_message(f'{{"type": "unsubscribe", "company_id": "{company_id}"}}'), UnsubscribeMessage)
+        relay = parse_client_message(b'{"event": "updated", "entity": "reminder", "id": "a", "data": null}')
+        assert isinstance(relay, RelayMessage) and relay.company_id is None
+
+        for raw in (
+            "not json",
+            "[1, 2]",
+            '{"type": "subscribe"}',
+            '{"type": "shutdown", "company_id": "%s"}' % company_id,
+            '{"event": "updated", "entity": "reminder", "extra": 1}',
+            '{"event": "dropped_tables", "entity": "reminder"}',
+            # 16KB 제한 안에 들어가도 디코더의 재귀 한도를 넘는 중첩
+            '{"event": "updated", "entity": "reminder", "data": {"a": ' + "[" * 6000 + "]" * 6000 + "}}",
+            "[" * 10000,
+        ):
+            with pytest.raises(ValueError):
+                parse_client_message(raw)
+
+    def test_relay_is_limited_per_connection_and_per_company(self):
+        import asyncio
+        from unittest.mock import patch
+        from uuid import uuid4
+        from app.config import settings
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager
+
+        manager = ConnectionManager(InProcessBroker(InProcessHub()), coalesce_window=0)
+        company_id = uuid4()
+        first, second, listener = (_socket() for _ in range(3))
+        message = {"event": "updated", "entity": "reminder"}
+
+        async def run():
+            for ws in (first, second, listener):
+                await manager.connect(ws, company_id)
+            results = [await manager.relay(first, company_id, message) for _ in range(3)]
+            results += [await manager.relay(second, company_id, message) for _ in range(2)]
+            results.append(await manager.relay(listener, uuid4(), message))
+            await _flush()
+            return results
+
+        with patch.multiple(
+            settings, WS_RELAY_RATE=0, WS_RELAY_BURST=2, WS_COMPANY_RELAY_RATE=0, WS_COMPANY_RELAY_BURST=3,
+        ):
+            results = asyncio.run(run())
+        assert results == [None, None, "rate_limited", None, "company_rate_limited", "not_subscribed"]
+        assert listener.send_text.await_count == 3
+        assert manager.stats()["relayed"] == 3
+        assert manager.stats()["dropped"] == {"rate_limited": 1, "company_rate_limited": 1, "not_subscribed": 1}
+
+    def test_relayed_frames_are_tagged_with_sender(self):
+        import pytest
+        from uuid import uuid4
+        from app.main import _relay_payload
+        from app.schemas.websocket import parse_client_message
+
+        company_id, sender = uuid4(), uuid4()
+        message = parse_client_message(b'{"event": "updated", "entity": "reminder", "id": "a", "data": {"title": "x"}}')
+        assert _relay_payload(message, company_id, sender) == {
+            "type": "relay", "sender": str(sender),
+            "event": "updated", "entity": "reminder", "id": "a", "data": {"title": "x"},
+            "company_id": str(company_id),
+        }
+        # 클라이언트가 중계 표시나 보낸 사람을 직접 넣을 수는 없습니다
+        for raw in ('{"type": "relay", "event": "updated", "entity": "reminder"}',
+                    '{"event": "updated", "entity": "reminder", "sender": "x"}'):
+            with pytest.raises(ValueError):
+                parse_client_message(raw)
+
+
+class TestWebSocketTelemetry:
+    """WebSocket 하트비트, 연결 수 제한, 메트릭 테스트."""
+
+    def test_idle_connections_are_reaped_and_others_pinged(self):
+        import asyncio
+        import json
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager, IDLE_CLOSE_CODE
+
+        manager = ConnectionManager(InProcessBroker(InProcessHub()), ping_interval=0, idle_timeout=30)
+        company_id = uuid4()
+        idle, active = _socket(), _socket()
+
+        async def run():
+            await manager.connect(idle, company_id)
+            await manager.connect(active, company_id)
+            manager._sockets[idle].last_seen -= 60
+            manager.touch(active)
+            manager.check_idle()
+            await _flush()
+
+        asyncio.run(run())
+        assert idle.close.await_args.kwargs["code"] == IDLE_CLOSE_CODE
+        assert json.loads(active.send_text.await_args.args[0]) == {"type": "ping"}
+        assert manager.reaped == 1
+        assert manager.active_connections_count == 1
+
+    def test_connection_caps_per_user_and_company(self):
+        import asyncio
+        import json
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager, CONNECTION_LIMIT_CLOSE_CODE
+
+        manager = ConnectionManager(
+            InProcessBroker(InProcessHub()), ping_interval=0, max_per_user=2, max_per_company=2,
+        )
+        user_id, other_user, company_id = uuid4(), uuid4(), uuid4()
+        sockets = [_socket() for _ in range(4)]
+
+        async def run():
+            results = [
+                await manager.connect(sockets[0], company_id, user_id=user_id),
+                await manager.connect(sockets[1], company_id, user_id=user_id),
+                # 사용자 제한
+                await manager.connect(sockets[2], company_id, user_id=user_id),
+                # 회사 제한
+                await manager.connect(sockets[3], company_id, user_id=other_user),
+            ]
+            await manager.disconnect(sockets[0])
+            results.append(await manager.connect(sockets[2], company_id, user_id=user_id))
+            return results
+
+        assert asyncio.run(run()) == [True, True, False, False, True]
+        for ws in sockets[2:]:
+            assert ws.close.await_args_list[0].kwargs["code"] == CONNECTION_LIMIT_CLOSE_CODE
+        stats = manager.stats()
+        assert stats["rejected"] == {"user_limit": 1, "company_limit": 1}
+        assert stats["users"] == 1
+        assert stats["company_connections_max"] == 2
+        assert stats["company_connections"]["le_1"] == 0
+        assert stats["company_connections"]["le_5"] == 1
+        # 인증 없는 /metrics에 회사 ID가 노출되지 않습니다
+        assert str(company_id) not in json.dumps(stats)
+
+    def test_stats_report_fanout_latency(self):
+        import asyncio
+        from uuid import uuid4
+        from app.utils.pubsub import InProcessBroker, InProcessHub
+        from app.utils.websocket import ConnectionManager
+
+        manager = ConnectionManager(InProcessBroker(InProcessHub()), coalesce_window=0, ping_interval=0)
+        company_id = uuid4()
+        sockets = [_socket() for _ in range(3)]
+
+        async def run():
+            for ws in sockets:
+                await manager.connect(ws, company_id)
+            await manager.broadcast_to_company(company_id, {"event": "updated"})
+            assert manager.stats()["queue_depth_total"] == 3
+            await _flush()
+
+        asyncio.run(run())
+        stats = manager.stats()
+        assert stats["queue_depth_max"] == 0
+        assert stats["fanout_latency_ms"]["count"] == 3
+        assert stats["fanout_latency_ms"]["le_inf"] == 3
+        assert stats["subscriptions"] == 3
+
+
+class TestWebSocketAuthorization:
+    """회사 WebSocket 연결 권한 테스트."""
+
+    def test_non_member_is_rejected_before_connect(self):
+        import pytest
+        from unittest.mock import AsyncMock, patch
+        from uuid import uuid4
+        from fastapi.testclient import TestClient
+        from starlette.websockets import WebSocketDisconnect
+        import app.main as main
+        from app.utils.security import create_access_token
+
+        token = create_access_token(uuid4())
+        with patch.object(main, "_is_member", AsyncMock(return_value=False)):
+            with pytest.raises(WebSocketDisconnect) as exc:
+                with TestClient(main.app).websocket_connect(f"/ws/{uuid4()}?token={token}") as ws:
+                    ws.receive_json()
+        assert exc.value.code == 4003
+        assert main.manager.active_connections_count == 0
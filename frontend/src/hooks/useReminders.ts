@@ -1,9 +1,15 @@
 import { useState, useEffect, useCallback } from 'react';
-import type { Reminder, ReminderCreate, ReminderUpdate } from '../types';
+import type { Reminder, ReminderCreate, ReminderUpdate, SyncMessage } from '../types';
 import { remindersApi } from '../services/api';
 import { wsService } from '../services/websocket';
 import { useAuth } from '../contexts/AuthContext';
 
+// A resync frame means events were missed, so any cached list may be stale
+function affectsReminders(message: SyncMessage): boolean {
+  if (message.event === 'resync' || message.entity === 'reminder') return true;
+  return message.event === 'batch' && (message.events ?? []).some((event) => event.entity === 'reminder');
+}
+
 interface UseRemindersOptions {
   page?: number;
   pageSize?: number;
@@ -53,7 +59,7 @@ export function useReminders(options: UseRemindersOptions = {}) {
   // WebSocket sync
   useEffect(() => {
     const unsubscribe = wsService.onMessage((message) => {
-      if (message.entity === 'reminder') {
+      if (affectsReminders(message)) {
         fetchReminders();
       }
     });
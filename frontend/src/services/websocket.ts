@@ -34,8 +34,13 @@ class WebSocketService {
 
     this.ws.onmessage = (event) => {
       try {
-        const message: SyncMessage = JSON.parse(event.data);
-        this.handlers.forEach((handler) => handler(message));
+        const message = JSON.parse(event.data);
+        // Answer server heartbeats; idle connections are closed by the server
+        if (message.type === 'ping') {
+          this.ws?.send(JSON.stringify({ type: 'pong' }));
+          return;
+        }
+        this.handlers.forEach((handler) => handler(message as SyncMessage));
       } catch (e) {
         console.error('Failed to parse WebSocket message:', e);
       }
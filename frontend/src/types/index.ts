@@ -113,10 +113,13 @@ export interface TemplateApplyResponse {
 
 // WebSocket types
 export interface SyncMessage {
-  event: 'created' | 'updated' | 'deleted' | 'bulk_created';
-  entity: string;
+  event: 'created' | 'updated' | 'deleted' | 'bulk_created' | 'deadline_alert' | 'batch' | 'resync';
+  // null on resync frames and on batches that mix entities
+  entity: string | null;
   id: string | null;
   data: Record<string, unknown> | null;
+  // Coalesced events of a 'batch' frame
+  events?: SyncMessage[];
 }
 
 // UI types